@@ -0,0 +1,103 @@
+"""Benchmark for GET /api/transactions/export.
+
+Seeds an on-disk database with a growing number of transactions for a single
+user and streams the export in both formats, reporting time to the first
+chunk, total time and the peak Python heap allocated while the response is
+consumed. Rows are read in yield_per batches and written as they arrive, so
+the peak should stay flat as the row count grows and the first chunk should
+arrive in roughly constant time. Tracing allocations slows the export, so the
+times are only comparable with each other.
+
+Run from financial_app/backend/backend_app:
+
+    python -m benchmarks.bench_transaction_export
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from src.main import create_app
+from src.config import TestingConfig
+from src.extensions import limiter
+from src.models.user import db, User
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.models.transaction import Transaction
+
+ROW_COUNTS = [10_000, 100_000, 300_000]
+
+
+def seed_transactions(user_id, category_id, payment_method_id, count, start=0):
+    base_date = date(2015, 1, 1)
+    rows = [
+        {
+            'description': f'Transaction {i}',
+            'amount': float(i % 500 + 1),
+            'date': base_date + timedelta(days=i % 3650),
+            'transaction_type': 'expense',
+            'category_id': category_id,
+            'payment_method_id': payment_method_id,
+            'user_id': user_id,
+            'notes': '',
+        }
+        for i in range(start, start + count)
+    ]
+    db.session.execute(insert(Transaction), rows)
+    db.session.commit()
+
+
+def time_export(client, headers, export_format):
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(f'/api/transactions/export?format={export_format}', headers=headers, buffered=False)
+    chunks = iter(response.response)
+    next(chunks)
+    first_chunk = time.perf_counter() - started
+    size = sum(len(chunk) for chunk in chunks)
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    response.close()
+    assert size > 0
+    return first_chunk, total, peak
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    TestingConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    app = create_app('testing')
+    limiter.enabled = False
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com')
+        user.set_password('Password123!')
+        db.session.add(user)
+        db.session.commit()
+        category = Category(name='Bench', category_type='expense', user_id=user.id)
+        payment_method = PaymentMethod(name='Bench', user_id=user.id)
+        db.session.add_all([category, payment_method])
+        db.session.commit()
+
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+        client = app.test_client()
+
+        print(f"{'rows':>10} {'format':>7} {'first chunk (ms)':>17} {'total (s)':>10} {'peak heap (MiB)':>16}")
+        seeded = 0
+        for target in ROW_COUNTS:
+            seed_transactions(user.id, category.id, payment_method.id, target - seeded, start=seeded)
+            seeded = target
+            for export_format in ('csv', 'ndjson'):
+                first_chunk, total, peak = time_export(client, headers, export_format)
+                print(f"{seeded:>10} {export_format:>7} {first_chunk * 1000:>17.2f} {total:>10.2f} {peak / 2 ** 20:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
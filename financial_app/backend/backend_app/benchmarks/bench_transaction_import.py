@@ -0,0 +1,91 @@
+"""Benchmark for POST /api/transactions/import.
+
+Writes CSV statements of growing size to disk and imports each through the
+endpoint, reporting wall time and the peak Python heap allocated while the
+request runs. The upload is spooled to a temporary file and parsed row by
+row, and only one insert batch is held at a time, so the peak stays around
+10 MiB even at 100k rows; most of the growth is the 64-bit key kept per
+distinct line for duplicate detection. Tracing allocations slows the import several-fold, so the times are only
+comparable with each other.
+
+Run from financial_app/backend/backend_app:
+
+    python -m benchmarks.bench_transaction_import
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_jwt_extended import create_access_token
+
+from src.main import create_app
+from src.config import TestingConfig
+from src.extensions import limiter
+from src.models.user import db, User
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+
+ROW_COUNTS = [1_000, 10_000, 100_000]
+
+
+def write_statement(path, count):
+    base_date = date(2020, 1, 1)
+    with open(path, 'w', newline='') as f:
+        f.write('date,description,amount,category,payment_method\n')
+        for i in range(count):
+            amount = -(i % 500 + 1) if i % 3 else i % 500 + 1
+            day = base_date + timedelta(days=i % 1500)
+            f.write(f'{day.isoformat()},Statement {count} line {i},{amount}.25,Bench,Bench\n')
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    TestingConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    app = create_app('testing')
+    limiter.enabled = False
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com')
+        user.set_password('Password123!')
+        db.session.add(user)
+        db.session.commit()
+        db.session.add_all([
+            Category(name='Bench', category_type='expense', user_id=user.id),
+            Category(name='Bench', category_type='income', user_id=user.id),
+            PaymentMethod(name='Bench', user_id=user.id),
+        ])
+        db.session.commit()
+
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+        client = app.test_client()
+
+        print(f"{'rows':>10} {'time (s)':>10} {'rows/s':>10} {'peak heap (MiB)':>16}")
+        for count in ROW_COUNTS:
+            path = os.path.join(workdir, f'statement_{count}.csv')
+            write_statement(path, count)
+            with open(path, 'rb') as f:
+                tracemalloc.start()
+                started = time.perf_counter()
+                response = client.post(
+                    '/api/transactions/import', headers=headers,
+                    data={'file': (f, 'statement.csv')}, content_type='multipart/form-data', buffered=False
+                )
+                last = None
+                for line in response.response:
+                    last = line
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            summary = json.loads(last)
+            assert summary['event'] == 'done' and summary['imported'] == count, summary
+            print(f"{count:>10} {elapsed:>10.2f} {count / elapsed:>10.0f} {peak / 2 ** 20:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
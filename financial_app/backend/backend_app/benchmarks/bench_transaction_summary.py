@@ -0,0 +1,99 @@
+"""Benchmark for GET /api/transactions/summary.
+
+Seeds an in-memory database with a growing number of transactions for a
+single user and times the summary endpoint. Since the totals are computed
+by one grouped SUM/COUNT query (over the monthly rollup for whole-month
+periods), latency should stay roughly flat as the row count grows instead
+of scaling with the number of hydrated rows.
+
+Run from financial_app/backend/backend_app:
+
+    python -m benchmarks.bench_transaction_summary
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from src.main import create_app
+from src.extensions import limiter
+from src.cache import response_cache
+from src.models.user import db, User
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.models.transaction import Transaction
+from src.rollup import apply_rollup_deltas, rollup_deltas
+
+ROW_COUNTS = [1_000, 10_000, 50_000]
+REPEATS = 20
+
+
+def seed_transactions(user_id, category_id, payment_method_id, count, start=0):
+    base_date = date(2020, 1, 1)
+    rows = [
+        {
+            'description': f'Transaction {i}',
+            'amount': float(i % 500 + 1),
+            'date': base_date + timedelta(days=i % 1500),
+            'transaction_type': 'income' if i % 3 == 0 else 'expense',
+            'category_id': category_id,
+            'payment_method_id': payment_method_id,
+            'user_id': user_id,
+            'notes': '',
+        }
+        for i in range(start, start + count)
+    ]
+    db.session.execute(insert(Transaction), rows)
+    # Core inserts bypass the session hooks, so keep the rollup in step by hand
+    apply_rollup_deltas(db.session.connection(), rollup_deltas(rows))
+    db.session.commit()
+
+
+def time_summary(client, headers, params=None):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        response = client.get('/api/transactions/summary', headers=headers, query_string=params)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200
+        assert response.json['transaction_count'] > 0
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    app = create_app('testing')
+    limiter.enabled = False
+    # Measure the query path, not the response cache
+    response_cache.backend = None
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com')
+        user.set_password('Password123!')
+        db.session.add(user)
+        db.session.commit()
+        category = Category(name='Bench', category_type='expense', user_id=user.id)
+        payment_method = PaymentMethod(name='Bench', user_id=user.id)
+        db.session.add_all([category, payment_method])
+        db.session.commit()
+
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+        client = app.test_client()
+
+        print(f"{'rows':>10} {'all (ms)':>10} {'month (ms)':>11}")
+        seeded = 0
+        for target in ROW_COUNTS:
+            seed_transactions(user.id, category.id, payment_method.id, target - seeded, start=seeded)
+            seeded = target
+            all_rows = time_summary(client, headers)
+            one_month = time_summary(client, headers, {'year': 2021, 'month': 6})
+            print(f"{seeded:>10} {all_rows * 1000:>10.2f} {one_month * 1000:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,11 @@ import click
 from flask.cli import with_appcontext
 from financial_app.backend.backend_app.wsgi import app
 from src.main import seed_initial_data
+from src.rollup import rebuild_monthly_rollup
+from src.sync import prune_tombstones
+from src.models.user import db
+from src.models.timestamps import utcnow
+from datetime import timedelta
 
 @click.group()
 def cli():
@@ -13,7 +18,28 @@ def seed_db_command():
     """Seeds the database with initial data."""
     seed_initial_data(app)
 
+@click.command(name='rebuild_rollup')
+@click.option('--user-id', type=int, default=None, help='Only rebuild this user\'s rows.')
+@with_appcontext
+def rebuild_rollup_command(user_id):
+    """Rebuilds the monthly_rollup table from the transaction table."""
+    rebuild_monthly_rollup(user_id)
+    click.echo('Monthly rollup rebuilt.')
+
+@click.command(name='prune_tombstones')
+@click.option('--days', type=int, default=None, help='Keep tombstones newer than this many days (defaults to SYNC_TOMBSTONE_RETENTION_DAYS).')
+@with_appcontext
+def prune_tombstones_command(days):
+    """Deletes sync tombstones older than the retention window."""
+    if days is None:
+        days = app.config['SYNC_TOMBSTONE_RETENTION_DAYS']
+    removed = prune_tombstones(db.session, utcnow() - timedelta(days=days))
+    db.session.commit()
+    click.echo(f'Pruned {removed} tombstones.')
+
 cli.add_command(seed_db_command)
+cli.add_command(rebuild_rollup_command)
+cli.add_command(prune_tombstones_command)
 
 if __name__ == '__main__':
     cli()
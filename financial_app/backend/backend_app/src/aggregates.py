@@ -0,0 +1,172 @@
+from sqlalchemy import func, case
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.investment import Investment
+from src.models.investment_type import InvestmentType
+from src.models.goal import Goal
+from src.models.monthly_rollup import MonthlyRollup
+
+
+def transaction_totals(user_id, filters=(), rollup_filters=None):
+    """Income/expense totals for a user as one SUM/COUNT query grouped by transaction_type.
+
+    When `rollup_filters` is given (see src.rollup.period_filters) the totals are read
+    from the monthly rollup instead of the transaction table.
+    """
+    if rollup_filters is not None:
+        rows = db.session.query(
+            MonthlyRollup.transaction_type,
+            func.sum(MonthlyRollup.total),
+            func.sum(MonthlyRollup.count)
+        ).filter(MonthlyRollup.user_id == user_id, *rollup_filters).group_by(MonthlyRollup.transaction_type)
+    else:
+        rows = db.session.query(
+            Transaction.transaction_type,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).filter(Transaction.user_id == user_id, *filters).group_by(Transaction.transaction_type)
+
+    totals = {transaction_type: (total or 0, count) for transaction_type, total, count in rows}
+    total_income = totals.get('income', (0, 0))[0]
+    total_expense = totals.get('expense', (0, 0))[0]
+    return {
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "balance": total_income - total_expense,
+        "transaction_count": sum(count for _, count in totals.values())
+    }
+
+
+def _investment_summary(total_invested, total_current_value, investment_count):
+    total_profit_loss = total_current_value - total_invested
+    return {
+        "total_invested": total_invested,
+        "total_current_value": total_current_value,
+        "total_profit_loss": total_profit_loss,
+        "total_profit_loss_percentage": (total_profit_loss / total_invested * 100) if total_invested > 0 else 0,
+        "investment_count": investment_count
+    }
+
+
+def investment_totals(user_id, filters=()):
+    """Invested amount, current value and count for a user's investments in one query."""
+    total_invested, total_current_value, investment_count = db.session.query(
+        func.coalesce(func.sum(Investment.amount), 0),
+        func.coalesce(func.sum(Investment.current_value), 0),
+        func.count(Investment.id)
+    ).filter(Investment.user_id == user_id, *filters).one()
+
+    return _investment_summary(total_invested, total_current_value, investment_count)
+
+
+def investment_totals_by_type(user_id, filters=()):
+    """investment_totals plus a per-investment-type breakdown, from one grouped query."""
+    rows = db.session.query(
+        Investment.investment_type_id,
+        InvestmentType.name,
+        func.sum(Investment.amount),
+        func.sum(Investment.current_value),
+        func.count(Investment.id)
+    ).outerjoin(InvestmentType, InvestmentType.id == Investment.investment_type_id).filter(
+        Investment.user_id == user_id, *filters
+    ).group_by(Investment.investment_type_id, InvestmentType.name).order_by(InvestmentType.name).all()
+
+    summary = _investment_summary(
+        sum(row[2] for row in rows),
+        sum(row[3] for row in rows),
+        sum(row[4] for row in rows)
+    )
+    summary["by_investment_type"] = [
+        {
+            "investment_type_id": investment_type_id,
+            "investment_type_name": name,
+            **_investment_summary(total_invested, total_current_value, investment_count)
+        }
+        for investment_type_id, name, total_invested, total_current_value, investment_count in rows
+    ]
+    return summary
+
+
+def _goal_summary(total_goals, active_goals, completed_goals, total_target_amount, total_current_amount):
+    return {
+        "total_goals": total_goals,
+        "active_goals": active_goals,
+        "completed_goals": completed_goals,
+        "total_target_amount": total_target_amount,
+        "total_current_amount": total_current_amount,
+        "total_progress_percentage": (total_current_amount / total_target_amount * 100) if total_target_amount > 0 else 0
+    }
+
+
+def goal_totals(user_id):
+    """Goal counts and active-goal progress for a user using conditional aggregates."""
+    is_active = Goal.status == 'active'
+    return _goal_summary(*db.session.query(
+        func.count(Goal.id),
+        func.count(case((is_active, Goal.id))),
+        func.count(case((Goal.status == 'completed', Goal.id))),
+        func.coalesce(func.sum(case((is_active, Goal.target_amount))), 0),
+        func.coalesce(func.sum(case((is_active, Goal.current_amount))), 0)
+    ).filter(Goal.user_id == user_id).one())
+
+
+def goal_totals_by_status(user_id):
+    """goal_totals plus a per-status breakdown, from one grouped query."""
+    rows = db.session.query(
+        Goal.status,
+        func.count(Goal.id),
+        func.coalesce(func.sum(Goal.target_amount), 0),
+        func.coalesce(func.sum(Goal.current_amount), 0)
+    ).filter(Goal.user_id == user_id).group_by(Goal.status).order_by(Goal.status).all()
+
+    by_status = {status: (count, target, current) for status, count, target, current in rows}
+    active_count, active_target, active_current = by_status.get('active', (0, 0, 0))
+    summary = _goal_summary(
+        sum(row[1] for row in rows),
+        active_count,
+        by_status.get('completed', (0, 0, 0))[0],
+        active_target,
+        active_current
+    )
+    summary["by_status"] = [
+        {
+            "status": status,
+            "goal_count": count,
+            "total_target_amount": target,
+            "total_current_amount": current,
+            "progress_percentage": (current / target * 100) if target > 0 else 0
+        }
+        for status, count, target, current in rows
+    ]
+    return summary
+
+
+def investment_allocation(user_id):
+    """Current value and weight of every investment type of a user, from one grouped query.
+
+    Types without investments are included with a zero weight, so they can
+    be given a target when rebalancing.
+    """
+    rows = db.session.query(
+        InvestmentType.id,
+        InvestmentType.name,
+        func.coalesce(func.sum(Investment.current_value), 0),
+        func.count(Investment.id)
+    ).outerjoin(Investment, Investment.investment_type_id == InvestmentType.id).filter(
+        InvestmentType.user_id == user_id
+    ).group_by(InvestmentType.id, InvestmentType.name).order_by(InvestmentType.name).all()
+
+    total_current_value = sum(row[2] for row in rows)
+    return {
+        "total_current_value": total_current_value,
+        "by_investment_type": [
+            {
+                "investment_type_id": investment_type_id,
+                "investment_type_name": name,
+                "current_value": current_value,
+                "investment_count": investment_count,
+                "weight_percentage": (current_value / total_current_value * 100) if total_current_value > 0 else 0
+            }
+            for investment_type_id, name, current_value, investment_count in rows
+        ]
+    }
@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.versioning import request_versions
+
+
+def _tags(resources):
+    return "|" + "|".join(sorted(resources)) + "|"
+
+
+def _like_escape(value):
+    """Escapes LIKE wildcards so `_` in a resource name only matches itself."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class MemoryCacheBackend:
+    """Bounded in-process LRU with a per-entry TTL.
+
+    Entries are only invalidated in the worker that made the write, so with
+    several gunicorn workers use the shared backend or keep the TTL short.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _, _ = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, user_id, resources):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value, user_id, frozenset(resources))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id, resources):
+        with self._lock:
+            stale = [
+                key for key, (_, _, owner, tags) in self._entries.items()
+                if owner == user_id and not tags.isdisjoint(resources)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """Cache shared by every worker on a host, stored in a local SQLite file.
+
+    A stand-in for Redis/memcached: writes from any worker invalidate the
+    entries all workers read.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, max_entries=10000, ttl=300):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cached_response ("
+                "key TEXT PRIMARY KEY, user_id INTEGER NOT NULL, tags TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, body BLOB NOT NULL, mimetype TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cached_response_user_id ON cached_response (user_id)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT body, mimetype FROM cached_response WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def set(self, key, value, user_id, resources):
+        body, mimetype = value
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cached_response (key, user_id, tags, expires_at, body, mimetype) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, user_id, _tags(resources), time.time() + self.ttl, body, mimetype),
+        )
+        # Bound the file: drop expired rows, then the entries closest to expiry
+        conn.execute("DELETE FROM cached_response WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cached_response WHERE key IN ("
+            "SELECT key FROM cached_response ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def invalidate(self, user_id, resources):
+        clauses = " OR ".join("tags LIKE ? ESCAPE '\\'" for _ in resources)
+        self._connect().execute(
+            f"DELETE FROM cached_response WHERE user_id = ? AND ({clauses})",
+            (user_id, *(f"%|{_like_escape(resource)}|%" for resource in resources)),
+        )
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cached_response")
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM cached_response").fetchone()[0]
+
+
+class ResponseCache:
+    """Per-user cache of GET response bodies with write-through invalidation.
+
+    Entries are keyed by (user_id, endpoint, normalized query args, versions
+    of the resources they were built from) and tagged with those resources.
+    Committing a session that wrote any of them for the user drops the
+    entries, so the create, update and delete handlers invalidate without
+    extra code. The versions in the key make an entry stored after that
+    invalidation (a read racing a write), or left in another worker's memory
+    backend, unreachable once the write has bumped them.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def init_app(self, app):
+        backend = app.config.get("RESPONSE_CACHE_BACKEND", "memory")
+        ttl = app.config.get("RESPONSE_CACHE_TTL", 300)
+        max_entries = app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+
+        if backend == "memory":
+            self.backend = MemoryCacheBackend(max_entries=max_entries, ttl=ttl)
+        elif backend == "sqlite":
+            path = app.config.get("RESPONSE_CACHE_PATH") or os.path.join(app.instance_path, "response_cache.db")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.backend = SQLiteCacheBackend(path, max_entries=max_entries, ttl=ttl)
+        elif backend == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend}")
+        self.reset_stats()
+
+    def cached(self, *resources):
+        """Serves a GET view's 200 responses from the cache.
+
+        Must be applied under @jwt_required(); place it below @conditional_get
+        so a 304 is still answered before the cache is consulted.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return view(*args, **kwargs)
+
+                user_id = int(get_jwt_identity())
+                key = self._key(user_id, resources)
+                cached = self.backend.get(key)
+                if cached is not None:
+                    self._count(request.endpoint, "hits")
+                    body, mimetype = cached
+                    return make_response(body, 200, {"Content-Type": mimetype})
+
+                self._count(request.endpoint, "misses")
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    self.backend.set(key, (response.get_data(), response.mimetype), user_id, resources)
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, user_id, resources):
+        if self.backend is not None and resources:
+            self.backend.invalidate(int(user_id), set(resources))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def _key(self, user_id, resources):
+        args = urlencode(sorted(request.args.items(multi=True)))
+        view_args = urlencode(sorted((request.view_args or {}).items()))
+        resources = sorted(resources)
+        versions = ",".join(
+            f"{resource}={version}" for resource, version in zip(resources, request_versions(user_id, resources))
+        )
+        return f"{user_id}:{request.endpoint}:{view_args}:{args}:{versions}"
+
+    def _count(self, endpoint, field):
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {"hits": 0, "misses": 0})
+            counters[field] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters = {}
+
+    def stats(self):
+        """Hit/miss counters for this worker process, overall and per endpoint."""
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+        hits = sum(counters["hits"] for counters in endpoints.values())
+        misses = sum(counters["misses"] for counters in endpoints.values())
+        for counters in endpoints.values():
+            total = counters["hits"] + counters["misses"]
+            counters["hit_ratio"] = round(counters["hits"] / total, 4) if total else 0.0
+        return {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "entries": len(self.backend) if self.backend is not None else 0,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+response_cache = ResponseCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_resources(session):
+    for user_id, resources in session.info.pop("written_resources", {}).items():
+        response_cache.invalidate(user_id, resources)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_written_resources(session, previous_transaction):
+    session.info.pop("written_resources", None)
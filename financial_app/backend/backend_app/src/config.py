@@ -7,6 +7,31 @@ class Config:
     JWT_COOKIE_CSRF_PROTECT = False
     JWT_COOKIE_SAMESITE = 'None'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Run the dashboard's per-table aggregate queries on worker threads
+    DASHBOARD_PARALLEL_QUERIES = os.environ.get('DASHBOARD_PARALLEL_QUERIES', 'false').lower() == 'true'
+    # Response cache for read-mostly GETs: 'memory' (per worker), 'sqlite' (shared by workers) or 'none'
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    # Rows inserted and committed per batch by the statement import
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    # Delta sync: tombstones older than this force a full snapshot, and how far each cursor is rewound
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 90))
+    SYNC_CURSOR_OVERLAP_SECONDS = int(os.environ.get('SYNC_CURSOR_OVERLAP_SECONDS', 5))
+    # Change feed: 'local' delivers within one worker, 'sqlite' relays between workers on a host.
+    # Every open GET /api/events holds a request for up to EVENTS_STREAM_MAX_SECONDS, so the server must
+    # run threaded or async workers (gunicorn -k gthread --threads N, or gevent) with a worker timeout
+    # above that; a single sync worker would be taken by the first open tab. See render.yaml.
+    EVENT_BUS_BACKEND = os.environ.get('EVENT_BUS_BACKEND', 'local')
+    EVENT_BUS_PATH = os.environ.get('EVENT_BUS_PATH')
+    EVENT_BUS_POLL_INTERVAL = float(os.environ.get('EVENT_BUS_POLL_INTERVAL', 0.5))
+    EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', 256))
+    EVENT_MAX_STREAMS_PER_USER = int(os.environ.get('EVENT_MAX_STREAMS_PER_USER', 5))
+    EVENTS_HEARTBEAT_SECONDS = int(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_STREAM_MAX_SECONDS = int(os.environ.get('EVENTS_STREAM_MAX_SECONDS', 300))
+    # Investment and goal ledgers checkpoint the balance every this many movements
+    LEDGER_SNAPSHOT_INTERVAL = int(os.environ.get('LEDGER_SNAPSHOT_INTERVAL', 50))
 
 
 class DevelopmentConfig(Config):
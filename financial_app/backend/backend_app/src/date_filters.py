@@ -0,0 +1,129 @@
+from datetime import date, datetime, timedelta
+from src.models.user import db
+
+
+def parse_date(value, name):
+    """Parses a `YYYY-MM-DD` arg. Raises ValueError with a client-facing message."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid {name} format. Use YYYY-MM-DD")
+
+
+def month_bounds(year, month):
+    """Returns the half-open [start, end) date range covering a calendar month."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+# The exclusive end of a year or month range must itself be a valid date
+MAX_FILTER_YEAR = date.max.year - 1
+
+
+def date_range_filters(column, args):
+    """Builds index-friendly filters for `column` from year/month/start_date/end_date args.
+
+    year and month become a half-open range (`column >= start AND column < end`)
+    instead of `EXTRACT(...)` so the `(user_id, date)` indexes can be used.
+    end_date is inclusive for callers and is turned into `< end_date + 1 day`.
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    filters = []
+    year = args.get("year")
+    month = args.get("month")
+    start_date = args.get("start_date")
+    end_date = args.get("end_date")
+
+    if year:
+        try:
+            year = int(year)
+        except ValueError:
+            raise ValueError("Invalid year")
+        if not 1 <= year <= MAX_FILTER_YEAR:
+            raise ValueError("Invalid year")
+
+    if month:
+        try:
+            month = int(month)
+        except ValueError:
+            raise ValueError("Invalid month")
+        if not 1 <= month <= 12:
+            raise ValueError("Invalid month")
+
+    if year and month:
+        start, end = month_bounds(year, month)
+        filters += [column >= start, column < end]
+    elif year:
+        filters += [column >= date(year, 1, 1), column < date(year + 1, 1, 1)]
+    elif month:
+        # A month without a year spans every year, so it cannot be a single range
+        filters.append(db.extract('month', column) == month)
+
+    if start_date:
+        filters.append(column >= parse_date(start_date, "start_date"))
+    if end_date:
+        end_date = parse_date(end_date, "end_date")
+        if end_date == date.max:
+            raise ValueError("Invalid end_date")
+        filters.append(column < end_date + timedelta(days=1))
+
+    return filters
+
+
+def range_start(args):
+    """The first day admitted by the year/month/start_date args, or None without a lower bound.
+
+    Expects args already validated by `date_range_filters`. A month without a
+    year spans every year, so on its own it has no single first day.
+    """
+    starts = []
+    year = args.get("year")
+    month = args.get("month")
+    if year:
+        starts.append(date(int(year), int(month) if month else 1, 1))
+    if args.get("start_date"):
+        starts.append(parse_date(args.get("start_date"), "start_date"))
+    return max(starts, default=None)
+
+
+GRANULARITIES = ('month', 'week', 'day')
+
+
+def parse_year_month(value, name):
+    """Parses a `YYYY-MM` arg into (year, month). Raises ValueError with a client-facing message."""
+    try:
+        parsed = datetime.strptime(value or "", "%Y-%m")
+    except ValueError:
+        raise ValueError(f"Invalid {name} format. Use YYYY-MM")
+    return parsed.year, parsed.month
+
+
+def bucket_start(day, granularity):
+    """Returns the first day of the month/week (ISO, Monday)/day bucket containing `day`."""
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def iter_buckets(start, end, granularity):
+    """Yields the start of every bucket overlapping the half-open range [start, end).
+
+    The first bucket is clamped to `start`, so a week that began before the
+    range is labelled with the range's first day rather than an earlier Monday.
+    """
+    current = bucket_start(start, granularity)
+    while current < end:
+        yield max(current, start)
+        if granularity == 'month':
+            current = month_bounds(current.year, current.month)[1]
+        elif granularity == 'week':
+            current += timedelta(weeks=1)
+        else:
+            current += timedelta(days=1)
+
+
+def bucket_label(bucket, granularity):
+    return bucket.strftime("%Y-%m") if granularity == 'month' else bucket.isoformat()
@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.versioning import RESOURCES
+
+# Above this many rows of one resource in a commit, subscribers get a single
+# 'bulk' event (id null) telling them to refetch the whole resource
+MAX_EVENTS_PER_RESOURCE = 100
+
+logger = logging.getLogger(__name__)
+
+
+class LocalEventBus:
+    """No cross-worker delivery: events only reach streams held by the publishing process."""
+
+    name = "local"
+
+    def publish(self, user_id, events):
+        pass
+
+    def start(self, deliver):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteEventBus:
+    """Relays events between workers on a host through an append-only SQLite table.
+
+    A stand-in for Redis pub/sub: each worker appends what it publishes and a
+    background thread tails the table, handing rows written by other
+    processes to the local broker.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, poll_interval=0.5, retention=60):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = uuid.uuid4().hex
+        self._local = threading.local()
+        self._thread = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS event_log ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, user_id INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_event_log_created_at ON event_log (created_at)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def publish(self, user_id, events):
+        now = time.time()
+        conn = self._connect()
+        conn.executemany(
+            "INSERT INTO event_log (origin, user_id, created_at, payload) VALUES (?, ?, ?, ?)",
+            [(self.origin, user_id, now, json.dumps(payload)) for payload in events],
+        )
+        conn.execute("DELETE FROM event_log WHERE created_at < ?", (now - self.retention,))
+
+    def start(self, deliver):
+        """Starts tailing the log from its current end. Safe to call repeatedly."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # Started lazily so the thread belongs to the worker process, not a pre-fork parent
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._tail, args=(deliver,), name="event-bus", daemon=True)
+            self._thread.start()
+
+    def _tail(self, deliver):
+        conn = self._connect()
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM event_log").fetchone()[0]
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                rows = conn.execute(
+                    "SELECT id, origin, user_id, payload FROM event_log WHERE id > ? ORDER BY id", (last_id,)
+                ).fetchall()
+            except sqlite3.Error:
+                continue
+            for row_id, origin, user_id, payload in rows:
+                last_id = row_id
+                if origin != self.origin:
+                    deliver(user_id, [json.loads(payload)])
+
+    def close(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+            self._thread = None
+
+
+class EventBroker:
+    """Fans change events out to the SSE streams of each user held by this process.
+
+    Every stream owns a bounded queue. A stream that falls behind loses its
+    backlog and is sent a single 'resync' event instead, so one slow client
+    cannot grow memory without bound.
+    """
+
+    def __init__(self):
+        self.bus = LocalEventBus()
+        self.queue_size = 256
+        self.max_streams_per_user = 5
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def init_app(self, app):
+        backend = app.config.get("EVENT_BUS_BACKEND", "local")
+        self.queue_size = app.config.get("EVENT_QUEUE_SIZE", 256)
+        self.max_streams_per_user = app.config.get("EVENT_MAX_STREAMS_PER_USER", 5)
+
+        self.bus.close()
+        if backend == "local":
+            self.bus = LocalEventBus()
+        elif backend == "sqlite":
+            path = app.config.get("EVENT_BUS_PATH") or os.path.join(app.instance_path, "event_bus.db")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.bus = SQLiteEventBus(path, poll_interval=app.config.get("EVENT_BUS_POLL_INTERVAL", 0.5))
+        else:
+            raise ValueError(f"Unknown EVENT_BUS_BACKEND: {backend}")
+
+    def subscribe(self, user_id):
+        """Registers a stream for a user. Returns None when the user already has too many open."""
+        with self._lock:
+            streams = self._subscribers.setdefault(int(user_id), set())
+            if len(streams) >= self.max_streams_per_user:
+                return None
+            subscription = queue.Queue(maxsize=self.queue_size)
+            streams.add(subscription)
+        self.bus.start(self.deliver)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            streams = self._subscribers.get(int(user_id))
+            if streams is not None:
+                streams.discard(subscription)
+                if not streams:
+                    del self._subscribers[int(user_id)]
+
+    def publish(self, user_id, events):
+        """Delivers events to this process's streams and relays them to the other workers."""
+        if not events:
+            return
+        self.deliver(user_id, events)
+        try:
+            self.bus.publish(int(user_id), events)
+        except Exception:
+            # The write is already committed; other workers' streams just miss this notification
+            logger.warning("Failed to relay change events to the event bus", exc_info=True)
+
+    def deliver(self, user_id, events):
+        with self._lock:
+            streams = list(self._subscribers.get(int(user_id), ()))
+        for subscription in streams:
+            for payload in events:
+                try:
+                    subscription.put_nowait(payload)
+                except queue.Full:
+                    _drain(subscription)
+                    subscription.put_nowait({"resource": None, "id": None, "op": "resync"})
+                    break
+
+    def stream_count(self, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(int(user_id), ()))
+            return sum(len(streams) for streams in self._subscribers.values())
+
+
+def _drain(subscription):
+    try:
+        while True:
+            subscription.get_nowait()
+    except queue.Empty:
+        pass
+
+
+event_broker = EventBroker()
+
+
+def record_events(session, user_id, resource, ids, op):
+    """Queues change events to be published when the session commits.
+
+    ORM writes are recorded by the session hook below; Core writes that
+    bypass the flush must call this themselves.
+    """
+    pending = session.info.setdefault("pending_events", {}).setdefault(int(user_id), {})
+    changes = pending.setdefault(resource, [])
+    if changes is not None:
+        changes.extend((resource_id, op) for resource_id in ids)
+
+
+def record_bulk_change(session, user_id, resource):
+    """Queues a single 'bulk' event for writes whose row ids are not known, such as imports."""
+    session.info.setdefault("pending_events", {}).setdefault(int(user_id), {})[resource] = None
+
+
+@event.listens_for(Session, "after_flush")
+def _record_written_rows(session, flush_context):
+    for op, objects in (("create", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            resource = RESOURCES.get(type(obj))
+            if resource is None or obj.user_id is None:
+                continue
+            if op == "update" and not session.is_modified(obj):
+                continue
+            record_events(session, obj.user_id, resource, [obj.id], op)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_recorded_events(session):
+    for user_id, resources in session.info.pop("pending_events", {}).items():
+        events = []
+        for resource, changes in resources.items():
+            if changes is None or len(changes) > MAX_EVENTS_PER_RESOURCE:
+                events.append({"resource": resource, "id": None, "op": "bulk"})
+                continue
+            # A row created and then updated in one transaction is reported once, as created
+            ops = {}
+            for resource_id, op in changes:
+                if op == "delete" or resource_id not in ops:
+                    ops[resource_id] = op
+            events.extend({"resource": resource, "id": resource_id, "op": op} for resource_id, op in ops.items())
+        event_broker.publish(user_id, events)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_recorded_events(session, previous_transaction):
+    session.info.pop("pending_events", None)
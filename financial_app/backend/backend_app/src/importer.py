@@ -0,0 +1,404 @@
+import csv
+import hashlib
+import html
+import io
+import re
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import bleach
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.rollup import rollup_deltas, apply_rollup_deltas
+from src.versioning import bump_versions
+from src.events import record_bulk_change
+from src.upsert import upsert
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FIELDS = ('date', 'description', 'amount', 'transaction_type', 'category', 'payment_method', 'notes')
+REQUIRED_IMPORT_FIELDS = ('date', 'description', 'amount')
+
+_transactions = Transaction.__table__
+_description_length = Transaction.description.type.length
+
+
+_cleaner = bleach.Cleaner()
+
+
+def _clean(value):
+    # Same output as bleach.clean; plain text (the common case) skips the HTML parser
+    if "<" not in value and ">" not in value and "&" not in value:
+        return value
+    return _cleaner.clean(value)
+
+
+def _name_key(name):
+    return " ".join(name.split()).casefold()
+
+
+def csv_records(stream, mapping=None, delimiter=",", encoding="utf-8-sig"):
+    """Yields (line number, {import field: raw value}) from a CSV upload, one row at a time.
+
+    `mapping` maps import fields to header names; fields not mapped are looked up
+    by their own name, case-insensitively. Raises ValueError before the first row
+    if the header is missing a required field.
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    reader = csv.reader(text, delimiter=delimiter)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("CSV file is empty")
+
+    positions = {name.strip().casefold(): position for position, name in enumerate(header)}
+    mapping = mapping or {}
+    columns = {}
+    for field in IMPORT_FIELDS:
+        position = positions.get(str(mapping.get(field, field)).strip().casefold())
+        if position is not None:
+            columns[field] = position
+    missing = [field for field in REQUIRED_IMPORT_FIELDS if field not in columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    def records():
+        for row in reader:
+            if not any(value.strip() for value in row):
+                continue
+            yield reader.line_num, {
+                field: row[position] if position < len(row) else "" for field, position in columns.items()
+            }
+    return records()
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_CHARSETS = {b"1252": "cp1252", b"ISO-8859-1": "latin-1", b"8859-1": "latin-1"}
+
+
+def _ofx_encoding(stream):
+    """Reads the charset from an OFX 1.x header or 2.x XML declaration, then rewinds."""
+    head = stream.read(1024)
+    stream.seek(0)
+    match = re.search(rb"CHARSET:\s*([A-Za-z0-9-]+)|encoding=\"([A-Za-z0-9-]+)\"", head)
+    if match:
+        charset = (match.group(1) or match.group(2)).upper()
+        if charset in _OFX_CHARSETS:
+            return _OFX_CHARSETS[charset]
+    return "utf-8-sig"
+
+
+def _ofx_tags(text, chunk_size=64 * 1024):
+    """Yields (closing, TAG, value) from OFX read in chunks, for SGML (1.x) and XML (2.x) alike."""
+    buffer = ""
+    while True:
+        chunk = text.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        # Keep the possibly incomplete last element for the next chunk
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        complete, buffer = buffer[:cut], buffer[cut:]
+        for match in _OFX_TAG.finditer(complete):
+            yield match.group(1) == "/", match.group(2).upper(), html.unescape(match.group(3).strip())
+    for match in _OFX_TAG.finditer(buffer):
+        yield match.group(1) == "/", match.group(2).upper(), html.unescape(match.group(3).strip())
+
+
+def ofx_records(stream, encoding=None):
+    """Yields (transaction number, {import field: raw value}) for each STMTTRN in an OFX file.
+
+    Dates are normalized to YYYY-MM-DD and amounts to a signed, dot-decimal
+    string, so the records are read with the importer's default options.
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding or _ofx_encoding(stream), newline="")
+    number = 0
+    current = None
+    for closing, tag, value in _ofx_tags(text):
+        if tag == "STMTTRN":
+            if not closing:
+                current = {}
+            elif current is not None:
+                number += 1
+                yield number, _ofx_record(current)
+                current = None
+        elif current is not None and not closing and value:
+            current.setdefault(tag, value)
+
+
+def _ofx_record(fields):
+    posted = fields.get("DTPOSTED", "")
+    date = f"{posted[0:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 and posted[:8].isdigit() else posted
+    amount = fields.get("TRNAMT", "")
+    if "," in amount and "." not in amount:
+        amount = amount.replace(",", ".")
+    name, memo = fields.get("NAME", ""), fields.get("MEMO", "")
+    return {
+        "date": date,
+        "amount": amount,
+        "description": name or memo,
+        "notes": memo if name and memo != name else "",
+    }
+
+
+_QIF_FIELDS = {"D": "date", "T": "amount", "U": "amount", "P": "description", "M": "notes", "L": "category"}
+
+
+def qif_records(stream, day_first=False, encoding="utf-8-sig"):
+    """Yields (line number of the record's end, {import field: raw value}) for each QIF record.
+
+    Only cash/bank style records are read; investment and list sections are
+    skipped. Dates are normalized to YYYY-MM-DD (see `day_first`), amounts are
+    left for the importer to parse with its decimal separator.
+    """
+    text = io.TextIOWrapper(stream, encoding=encoding, newline=None)
+    current = {}
+    skipping = False
+    for line_number, line in enumerate(text, start=1):
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        code, value = line[0], line[1:].strip()
+        if code == "!":
+            header = value.lower()
+            skipping = not (header.startswith("type:") and header[5:] in ("bank", "cash", "ccard", "oth a", "oth l"))
+            current = {}
+        elif skipping:
+            continue
+        elif code == "^":
+            if current:
+                yield line_number, current
+            current = {}
+        elif code in _QIF_FIELDS:
+            field = _QIF_FIELDS[code]
+            if field == "date":
+                value = _qif_date(value, day_first)
+            elif field == "category" and value.startswith("["):
+                # [Account] names a transfer, not a category
+                value = ""
+            current.setdefault(field, value)
+    if current and not skipping:
+        yield line_number, current
+
+
+def _qif_date(value, day_first):
+    """Normalizes QIF dates such as 1/ 5/24, 1/ 5'24 or 01-05-2024 to YYYY-MM-DD; unknown forms pass through."""
+    parts = re.split(r"[/'.-]", value.replace(" ", ""))
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return value
+    if len(parts[0]) == 4:
+        year, month, day = parts
+    else:
+        first, second, year = parts
+        day, month = (first, second) if day_first else (second, first)
+    if len(year) <= 2:
+        # Quicken's apostrophe form marks 2000-2099; bare two-digit years are read the same way up to 69
+        year = str(2000 + int(year) if "'" in value or int(year) < 70 else 1900 + int(year))
+    return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+
+
+class TransactionImporter:
+    """Turns raw statement records into transactions, inserting them in fixed-size batches.
+
+    Category and payment method names are resolved against dictionaries loaded
+    once per import, so a 100k-row file costs two lookups rather than 200k; names
+    that are not found fall back to the defaults when given. Only one batch of
+    rows is held at a time, and each batch is committed on its own, so memory
+    stays bounded regardless of file size (apart from a 64-bit key per distinct line,
+    used to number repeated lines for duplicate detection).
+
+    `run` yields progress dicts (see the import route for the wire format).
+    """
+
+    def __init__(self, user_id, date_format="%Y-%m-%d", decimal_separator=".",
+                 default_category_id=None, default_payment_method_id=None, skip_duplicates=True,
+                 batch_size=IMPORT_BATCH_SIZE):
+        self.user_id = int(user_id)
+        self.skip_duplicates = skip_duplicates
+        self.date_format = date_format
+        self.decimal_separator = decimal_separator
+        self.batch_size = batch_size
+        self.categories = self._load_names(Category)
+        self.payment_methods = self._load_names(PaymentMethod)
+        self.default_category_id = self._owned_id(self.categories, default_category_id, "Category")
+        self.default_payment_method_id = self._owned_id(self.payment_methods, default_payment_method_id, "Payment method")
+        self.rows_processed = 0
+        self.imported = 0
+        self.skipped = 0
+        self.failed = 0
+        self._occurrences = Counter()
+
+    def _load_names(self, model):
+        rows = db.session.execute(select(model.id, model.name).where(model.user_id == self.user_id))
+        names = {}
+        for model_id, name in rows:
+            names.setdefault(_name_key(name), model_id)
+        return names
+
+    @staticmethod
+    def _owned_id(names, model_id, label):
+        if model_id in (None, ""):
+            return None
+        try:
+            model_id = int(model_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"{label} ID must be a valid integer")
+        if model_id not in names.values():
+            raise LookupError(f"{label} not found or does not belong to user")
+        return model_id
+
+    def run(self, records):
+        """Yields an error event per rejected row, a progress event per committed batch and a final done event.
+
+        If the input becomes unreadable or a batch fails to insert, a failed event
+        is yielded instead of done; batches committed before that are kept.
+        """
+        batch = []
+        try:
+            for line, raw in records:
+                self.rows_processed += 1
+                try:
+                    batch.append(self.to_row(raw))
+                except ValueError as e:
+                    self.failed += 1
+                    yield {"event": "error", "row": line, "message": str(e)}
+                    continue
+                if len(batch) >= self.batch_size:
+                    yield self._flush(batch)
+                    batch = []
+            if batch:
+                yield self._flush(batch)
+        except (ValueError, csv.Error) as e:
+            yield dict(self.progress("failed"), message=f"Could not read the file: {e}")
+            return
+        except SQLAlchemyError:
+            yield dict(self.progress("failed"), message="Database error. The current batch was not imported")
+            return
+        yield self.progress("done")
+
+    def progress(self, event="progress"):
+        return {
+            "event": event,
+            "rows_processed": self.rows_processed,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+    def _flush(self, batch):
+        try:
+            # Lines imported before are dropped by the unique (user_id, import_hash) index, which also
+            # settles two imports of the same file racing each other; RETURNING tells which rows went in
+            inserted = set(db.session.execute(
+                upsert(db.session.connection(), _transactions)
+                .on_conflict_do_nothing(index_elements=[_transactions.c.user_id, _transactions.c.import_hash])
+                .returning(_transactions.c.import_hash),
+                batch
+            ).scalars())
+            written = [row for row in batch if row["import_hash"] in inserted]
+            duplicates = [row for row in batch if row["import_hash"] not in inserted]
+            if duplicates and not self.skip_duplicates:
+                # Imported again on purpose, without a hash so the index stays unique
+                duplicates = [dict(row, import_hash=None) for row in duplicates]
+                db.session.execute(insert(_transactions), duplicates)
+                written += duplicates
+            else:
+                self.skipped += len(duplicates)
+            if written:
+                apply_rollup_deltas(db.session.connection(), rollup_deltas(written))
+                bump_versions(db.session, self.user_id, ['transactions'])
+                record_bulk_change(db.session, self.user_id, 'transactions')
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+        self.imported += len(written)
+        return self.progress()
+
+    def _parse_amount(self, value):
+        number = value.strip().replace(" ", "")
+        if self.decimal_separator == ",":
+            number = number.replace(".", "").replace(",", ".")
+        else:
+            number = number.replace(",", "")
+        try:
+            amount = Decimal(number)
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount '{value}'")
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount '{value}'")
+        return amount
+
+    def to_row(self, raw):
+        """Validates one record into transaction column values. Raises ValueError with a row-level message."""
+        description = _clean(raw.get("description", "").strip())[:_description_length]
+        if not description:
+            raise ValueError("Description is required")
+
+        try:
+            date = datetime.strptime(raw.get("date", "").strip(), self.date_format).date()
+        except ValueError:
+            raise ValueError(f"Invalid date '{raw.get('date', '')}'. Expected format {self.date_format}")
+
+        amount = self._parse_amount(raw.get("amount", ""))
+        if amount == 0:
+            raise ValueError("Amount must be a non-zero number")
+
+        transaction_type = raw.get("transaction_type", "").strip().lower()
+        if not transaction_type:
+            # Signed bank statements: debits are negative
+            transaction_type = "expense" if amount < 0 else "income"
+        elif transaction_type not in ('income', 'expense'):
+            raise ValueError("Invalid transaction type. Must be 'income' or 'expense'")
+
+        category_id = self._resolve(
+            self.categories, raw.get("category", ""), self.default_category_id, "Category", "Category is required"
+        )
+        payment_method_id = None
+        if transaction_type == 'expense':
+            payment_method_id = self._resolve(
+                self.payment_methods, raw.get("payment_method", ""), self.default_payment_method_id,
+                "Payment method", "Payment method is required for expense transactions"
+            )
+
+        signed_amount = -abs(amount) if transaction_type == 'expense' else abs(amount)
+        return {
+            "description": description,
+            "amount": float(abs(amount)),
+            "date": date,
+            "transaction_type": transaction_type,
+            "category_id": category_id,
+            "payment_method_id": payment_method_id,
+            "user_id": self.user_id,
+            "notes": _clean(raw.get("notes", "").strip()),
+            "import_hash": self._import_hash(date, signed_amount, raw.get("description", "")),
+        }
+
+    @staticmethod
+    def _resolve(names, name, default_id, label, missing_message):
+        name = name.strip()
+        if name:
+            model_id = names.get(_name_key(name), default_id)
+            if model_id is None:
+                raise ValueError(f"{label} '{name}' not found")
+            return model_id
+        if default_id is None:
+            raise ValueError(missing_message)
+        return default_id
+
+    def _import_hash(self, date, signed_amount, description):
+        """Fingerprint of (date, signed amount, normalized description) used to skip re-imported rows.
+
+        Identical lines within one file (two equal coffees on the same day) are
+        told apart by their occurrence number, so only lines that were already
+        imported are treated as duplicates.
+        """
+        base = hashlib.sha256(f"{date.isoformat()}|{signed_amount:.2f}|{_name_key(description)}".encode()).digest()
+        key = int.from_bytes(base[:8], "big")
+        occurrence = self._occurrences[key]
+        self._occurrences[key] = occurrence + 1
+        return hashlib.sha256(base + str(occurrence).encode()).hexdigest()
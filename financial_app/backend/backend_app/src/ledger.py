@@ -0,0 +1,172 @@
+from datetime import datetime, time, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select, insert, delete, func
+from sqlalchemy.orm import Session
+from src.models.timestamps import utcnow
+from src.models.investment import Investment
+from src.models.goal import Goal
+from src.models.investment_movement import InvestmentMovement, InvestmentSnapshot
+from src.models.goal_movement import GoalMovement, GoalSnapshot
+from src.date_filters import parse_date
+from src.valuation import investment_valuations
+
+DEFAULT_SNAPSHOT_INTERVAL = 50
+
+
+class Ledger:
+    """Append-only movement log for one kind of balance, with periodic snapshots.
+
+    Every movement carries the owner's next sequence number, taken from the
+    owner row's movement_count in the same statement that changes the
+    balance. Each time the sequence reaches a multiple of
+    LEDGER_SNAPSHOT_INTERVAL, the balance after it is checkpointed. A
+    point-in-time balance therefore reads one snapshot plus at most that
+    many movements.
+
+    An optional `series` (see src.valuation) is handed the owner's balance
+    after every movement, and purged along with the ledger.
+    """
+
+    def __init__(self, movement_model, snapshot_model, owner_column, series=None):
+        self.movements = movement_model.__table__
+        self.snapshots = snapshot_model.__table__
+        self.owner_column = owner_column
+        self.series = series
+
+    def record(self, session, owner_id, user_id, kind, amount, sequence, balance, occurred_at=None):
+        """Appends a movement; `balance` is the owner's balance right after it."""
+        occurred_at = occurred_at or utcnow()
+        connection = session.connection()
+        connection.execute(insert(self.movements).values(**{
+            self.owner_column: owner_id,
+            "user_id": int(user_id),
+            "kind": kind,
+            "amount": amount,
+            "sequence": sequence,
+            "occurred_at": occurred_at,
+        }))
+        interval = DEFAULT_SNAPSHOT_INTERVAL
+        if has_app_context():
+            interval = current_app.config.get("LEDGER_SNAPSHOT_INTERVAL", DEFAULT_SNAPSHOT_INTERVAL)
+        if sequence % interval == 0:
+            connection.execute(insert(self.snapshots).values(**{
+                self.owner_column: owner_id,
+                "sequence": sequence,
+                "balance": balance,
+                "taken_at": occurred_at,
+            }))
+        if self.series is not None:
+            self.series.record(connection, owner_id, occurred_at.date(), balance)
+
+    def balance_at(self, session, owner_id, at):
+        """Balance right after the last movement that occurred before `at`, in one query."""
+        movements, snapshots = self.movements, self.snapshots
+        latest = (
+            select(snapshots.c.sequence, snapshots.c.balance)
+            .where(snapshots.c[self.owner_column] == owner_id, snapshots.c.taken_at < at)
+            .order_by(snapshots.c.sequence.desc())
+            .limit(1)
+            .subquery()
+        )
+        start = func.coalesce(select(latest.c.sequence).scalar_subquery(), 0)
+        tail = (
+            select(func.sum(movements.c.amount))
+            .where(
+                movements.c[self.owner_column] == owner_id,
+                movements.c.sequence > start,
+                movements.c.occurred_at < at,
+            )
+            .scalar_subquery()
+        )
+        balance = func.coalesce(select(latest.c.balance).scalar_subquery(), 0) + func.coalesce(tail, 0)
+        return session.execute(select(balance)).scalar()
+
+    def history(self, session, owner_id):
+        """Every movement of an owner, oldest first."""
+        return session.execute(
+            select(self.movements)
+            .where(self.movements.c[self.owner_column] == owner_id)
+            .order_by(self.movements.c.sequence)
+        ).all()
+
+    def purge(self, session, owner_id):
+        """Deletes an owner's movements and snapshots, for when the owner itself is deleted."""
+        connection = session.connection()
+        if self.series is not None:
+            self.series.purge(connection, owner_id)
+        connection.execute(delete(self.snapshots).where(self.snapshots.c[self.owner_column] == owner_id))
+        connection.execute(delete(self.movements).where(self.movements.c[self.owner_column] == owner_id))
+
+
+def balance_cutoff(value):
+    """Exclusive upper bound for a balance `at` query arg: the end of that day, or now when absent.
+
+    Raises ValueError with a client-facing message.
+    """
+    if not value:
+        return utcnow()
+    return datetime.combine(parse_date(value, "at") + timedelta(days=1), time.min)
+
+
+def _opening_time(day):
+    """Timestamp for an opening balance dated `day`, never later than now.
+
+    Sequence order and time order must agree for snapshots to be usable, so
+    a future-dated opening is recorded as happening now.
+    """
+    if day is None:
+        return utcnow()
+    return min(datetime.combine(day, time.min), utcnow())
+
+
+investment_ledger = Ledger(InvestmentMovement, InvestmentSnapshot, "investment_id", series=investment_valuations)
+goal_ledger = Ledger(GoalMovement, GoalSnapshot, "goal_id")
+
+# Balance column, ledger and opening-date column of each owner model
+_OWNERS = {
+    Investment: ("current_value", investment_ledger, "date"),
+    Goal: ("current_amount", goal_ledger, "created_date"),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _stage_ledger_movements(session, flush_context, instances):
+    """Turns ORM balance changes into ledger movements.
+
+    New owners get an opening movement, and a balance assigned through the
+    ORM (an edit form) gets an adjustment for the difference. Deleted owners
+    lose their ledger first so the foreign keys allow the delete. The
+    contribute and withdraw routes change balances with UPDATE statements
+    and record their movements themselves.
+    """
+    staged = session.info.setdefault("ledger_movements", [])
+    for obj in session.new:
+        if type(obj) not in _OWNERS:
+            continue
+        field, ledger, date_field = _OWNERS[type(obj)]
+        balance = getattr(obj, field) or 0
+        obj.movement_count = 1
+        staged.append((ledger, obj, "opening", balance, 1, balance, _opening_time(getattr(obj, date_field))))
+
+    for obj in session.dirty:
+        if type(obj) not in _OWNERS:
+            continue
+        field, ledger, _ = _OWNERS[type(obj)]
+        history = inspect(obj).attrs[field].history
+        if not history.deleted or not history.added:
+            continue
+        delta = (history.added[0] or 0) - (history.deleted[0] or 0)
+        if delta == 0:
+            continue
+        obj.movement_count = (obj.movement_count or 0) + 1
+        staged.append((ledger, obj, "adjustment", delta, obj.movement_count, history.added[0], None))
+
+    for obj in session.deleted:
+        if type(obj) in _OWNERS:
+            _OWNERS[type(obj)][1].purge(session, obj.id)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_staged_movements(session, flush_context):
+    for ledger, obj, kind, amount, sequence, balance, occurred_at in session.info.pop("ledger_movements", []):
+        ledger.record(session, obj.id, obj.user_id, kind, amount, sequence, balance, occurred_at)
@@ -19,6 +19,8 @@ load_dotenv()
 
 from src.config import config
 from src.extensions import jwt, limiter, migrate
+from src.cache import response_cache
+from src.events import event_broker
 from src.models.user import db, User
 from src.middleware import set_csp_header
 from src.logging_config import setup_logging
@@ -34,6 +36,8 @@ def create_app(config_name='default'):
     jwt.init_app(app)
     limiter.init_app(app)
     migrate.init_app(app, db)
+    response_cache.init_app(app)
+    event_broker.init_app(app)
     CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
 
     # Initialize Flasgger
@@ -70,6 +74,11 @@ def create_app(config_name='default'):
     
     from src.routes.investment import investment_bp
     from src.routes.goal import goal_bp
+    from src.routes.dashboard import dashboard_bp
+    from src.routes.reference_data import reference_data_bp
+    from src.routes.sync import sync_bp
+    from src.routes.events import events_bp
+    from src.routes.batch import batch_bp
     from src.routes.admin import admin_bp
 
     app.register_blueprint(user_bp, url_prefix='/api')
@@ -81,6 +90,11 @@ def create_app(config_name='default'):
     
     app.register_blueprint(investment_bp, url_prefix='/api')
     app.register_blueprint(goal_bp, url_prefix='/api')
+    app.register_blueprint(dashboard_bp, url_prefix='/api')
+    app.register_blueprint(reference_data_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
+    app.register_blueprint(events_bp, url_prefix='/api')
+    app.register_blueprint(batch_bp, url_prefix='/api')
 
     @app.after_request
     def after_request_func(response):
@@ -1,10 +1,12 @@
 from src.models.user import db
+from src.models.timestamps import utcnow
 
 class Category(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     category_type = db.Column(db.String(20), nullable=False, default='expense')
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
 
     def __repr__(self):
         return f'<Category {self.name}>'
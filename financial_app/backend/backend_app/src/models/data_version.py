@@ -0,0 +1,19 @@
+from src.models.user import db
+
+class DataVersion(db.Model):
+    """Per-user, per-resource change counter used to build ETags for GET responses."""
+    __tablename__ = 'data_version'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    resource = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DataVersion {self.user_id} {self.resource}={self.version}>'
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'resource': self.resource,
+            'version': self.version
+        }
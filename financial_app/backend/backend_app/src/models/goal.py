@@ -1,7 +1,12 @@
 from src.models.user import db
+from src.models.timestamps import utcnow
 from datetime import datetime, timezone
 
 class Goal(db.Model):
+    __table_args__ = (
+        db.Index('ix_goal_user_id_updated_at', 'user_id', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -11,6 +16,9 @@ class Goal(db.Model):
     created_date = db.Column(db.Date, nullable=False, default=lambda: datetime.now(timezone.utc))
     status = db.Column(db.String(20), default='active')  # 'active', 'completed', 'paused'
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+    # Sequence of the latest ledger movement; bumped in the same statement that changes the balance
+    movement_count = db.Column(db.Integer, nullable=False, default=0)
     
     # Relacionamento
     user = db.relationship('User', backref=db.backref('goals', lazy=True))
@@ -0,0 +1,49 @@
+from src.models.user import db
+from src.models.timestamps import utcnow
+
+class GoalMovement(db.Model):
+    """Append-only record of every change to a goal's current amount."""
+    __tablename__ = 'goal_movement'
+    __table_args__ = (
+        db.UniqueConstraint('goal_id', 'sequence', name='uq_goal_movement_goal_id_sequence'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    goal_id = db.Column(db.Integer, db.ForeignKey('goal.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # 'opening', 'contribution' or 'adjustment'
+    amount = db.Column(db.Float, nullable=False)  # signed: adjustments may be negative
+    # Position in the goal's ledger, starting at 1 for the opening balance
+    sequence = db.Column(db.Integer, nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    def __repr__(self):
+        return f'<GoalMovement {self.goal_id}#{self.sequence} {self.kind} {self.amount}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'goal_id': self.goal_id,
+            'kind': self.kind,
+            'amount': self.amount,
+            'sequence': self.sequence,
+            'occurred_at': self.occurred_at.isoformat() if self.occurred_at else None
+        }
+
+
+class GoalSnapshot(db.Model):
+    """Balance of a goal after a given ledger sequence, written every few movements."""
+    __tablename__ = 'goal_snapshot'
+    __table_args__ = (
+        db.UniqueConstraint('goal_id', 'sequence', name='uq_goal_snapshot_goal_id_sequence'),
+        db.Index('ix_goal_snapshot_goal_id_taken_at', 'goal_id', 'taken_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    goal_id = db.Column(db.Integer, db.ForeignKey('goal.id'), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    balance = db.Column(db.Float, nullable=False)
+    taken_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<GoalSnapshot {self.goal_id}#{self.sequence}={self.balance}>'
@@ -1,7 +1,13 @@
 from src.models.user import db
+from src.models.timestamps import utcnow
 from datetime import datetime, timezone
 
 class Investment(db.Model):
+    __table_args__ = (
+        db.Index('ix_investment_user_id_date', 'user_id', 'date'),
+        db.Index('ix_investment_user_id_updated_at', 'user_id', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     amount = db.Column(db.Float, nullable=False)
@@ -9,6 +15,9 @@ class Investment(db.Model):
     current_value = db.Column(db.Float, nullable=False)
     investment_type_id = db.Column(db.Integer, db.ForeignKey('investment_type.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+    # Sequence of the latest ledger movement; bumped in the same statement that changes the balance
+    movement_count = db.Column(db.Integer, nullable=False, default=0)
     
     # Relacionamentos
     investment_type = db.relationship('InvestmentType', backref=db.backref('investments', lazy=True))
@@ -0,0 +1,49 @@
+from src.models.user import db
+from src.models.timestamps import utcnow
+
+class InvestmentMovement(db.Model):
+    """Append-only record of every change to an investment's current value."""
+    __tablename__ = 'investment_movement'
+    __table_args__ = (
+        db.UniqueConstraint('investment_id', 'sequence', name='uq_investment_movement_investment_id_sequence'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    investment_id = db.Column(db.Integer, db.ForeignKey('investment.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # 'opening', 'contribution', 'withdrawal' or 'adjustment'
+    amount = db.Column(db.Float, nullable=False)  # signed: withdrawals are negative
+    # Position in the investment's ledger, starting at 1 for the opening balance
+    sequence = db.Column(db.Integer, nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    def __repr__(self):
+        return f'<InvestmentMovement {self.investment_id}#{self.sequence} {self.kind} {self.amount}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'investment_id': self.investment_id,
+            'kind': self.kind,
+            'amount': self.amount,
+            'sequence': self.sequence,
+            'occurred_at': self.occurred_at.isoformat() if self.occurred_at else None
+        }
+
+
+class InvestmentSnapshot(db.Model):
+    """Balance of an investment after a given ledger sequence, written every few movements."""
+    __tablename__ = 'investment_snapshot'
+    __table_args__ = (
+        db.UniqueConstraint('investment_id', 'sequence', name='uq_investment_snapshot_investment_id_sequence'),
+        db.Index('ix_investment_snapshot_investment_id_taken_at', 'investment_id', 'taken_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    investment_id = db.Column(db.Integer, db.ForeignKey('investment.id'), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    balance = db.Column(db.Float, nullable=False)
+    taken_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<InvestmentSnapshot {self.investment_id}#{self.sequence}={self.balance}>'
@@ -1,9 +1,11 @@
 from src.models.user import db
+from src.models.timestamps import utcnow
 
 class InvestmentType(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
 
     def __repr__(self):
         return f'<InvestmentType {self.name}>'
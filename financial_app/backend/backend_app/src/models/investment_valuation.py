@@ -0,0 +1,26 @@
+from src.models.user import db
+
+class InvestmentValuation(db.Model):
+    """Closing value of an investment on a day when its value changed.
+
+    One row per investment and day, so an instrument valued daily for years
+    stays at a few hundred rows per year.
+    """
+    __tablename__ = 'investment_valuation'
+    __table_args__ = (
+        db.UniqueConstraint('investment_id', 'date', name='uq_investment_valuation_investment_id_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    investment_id = db.Column(db.Integer, db.ForeignKey('investment.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    value = db.Column(db.Float, nullable=False)
+
+    def __repr__(self):
+        return f'<InvestmentValuation {self.investment_id}@{self.date}={self.value}>'
+
+    def to_dict(self):
+        return {
+            'date': self.date.isoformat() if self.date else None,
+            'value': self.value
+        }
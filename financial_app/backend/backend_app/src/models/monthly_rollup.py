@@ -0,0 +1,49 @@
+from src.models.user import db
+
+class MonthlyRollup(db.Model):
+    """Per-user monthly totals of transactions, kept in step with the transaction table.
+
+    One row per (user, month, category, payment method, type), enforced by
+    uq_monthly_rollup_key below. Maintained by the session hooks in
+    src/rollup.py and rebuilt from scratch with `manage.py rebuild_rollup`.
+    """
+    __tablename__ = 'monthly_rollup'
+    __table_args__ = (
+        db.Index('ix_monthly_rollup_user_id_year_month', 'user_id', 'year_month'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    year_month = db.Column(db.String(7), nullable=False)  # 'YYYY-MM'
+    category_id = db.Column(db.Integer, nullable=False)
+    payment_method_id = db.Column(db.Integer, nullable=True)
+    transaction_type = db.Column(db.String(20), nullable=False)
+    total = db.Column(db.Float, nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<MonthlyRollup {self.user_id} {self.year_month}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'year_month': self.year_month,
+            'category_id': self.category_id,
+            'payment_method_id': self.payment_method_id,
+            'transaction_type': self.transaction_type,
+            'total': self.total,
+            'count': self.count
+        }
+
+
+# The rollup key; a NULL payment method is keyed as 0 so it stays unique too. The 0 is
+# a literal rather than a bound parameter so ON CONFLICT matches the index expression
+ROLLUP_KEY = (
+    MonthlyRollup.user_id,
+    MonthlyRollup.year_month,
+    MonthlyRollup.category_id,
+    db.func.coalesce(MonthlyRollup.payment_method_id, db.literal_column("0")),
+    MonthlyRollup.transaction_type,
+)
+db.Index('uq_monthly_rollup_key', *ROLLUP_KEY, unique=True)
@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def utcnow():
+    """Current UTC time as a naive datetime, the form DateTime columns are stored in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
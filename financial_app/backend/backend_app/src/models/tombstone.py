@@ -0,0 +1,27 @@
+from src.models.user import db
+from src.models.timestamps import utcnow
+
+class Tombstone(db.Model):
+    """Marker left behind when a user-owned row is deleted, so delta sync can report it."""
+    __tablename__ = 'tombstone'
+    __table_args__ = (
+        db.Index('ix_tombstone_user_id_deleted_at', 'user_id', 'deleted_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    resource = db.Column(db.String(50), nullable=False)
+    resource_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    def __repr__(self):
+        return f'<Tombstone {self.resource} {self.resource_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'resource': self.resource,
+            'resource_id': self.resource_id,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None
+        }
@@ -1,7 +1,14 @@
 from src.models.user import db
+from src.models.timestamps import utcnow
 from datetime import datetime, timezone
 
 class Transaction(db.Model):
+    __table_args__ = (
+        db.Index('ix_transaction_user_id_date', 'user_id', 'date'),
+        db.Index('uq_transaction_user_id_import_hash', 'user_id', 'import_hash', unique=True),
+        db.Index('ix_transaction_user_id_updated_at', 'user_id', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.String(200), nullable=False)
     amount = db.Column(db.Float, nullable=False)
@@ -11,6 +18,10 @@ class Transaction(db.Model):
     payment_method_id = db.Column(db.Integer, db.ForeignKey('payment_method.id'), nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     notes = db.Column(db.Text, default='')
+    # Fingerprint of the statement line a row was imported from; NULL for rows entered by hand
+    # and for lines imported again on purpose (skip_duplicates=false), so it stays unique per user
+    import_hash = db.Column(db.String(64), nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
     
     # Relacionamentos
     category = db.relationship('Category', backref=db.backref('transactions', lazy=True))
@@ -0,0 +1,188 @@
+import numpy as np
+from sqlalchemy import select
+from src.models.investment import Investment
+from src.models.investment_type import InvestmentType
+from src.models.investment_movement import InvestmentMovement
+
+# Ledger movements that move money into or out of an investment; adjustments are market moves
+FLOW_KINDS = ('opening', 'contribution', 'withdrawal')
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+# Below this a balance counts as empty, so float noise after a full withdrawal is not a return
+BALANCE_EPSILON = 1e-9
+# XIRR is not annualised over flows spanning less than a day
+MIN_XIRR_YEARS = 1 / 365
+XIRR_MAX_ITERATIONS = 50
+XIRR_TOLERANCE = 1e-10
+
+
+def load_movements(session, user_id, before):
+    """A user's investment movements up to `before` as NumPy arrays, in time order.
+
+    One query; the arrays are aligned by index: investment_id,
+    investment_type_id, amount, is_flow and time (seconds since the epoch).
+    """
+    rows = session.execute(
+        select(
+            InvestmentMovement.investment_id,
+            Investment.investment_type_id,
+            InvestmentMovement.kind,
+            InvestmentMovement.amount,
+            InvestmentMovement.occurred_at
+        )
+        .join(Investment, Investment.id == InvestmentMovement.investment_id)
+        .where(InvestmentMovement.user_id == user_id, InvestmentMovement.occurred_at < before)
+        .order_by(InvestmentMovement.occurred_at, InvestmentMovement.investment_id, InvestmentMovement.sequence)
+    ).all()
+
+    investment_ids, type_ids, kinds, amounts, times = zip(*rows) if rows else ((),) * 5
+    return {
+        "investment_id": np.array(investment_ids, dtype=np.int64),
+        "investment_type_id": np.array(type_ids, dtype=np.int64),
+        "amount": np.array(amounts, dtype=np.float64),
+        "is_flow": np.array([kind in FLOW_KINDS for kind in kinds], dtype=bool),
+        "time": np.array(times, dtype="datetime64[us]").astype("datetime64[s]").astype(np.float64),
+    }
+
+
+def time_weighted_returns(groups, amounts, is_flow, group_count):
+    """Cumulative time-weighted return of every group.
+
+    `groups` holds codes in [0, group_count), sorted so each group's
+    movements are contiguous and in time order. Every movement that is not
+    a cash flow is a valuation change, and chaining their growth factors
+    gives the TWR: the running balance before and after each movement comes
+    from one cumulative sum, and the log growth is summed per group.
+    """
+    if len(amounts) == 0:
+        return np.zeros(group_count)
+    totals = np.cumsum(amounts)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    lengths = np.diff(np.r_[starts, len(groups)])
+    after = totals - np.repeat(totals[starts] - amounts[starts], lengths)
+    before = after - amounts
+
+    growing = ~is_flow & (before > BALANCE_EPSILON)
+    log_growth = np.zeros(len(amounts))
+    with np.errstate(divide="ignore"):
+        # A value marked down to zero is a -100% period: log(0) = -inf, exp(-inf) - 1 = -1
+        log_growth[growing] = np.log(np.maximum(after[growing], 0) / before[growing])
+    return np.expm1(np.bincount(groups, weights=log_growth, minlength=group_count))
+
+
+def money_weighted_returns(groups, cash_flows, years, group_count):
+    """Annualised XIRR of every group, NaN where it has no solution.
+
+    `cash_flows` are signed from the investor's side (money in is negative,
+    withdrawals and the closing value positive) and `years` are offsets from
+    each group's first flow. Solves sum(cf * (1 + r) ** -t) = 0 with Newton's
+    method on x = log(1 + r) for all groups at once, so each iteration is a
+    couple of bincounts over the flows.
+    """
+    inflow = np.bincount(groups, weights=np.maximum(cash_flows, 0), minlength=group_count)
+    outflow = np.bincount(groups, weights=np.maximum(-cash_flows, 0), minlength=group_count)
+    span = np.zeros(group_count)
+    np.maximum.at(span, groups, years)
+
+    solvable = (inflow > 0) & (outflow > 0) & (span >= MIN_XIRR_YEARS)
+    # Exact for a single deposit and a closing value, and close for most portfolios
+    x = np.zeros(group_count)
+    x[solvable] = np.log(inflow[solvable] / outflow[solvable]) / span[solvable]
+
+    active = solvable.copy()
+    for _ in range(XIRR_MAX_ITERATIONS):
+        if not active.any():
+            break
+        discounted = cash_flows * np.exp(-years * x[groups])
+        value = np.bincount(groups, weights=discounted, minlength=group_count)
+        slope = np.bincount(groups, weights=-years * discounted, minlength=group_count)
+        step = np.zeros(group_count)
+        np.divide(value, slope, out=step, where=active & (slope != 0))
+        x -= np.clip(step, -1, 1)
+        active &= np.abs(step) > XIRR_TOLERANCE
+
+    return np.where(solvable & ~active, np.expm1(x), np.nan)
+
+
+def _group_performance(keys, movements, as_of):
+    """TWR, XIRR, closing value and net contributions for each distinct key."""
+    unique_keys, codes = np.unique(keys, return_inverse=True)
+    group_count = len(unique_keys)
+    # Stable, so each group keeps the time order the movements were loaded in
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    amounts = movements["amount"][order]
+    is_flow = movements["is_flow"][order]
+    times = movements["time"][order]
+
+    twr = time_weighted_returns(codes, amounts, is_flow, group_count)
+    value = np.bincount(codes, weights=amounts, minlength=group_count)
+    net_contributions = np.bincount(codes, weights=np.where(is_flow, amounts, 0), minlength=group_count)
+
+    # Investor-side flows, then each group's closing value as a final inflow at as_of
+    flow_codes = np.r_[codes[is_flow], np.arange(group_count)]
+    cash_flows = np.r_[-amounts[is_flow], value]
+    flow_times = np.r_[times[is_flow], np.full(group_count, as_of)]
+    first = np.full(group_count, np.inf)
+    np.minimum.at(first, flow_codes, flow_times)
+    years = (flow_times - first[flow_codes]) / SECONDS_PER_YEAR
+    xirr = money_weighted_returns(flow_codes, cash_flows, years, group_count)
+
+    return {
+        key: (twr[i], xirr[i], value[i], net_contributions[i])
+        for i, key in enumerate(unique_keys.tolist())
+    }
+
+
+def _percentage(rate):
+    return None if np.isnan(rate) else float(rate * 100)
+
+
+def _performance_dict(twr, xirr, value, net_contributions):
+    return {
+        "current_value": float(value),
+        "net_contributions": float(net_contributions),
+        "twr_percentage": _percentage(twr),
+        "xirr_percentage": _percentage(xirr),
+    }
+
+
+def portfolio_performance(session, user_id, before):
+    """Time- and money-weighted returns per investment, per investment type and overall.
+
+    Cash flows and valuations come from the investment ledger, read up to
+    (excluding) `before`, which is also the date the XIRR closing values
+    are taken at.
+    """
+    movements = load_movements(session, user_id, before)
+    as_of = np.datetime64(before, "s").astype(np.float64)
+    empty = (0.0, np.nan, 0.0, 0.0)
+
+    by_investment = _group_performance(movements["investment_id"], movements, as_of)
+    by_type = _group_performance(movements["investment_type_id"], movements, as_of)
+    overall = _group_performance(np.zeros(len(movements["amount"]), dtype=np.int64), movements, as_of)
+
+    investments = session.execute(
+        select(Investment.id, Investment.name, Investment.investment_type_id)
+        .where(Investment.user_id == user_id)
+        .order_by(Investment.id)
+    ).all()
+    investment_types = session.execute(
+        select(InvestmentType.id, InvestmentType.name)
+        .where(InvestmentType.id.in_({type_id for _, _, type_id in investments}))
+        .order_by(InvestmentType.name)
+    ).all()
+
+    return {
+        "portfolio": _performance_dict(*overall.get(0, empty)),
+        "by_investment_type": [
+            {"investment_type_id": type_id, "investment_type_name": name,
+             **_performance_dict(*by_type.get(type_id, empty))}
+            for type_id, name in investment_types
+        ],
+        "investments": [
+            {"investment_id": investment_id, "name": name, "investment_type_id": type_id,
+             **_performance_dict(*by_investment.get(investment_id, empty))}
+            for investment_id, name, type_id in investments
+        ],
+    }
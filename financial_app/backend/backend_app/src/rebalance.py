@@ -0,0 +1,38 @@
+import numpy as np
+
+# Trades smaller than half a cent round to nothing and are left out
+MIN_TRADE = 0.005
+
+
+def rebalance_trades(current_values, target_weights, cash=0.0, allow_withdrawals=True):
+    """Contributions (positive) and withdrawals (negative) that bring each bucket to its target weight.
+
+    `current_values` and `target_weights` are aligned arrays over the
+    buckets (investment types), and the weights must sum to 1. Works on the
+    aggregates in one vectorized pass and returns (trades, total_after).
+
+    With withdrawals allowed, the portfolio total after the trades is the
+    current total plus `cash`, which makes every bucket's trade the
+    smallest one that reaches its target. Without them, the total grows to
+    the smallest value at which no bucket is above its target, and only
+    contributions are returned. Raises ValueError with a client-facing
+    message when the targets cannot be reached.
+    """
+    current = np.asarray(current_values, dtype=np.float64)
+    weights = np.asarray(target_weights, dtype=np.float64)
+    total = current.sum() + cash
+    if total < 0:
+        raise ValueError("Cash withdrawn exceeds the portfolio's current value")
+
+    if not allow_withdrawals:
+        if cash < 0:
+            raise ValueError("Cash must not be negative when withdrawals are not allowed")
+        funded = weights > 0
+        if (current[~funded] > MIN_TRADE).any():
+            raise ValueError("Reaching these targets requires withdrawals")
+        if funded.any():
+            total = max(total, (current[funded] / weights[funded]).max())
+
+    trades = np.round(weights * total - current, 2)
+    trades[np.abs(trades) < MIN_TRADE] = 0
+    return trades, total
@@ -0,0 +1,192 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from sqlalchemy import event, func, select, insert, delete, inspect
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.monthly_rollup import MonthlyRollup, ROLLUP_KEY
+from src.upsert import upsert
+
+_TRACKED_ATTRIBUTES = ('user_id', 'date', 'category_id', 'payment_method_id', 'transaction_type', 'amount')
+_rollup = MonthlyRollup.__table__
+
+
+def _optional_int(value):
+    return int(value) if value is not None else None
+
+
+def _rollup_key(values):
+    day = values['date'] or datetime.now(timezone.utc).date()
+    return (
+        int(values['user_id']),
+        day.strftime('%Y-%m'),
+        int(values['category_id']),
+        _optional_int(values['payment_method_id']),
+        values['transaction_type']
+    )
+
+
+def _key_filter(key):
+    user_id, year_month, category_id, payment_method_id, transaction_type = key
+    return [
+        _rollup.c.user_id == user_id,
+        _rollup.c.year_month == year_month,
+        _rollup.c.category_id == category_id,
+        _rollup.c.payment_method_id.is_(None) if payment_method_id is None
+        else _rollup.c.payment_method_id == payment_method_id,
+        _rollup.c.transaction_type == transaction_type,
+    ]
+
+
+def rollup_deltas(rows, sign=1):
+    """Folds transaction value dicts into {rollup key: (total delta, count delta)}."""
+    deltas = defaultdict(lambda: [0.0, 0])
+    for values in rows:
+        delta = deltas[_rollup_key(values)]
+        delta[0] += sign * float(values['amount'])
+        delta[1] += sign
+    return deltas
+
+
+def rollup_changes(added, removed):
+    """Net deltas for rows written (`added`) and the old values they replaced or deleted (`removed`)."""
+    deltas = rollup_deltas(added)
+    for key, (total, count) in rollup_deltas(removed, sign=-1).items():
+        deltas[key][0] += total
+        deltas[key][1] += count
+    return deltas
+
+
+def apply_rollup_deltas(connection, deltas):
+    """Adds the deltas to the rollup on `connection`, inside the caller's transaction.
+
+    Each key is one INSERT ... ON CONFLICT DO UPDATE against
+    uq_monthly_rollup_key, so concurrent first writes to the same month add
+    to one row. Bulk Core writes that bypass the ORM flush (and so the
+    session hooks below) must call this themselves.
+    """
+    for key, (total, count) in deltas.items():
+        if count == 0 and total == 0:
+            continue
+        user_id, year_month, category_id, payment_method_id, transaction_type = key
+        statement = upsert(connection, _rollup).values(
+            user_id=user_id, year_month=year_month, category_id=category_id,
+            payment_method_id=payment_method_id, transaction_type=transaction_type,
+            total=total, count=count
+        )
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=ROLLUP_KEY,
+            set_={
+                "total": _rollup.c.total + statement.excluded.total,
+                "count": _rollup.c.count + statement.excluded.count,
+            }
+        ))
+        if count < 0:
+            connection.execute(delete(_rollup).where(*_key_filter(key), _rollup.c.count <= 0))
+
+
+def _current_values(transaction):
+    return {attribute: getattr(transaction, attribute) for attribute in _TRACKED_ATTRIBUTES}
+
+
+def _committed_values(session, transaction):
+    """Values of the tracked columns as they are in the database, before this flush."""
+    state = inspect(transaction)
+    values = {}
+    for attribute in _TRACKED_ATTRIBUTES:
+        history = state.attrs[attribute].history
+        if history.deleted:
+            values[attribute] = history.deleted[0]
+        elif history.unchanged:
+            values[attribute] = history.unchanged[0]
+        elif not history.added:
+            values[attribute] = getattr(transaction, attribute)
+        else:
+            # Changed without the old value ever being loaded; the row still has it
+            row = session.connection().execute(
+                select(*[Transaction.__table__.c[name] for name in _TRACKED_ATTRIBUTES])
+                .where(Transaction.__table__.c.id == transaction.id)
+            ).one()
+            return dict(zip(_TRACKED_ATTRIBUTES, row))
+    return values
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_committed_transactions(session, flush_context, instances):
+    # Old values must be read before the UPDATE/DELETE statements run
+    session.info['rollup_removed'] = [
+        _committed_values(session, obj)
+        for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, Transaction) and obj.id is not None
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _update_monthly_rollup(session, flush_context):
+    removed = session.info.pop('rollup_removed', [])
+    added = [
+        _current_values(obj)
+        for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Transaction) and obj not in session.deleted
+    ]
+    if not removed and not added:
+        return
+
+    apply_rollup_deltas(session.connection(), rollup_changes(added, removed))
+
+
+def _year_month(column):
+    if db.engine.dialect.name == 'sqlite':
+        return func.strftime('%Y-%m', column)
+    return func.to_char(column, 'YYYY-MM')
+
+
+def rebuild_monthly_rollup(user_id=None):
+    """Recomputes the rollup from the transaction table, for one user or everyone."""
+    clear = delete(_rollup)
+    source = select(
+        Transaction.user_id,
+        _year_month(Transaction.date),
+        Transaction.category_id,
+        Transaction.payment_method_id,
+        Transaction.transaction_type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id)
+    )
+    if user_id is not None:
+        clear = clear.where(_rollup.c.user_id == user_id)
+        source = source.where(Transaction.user_id == user_id)
+    source = source.group_by(
+        Transaction.user_id,
+        _year_month(Transaction.date),
+        Transaction.category_id,
+        Transaction.payment_method_id,
+        Transaction.transaction_type
+    )
+
+    db.session.execute(clear)
+    db.session.execute(insert(_rollup).from_select(
+        ['user_id', 'year_month', 'category_id', 'payment_method_id', 'transaction_type', 'total', 'count'],
+        source
+    ))
+    db.session.commit()
+
+
+def period_filters(args):
+    """Rollup equivalent of date_range_filters for month-aligned periods.
+
+    Returns None when the period cannot be answered from whole months
+    (start_date/end_date, or a month without a year); callers then fall back
+    to the transaction table. Expects args already validated by date_range_filters.
+    """
+    if args.get("start_date") or args.get("end_date"):
+        return None
+    year = args.get("year")
+    month = args.get("month")
+    if month and not year:
+        return None
+    if year and month:
+        return [MonthlyRollup.year_month == f"{int(year):04d}-{int(month):02d}"]
+    if year:
+        return [MonthlyRollup.year_month.between(f"{int(year):04d}-01", f"{int(year):04d}-12")]
+    return []
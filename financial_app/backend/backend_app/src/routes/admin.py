@@ -3,6 +3,7 @@ from functools import wraps
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from src.models.user import db
+from src.cache import response_cache
 
 admin_bp = Blueprint("admin_bp", __name__)
 
@@ -44,8 +45,55 @@ def clean_database():
     try:
         db.drop_all()
         db.create_all()
+        response_cache.clear()
         return jsonify({"message": "All tables dropped and recreated successfully."}), 200
     except Exception as e:
         # Log the exception for debugging
         # current_app.logger.error(f"Error cleaning database: {e}", exc_info=True)
         return jsonify({"message": "An error occurred while cleaning the database."}), 500
+
+@admin_bp.route("/admin/cache-stats", methods=["GET"])
+@api_key_required
+@jwt_required()
+def cache_stats():
+    """Response Cache Statistics
+    Returns the response cache's hit/miss counters for the worker that serves the request. Requires user authentication and a specific API key.
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+      - apiKey: []
+    parameters:
+      - name: reset
+        in: query
+        type: boolean
+        required: false
+        description: Reset the counters after reading them.
+    responses:
+      200:
+        description: Cache backend, entry count and hit/miss counters overall and per endpoint.
+        schema:
+          type: object
+          properties:
+            backend:
+              type: string
+              example: memory
+            entries:
+              type: integer
+            hits:
+              type: integer
+            misses:
+              type: integer
+            hit_ratio:
+              type: number
+              example: 0.8
+            endpoints:
+              type: object
+      401:
+        description: Unauthorized, invalid or missing API key.
+    """
+    stats = response_cache.stats()
+    if request.args.get("reset", "").lower() == "true":
+        response_cache.reset_stats()
+    return jsonify(stats), 200
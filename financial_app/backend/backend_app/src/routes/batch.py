@@ -0,0 +1,123 @@
+from flask import Blueprint, request, jsonify, current_app, make_response
+from flask_jwt_extended import jwt_required
+from werkzeug.exceptions import NotFound
+from werkzeug.test import EnvironBuilder
+
+batch_bp = Blueprint("batch_bp", __name__)
+
+MAX_BATCH_REQUESTS = 20
+# Request headers a sub-request may set; credentials always come from the batch request itself
+FORWARDED_HEADERS = ("If-None-Match", "Accept")
+CREDENTIAL_HEADERS = ("Authorization", "Cookie")
+RETURNED_HEADERS = ("ETag", "Cache-Control", "Content-Disposition")
+
+def _parse_sub_request(item):
+    if not isinstance(item, dict):
+        raise ValueError("Each request must be an object")
+    method = str(item.get("method", "GET")).upper()
+    if method != "GET":
+        raise ValueError("Only GET requests can be batched")
+    path = item.get("path")
+    if not isinstance(path, str) or not path.startswith("/api/"):
+        raise ValueError("Path must start with /api/")
+    headers = item.get("headers") or {}
+    if not isinstance(headers, dict):
+        raise ValueError("Headers must be an object")
+    return path, {name: str(value) for name, value in headers.items() if name in FORWARDED_HEADERS}
+
+
+def _dispatch(path, headers):
+    app = current_app._get_current_object()
+    path, _, query_string = path.partition("?")
+    # Each view verifies the batch request's own credentials, however it guards itself
+    headers = dict(headers)
+    headers.update((name, request.headers[name]) for name in CREDENTIAL_HEADERS if name in request.headers)
+    environ = EnvironBuilder(
+        path=path,
+        query_string=query_string,
+        method="GET",
+        headers=headers,
+        base_url=request.host_url,
+    ).get_environ()
+
+    # Shares the batch request's app context, so the DB session carries over
+    with app.request_context(environ):
+        try:
+            if request.routing_exception is not None:
+                raise request.routing_exception
+            if not request.url_rule.rule.startswith("/api/"):
+                # The frontend's catch-all route, not an API endpoint
+                raise NotFound()
+            view = app.view_functions[request.url_rule.endpoint]
+            response = make_response(app.ensure_sync(view)(**request.view_args))
+        except Exception as e:
+            response = make_response(app.handle_user_exception(e))
+
+        if response.is_streamed:
+            response.close()
+            return {"status": 400, "headers": {}, "body": {"message": "Streaming responses cannot be batched"}}
+        body = None
+        if response.status_code != 304:
+            body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+        headers = {name: response.headers[name] for name in RETURNED_HEADERS if name in response.headers}
+        return {"status": response.status_code, "headers": headers, "body": body}
+
+
+@batch_bp.route("/batch", methods=["POST"])
+@jwt_required()
+def batch():
+    """Run several GET requests in one exchange
+    Executes up to 20 GET sub-requests against existing /api routes and returns all their responses in order.
+    Each sub-request verifies the batch request's credentials and they share one request's database session; each keeps its own status, ETag and body, and honours its own If-None-Match.
+    ---
+    tags:
+      - Batch
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - requests
+            properties:
+              requests:
+                type: array
+                items:
+                  type: object
+                  required:
+                    - path
+                  properties:
+                    method:
+                      type: string
+                      enum: [GET]
+                      example: "GET"
+                    path:
+                      type: string
+                      example: "/api/dashboard?year=2024&month=5"
+                    headers:
+                      type: object
+                      description: Only If-None-Match and Accept are forwarded.
+    responses:
+      200:
+        description: One entry per sub-request, in order, with status, headers and body.
+      400:
+        description: Bad request (e.g., missing or too many sub-requests, non-GET method).
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("requests")
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "requests must be a non-empty list"}), 400
+    if len(items) > MAX_BATCH_REQUESTS:
+        return jsonify({"message": f"At most {MAX_BATCH_REQUESTS} requests per batch"}), 400
+
+    sub_requests = []
+    for index, item in enumerate(items):
+        try:
+            sub_requests.append(_parse_sub_request(item))
+        except ValueError as e:
+            return jsonify({"message": f"Request {index}: {e}"}), 400
+
+    return jsonify({"responses": [_dispatch(path, headers) for path, headers in sub_requests]})
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from src.models.user import db
 from src.models.category import Category
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get
+from src.cache import response_cache
 
 category_bp = Blueprint("category_bp", __name__)
 
@@ -59,6 +61,8 @@ def add_category():
 
 @category_bp.route("/categories", methods=["GET"])
 @jwt_required()
+@conditional_get('categories')
+@response_cache.cached('categories')
 def get_categories():
     """Get all categories
     Retrieves a list of all categories for the authenticated user, with optional filtering by type.
@@ -95,6 +99,7 @@ def get_categories():
 
 @category_bp.route("/categories/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional_get('categories')
 def get_category(id):
     """Get a specific category
     Retrieves a single category by its ID.
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get
+from src.cache import response_cache
+from src.models.transaction import Transaction
+from src.models.investment import Investment
+from src.aggregates import transaction_totals, investment_totals, goal_totals
+from src.date_filters import date_range_filters
+from src.rollup import period_filters
+
+dashboard_bp = Blueprint("dashboard_bp", __name__)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="dashboard")
+    return _executor
+
+
+def _run_in_app_context(app, func, *args):
+    # Each worker gets its own app context, and with it its own session and connection
+    with app.app_context():
+        return func(*args)
+
+
+def _run_aggregates(jobs):
+    if not current_app.config.get("DASHBOARD_PARALLEL_QUERIES"):
+        return {key: func(*args) for key, (func, args) in jobs.items()}
+
+    app = current_app._get_current_object()
+    futures = {
+        key: _get_executor().submit(_run_in_app_context, app, func, *args)
+        for key, (func, args) in jobs.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
+
+
+@dashboard_bp.route("/dashboard", methods=["GET"])
+@jwt_required()
+@conditional_get('transactions', 'investments', 'goals')
+@response_cache.cached('transactions', 'investments', 'goals')
+def get_dashboard():
+    """Get dashboard data
+    Retrieves transaction totals, investment totals and goal progress for the authenticated user in a single response.
+    ---
+    tags:
+      - Dashboard
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: year
+        in: query
+        type: integer
+        required: false
+        description: Filter transactions and investments by year.
+      - name: month
+        in: query
+        type: integer
+        required: false
+        description: Filter transactions and investments by month.
+    responses:
+      200:
+        description: Dashboard aggregates.
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                transactions:
+                  type: object
+                  description: Same fields as GET /transactions/summary.
+                investments:
+                  type: object
+                  description: Same fields as GET /investments/summary, limited to the period.
+                goals:
+                  type: object
+                  description: Same fields as GET /goals/summary.
+      400:
+        description: Bad request (e.g., invalid year or month).
+    """
+    user_id = get_jwt_identity()
+    period_args = {key: request.args.get(key) for key in ("year", "month")}
+
+    try:
+        transaction_filters = date_range_filters(Transaction.date, period_args)
+        investment_filters = date_range_filters(Investment.date, period_args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # One aggregate query per table
+    results = _run_aggregates({
+        "transactions": (transaction_totals, (user_id, transaction_filters, period_filters(period_args))),
+        "investments": (investment_totals, (user_id, investment_filters)),
+        "goals": (goal_totals, (user_id,)),
+    })
+    return jsonify(results)
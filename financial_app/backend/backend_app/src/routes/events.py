@@ -0,0 +1,67 @@
+import json
+import queue
+import time
+from flask import Blueprint, Response, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.events import event_broker
+from src.extensions import limiter
+
+events_bp = Blueprint("events_bp", __name__)
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+@events_bp.route("/events", methods=["GET"])
+@jwt_required()
+@limiter.exempt
+def stream_events():
+    """Stream change events
+    Opens a Server-Sent Events stream of the authenticated user's writes, from any tab or device.
+    Each `change` event carries `{resource, id, op}` with op `create`, `update` or `delete`, so the client can refetch only what changed.
+    `op: bulk` (id null) follows imports and large batches and means the whole resource should be refetched; `op: resync` means events were dropped and everything should be refetched.
+    The server closes the stream after EVENTS_STREAM_MAX_SECONDS and the browser reconnects on its own; a `ready` event is sent on every (re)connect.
+    ---
+    tags:
+      - Events
+    security:
+      - bearerAuth: []
+    produces:
+      - text/event-stream
+    responses:
+      200:
+        description: An event stream of change notifications.
+      429:
+        description: The user already has the maximum number of open streams.
+    """
+    user_id = int(get_jwt_identity())
+    subscription = event_broker.subscribe(user_id)
+    if subscription is None:
+        return jsonify({"message": "Too many open event streams"}), 429
+
+    heartbeat = current_app.config.get("EVENTS_HEARTBEAT_SECONDS", 15)
+    max_duration = current_app.config.get("EVENTS_STREAM_MAX_SECONDS", 300)
+
+    def generate():
+        yield "retry: 3000\n\n"
+        yield _sse("ready", {})
+        deadline = time.monotonic() + max_duration
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                payload = subscription.get(timeout=min(heartbeat, remaining))
+            except queue.Empty:
+                # Comment line: keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            yield _sse("change", payload)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    # Runs even if the client disconnects before the first chunk is sent
+    response.call_on_close(lambda: event_broker.unsubscribe(user_id, subscription))
+    return response
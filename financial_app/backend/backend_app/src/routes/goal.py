@@ -1,8 +1,14 @@
 from flask import Blueprint, request, jsonify
 from src.models.user import db
 from src.models.goal import Goal
+from src.aggregates import goal_totals, goal_totals_by_status
 from datetime import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import update, case, and_, func
+from src.versioning import conditional_get, bump_versions
+from src.events import record_events
+from src.ledger import goal_ledger, balance_cutoff
+from src.cache import response_cache
 import bleach
 
 goal_bp = Blueprint("goal_bp", __name__)
@@ -110,6 +116,7 @@ def add_goal():
 
 @goal_bp.route("/goals", methods=["GET"])
 @jwt_required()
+@conditional_get('goals')
 def get_goals():
     """Get all goals
     Retrieves a list of all goals for the authenticated user, with optional filtering by status.
@@ -144,6 +151,7 @@ def get_goals():
 
 @goal_bp.route("/goals/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional_get('goals')
 def get_goal(id):
     """Get a specific goal
     Retrieves a single goal by its ID.
@@ -216,7 +224,8 @@ def update_goal(id):
         description: Goal not found.
     """
     user_id = get_jwt_identity()
-    goal = Goal.query.filter_by(id=id, user_id=user_id).first_or_404()
+    # Locked so the ledger adjustment for a new current_amount is computed against the value it replaces
+    goal = Goal.query.filter_by(id=id, user_id=user_id).with_for_update().first_or_404()
     data = request.get_json()
     
     name = data.get("name")
@@ -328,7 +337,6 @@ def contribute_to_goal(id):
         description: Goal not found.
     """
     user_id = get_jwt_identity()
-    goal = Goal.query.filter_by(id=id, user_id=user_id).first_or_404()
     data = request.get_json()
     contribution = data.get("amount")
     
@@ -341,17 +349,83 @@ def contribute_to_goal(id):
     except ValueError:
         return jsonify({"message": "Contribution amount must be a valid number"}), 400
 
-    goal.current_amount += contribution
-    
-    # Verificar se a meta foi atingida
-    if goal.current_amount >= goal.target_amount and goal.status == "active":
-        goal.status = "completed"
-    
+    # One conditional UPDATE ... RETURNING: the sum happens in the database, so
+    # concurrent contributions cannot overwrite each other
+    new_amount = func.coalesce(Goal.current_amount, 0) + contribution
+    goal = db.session.execute(
+        update(Goal)
+        .where(Goal.id == id, Goal.user_id == user_id)
+        .values(
+            current_amount=new_amount,
+            # Verificar se a meta foi atingida
+            status=case(
+                (and_(Goal.status == "active", new_amount >= Goal.target_amount), "completed"),
+                else_=Goal.status
+            ),
+            movement_count=Goal.movement_count + 1
+        )
+        .returning(Goal)
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if goal is None:
+        return jsonify({"message": "Goal not found"}), 404
+
+    goal_ledger.record(db.session, goal.id, user_id, 'contribution', contribution, goal.movement_count, goal.current_amount)
+    # The statement bypasses the flush, so the session hooks never see it
+    bump_versions(db.session, user_id, ['goals'])
+    record_events(db.session, user_id, 'goals', [goal.id], 'update')
+    result = goal.to_dict()
     db.session.commit()
-    return jsonify(goal.to_dict())
+    return jsonify(result)
+
+@goal_bp.route("/goals/<int:id>/balance", methods=["GET"])
+@jwt_required()
+@conditional_get('goals')
+def get_goal_balance(id):
+    """Get a goal's balance at a point in time
+    Returns the amount saved towards the goal at the end of a given day, read from its movement ledger.
+    ---
+    tags:
+      - Goal
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the goal.
+      - name: at
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Day (YYYY-MM-DD) whose closing balance to return. Defaults to now.
+    responses:
+      200:
+        description: The balance at the requested point in time.
+      400:
+        description: Bad request (e.g., invalid date).
+      404:
+        description: Goal not found.
+    """
+    user_id = get_jwt_identity()
+    try:
+        at = balance_cutoff(request.args.get("at"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    goal = Goal.query.filter_by(id=id, user_id=user_id).first_or_404()
+    return jsonify({
+        "goal_id": goal.id,
+        "at": request.args.get("at"),
+        "balance": goal_ledger.balance_at(db.session, goal.id, at),
+    })
 
 @goal_bp.route("/goals/summary", methods=["GET"])
 @jwt_required()
+@conditional_get('goals')
+@response_cache.cached('goals')
 def get_goals_summary():
     """Get goals summary
     Retrieves a summary of all goals for the authenticated user.
@@ -360,6 +434,13 @@ def get_goals_summary():
       - Goal
     security:
       - bearerAuth: []
+    parameters:
+      - name: group_by
+        in: query
+        type: string
+        enum: [status]
+        required: false
+        description: Also break the totals down per status.
     responses:
       200:
         description: A summary of goals.
@@ -383,28 +464,20 @@ def get_goals_summary():
                 total_progress_percentage:
                   type: number
                   format: float
+                by_status:
+                  type: array
+                  description: Only present when group_by=status. Count and amounts per status.
+                  items:
+                    type: object
+      400:
+        description: Bad request (e.g., invalid grouping).
     """
     user_id = get_jwt_identity()
-    
-    query = Goal.query
-    
-    query = query.filter_by(user_id=user_id)
-    
-    goals = query.all()
-    
-    active_goals = [g for g in goals if g.status == "active"]
-    completed_goals = [g for g in goals if g.status == "completed"]
-    
-    total_target_amount = sum(g.target_amount for g in active_goals)
-    total_current_amount = sum(g.current_amount for g in active_goals)
-    total_progress_percentage = (total_current_amount / total_target_amount * 100) if total_target_amount > 0 else 0
-    
-    return jsonify({
-        "total_goals": len(goals),
-        "active_goals": len(active_goals),
-        "completed_goals": len(completed_goals),
-        "total_target_amount": total_target_amount,
-        "total_current_amount": total_current_amount,
-        "total_progress_percentage": total_progress_percentage
-    })
+    group_by = request.args.get("group_by")
+
+    if group_by == "status":
+        return jsonify(goal_totals_by_status(user_id))
+    if group_by:
+        return jsonify({"message": "Invalid grouping. Must be 'status'"}), 400
 
+    return jsonify(goal_totals(user_id))
@@ -1,13 +1,55 @@
+import math
 from flask import Blueprint, request, jsonify
 from src.models.user import db
 from src.models.investment import Investment
 from src.models.investment_type import InvestmentType
+from src.date_filters import date_range_filters, range_start
+from src.aggregates import investment_totals, investment_totals_by_type, investment_allocation
 from datetime import datetime, timezone
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get, bump_versions
+from src.events import record_events
+from src.ledger import investment_ledger, balance_cutoff
+from src.valuation import investment_valuations, RESOLUTIONS
+from src.models.investment_valuation import InvestmentValuation
+from src.performance import portfolio_performance
+from src.rebalance import rebalance_trades
+from src.cache import response_cache
 import bleach
 
 investment_bp = Blueprint("investment_bp", __name__)
 
+
+def _apply_to_current_value(user_id, id, kind, delta, *conditions):
+    """Adds `delta` to an investment's current value in one conditional UPDATE ... RETURNING.
+
+    The arithmetic happens in the database, so concurrent requests cannot
+    overwrite each other's changes, and the same statement claims the next
+    ledger sequence for the movement. Returns the refreshed investment, or
+    None when no row matched the id, owner and `conditions`.
+    """
+    investment = db.session.execute(
+        update(Investment)
+        .where(Investment.id == id, Investment.user_id == user_id, *conditions)
+        .values(
+            current_value=Investment.current_value + delta,
+            movement_count=Investment.movement_count + 1
+        )
+        .returning(Investment)
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if investment is not None:
+        investment_ledger.record(
+            db.session, investment.id, user_id, kind, delta, investment.movement_count, investment.current_value
+        )
+        # The statement bypasses the flush, so the session hooks never see it
+        bump_versions(db.session, user_id, ['investments'])
+        record_events(db.session, user_id, 'investments', [investment.id], 'update')
+    return investment
+
+
 @investment_bp.route("/investments", methods=["POST"])
 @jwt_required()
 def add_investment():
@@ -114,6 +156,7 @@ def add_investment():
 
 @investment_bp.route("/investments", methods=["GET"])
 @jwt_required()
+@conditional_get('investments', 'investment_types')
 def get_investments():
     """Get all investments
     Retrieves a list of all investments for the authenticated user, with optional filtering.
@@ -138,6 +181,18 @@ def get_investments():
         type: integer
         required: false
         description: Filter investments by month.
+      - name: start_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include investments on or after this date (YYYY-MM-DD).
+      - name: end_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include investments on or before this date (YYYY-MM-DD).
     responses:
       200:
         description: A list of investments.
@@ -146,8 +201,6 @@ def get_investments():
     """
     user_id = get_jwt_identity()
     investment_type_id = request.args.get("investment_type_id")
-    year = request.args.get("year")
-    month = request.args.get("month")
     
     query = Investment.query
     
@@ -160,25 +213,20 @@ def get_investments():
         except ValueError:
             return jsonify({"message": "Invalid investment type ID"}), 400
     
-    if year:
-        try:
-            year = int(year)
-            query = query.filter(db.extract('year', Investment.date) == year)
-        except ValueError:
-            return jsonify({"message": "Invalid year"}), 400
-    
-    if month:
-        try:
-            month = int(month)
-            query = query.filter(db.extract('month', Investment.date) == month)
-        except ValueError:
-            return jsonify({"message": "Invalid month"}), 400
+    try:
+        query = query.filter(*date_range_filters(Investment.date, request.args))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     
-    investments = query.order_by(Investment.date.desc()).all()
+    # Load the investment type in the same query; to_dict embeds it
+    investments = query.options(
+        joinedload(Investment.investment_type)
+    ).order_by(Investment.date.desc()).all()
     return jsonify([investment.to_dict() for investment in investments])
 
 @investment_bp.route("/investments/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional_get('investments', 'investment_types')
 def get_investment(id):
     """Get a specific investment
     Retrieves a single investment by its ID.
@@ -248,7 +296,8 @@ def update_investment(id):
         description: Not found (e.g., investment or investment type not found).
     """
     user_id = get_jwt_identity()
-    investment = Investment.query.filter_by(id=id, user_id=user_id).first_or_404()
+    # Locked so the ledger adjustment for a new current_value is computed against the value it replaces
+    investment = Investment.query.filter_by(id=id, user_id=user_id).with_for_update().first_or_404()
     data = request.get_json()
     
     name = data.get("name")
@@ -364,7 +413,6 @@ def contribute_to_investment(id):
         description: Investment not found.
     """
     user_id = get_jwt_identity()
-    investment = Investment.query.filter_by(id=id, user_id=user_id).first_or_404()
     data = request.get_json()
     contribution = data.get("amount")
     
@@ -377,10 +425,12 @@ def contribute_to_investment(id):
     except ValueError:
         return jsonify({"message": "Contribution amount must be a valid number"}), 400
 
-    investment.current_value += contribution
-    
+    investment = _apply_to_current_value(user_id, id, 'contribution', contribution)
+    if investment is None:
+        return jsonify({"message": "Investment not found"}), 404
+    result = investment.to_dict()
     db.session.commit()
-    return jsonify(investment.to_dict())
+    return jsonify(result)
 
 @investment_bp.route("/investments/<int:id>/withdraw", methods=["POST"])
 @jwt_required()
@@ -420,7 +470,6 @@ def withdraw_from_investment(id):
         description: Investment not found.
     """
     user_id = get_jwt_identity()
-    investment = Investment.query.filter_by(id=id, user_id=user_id).first_or_404()
     data = request.get_json()
     withdrawal = data.get("amount")
     
@@ -433,16 +482,366 @@ def withdraw_from_investment(id):
     except ValueError:
         return jsonify({"message": "Withdrawal amount must be a valid number"}), 400
 
-    if investment.current_value < withdrawal:
+    investment = _apply_to_current_value(user_id, id, 'withdrawal', -withdrawal, Investment.current_value >= withdrawal)
+    if investment is None:
+        # Only a failed withdrawal pays for the lookup that tells the two cases apart
+        if Investment.query.filter_by(id=id, user_id=user_id).first() is None:
+            return jsonify({"message": "Investment not found"}), 404
         return jsonify({"message": "Insufficient funds"}), 400
-        
-    investment.current_value -= withdrawal
-    
+    result = investment.to_dict()
     db.session.commit()
-    return jsonify(investment.to_dict())
+    return jsonify(result)
+
+@investment_bp.route("/investments/<int:id>/balance", methods=["GET"])
+@jwt_required()
+@conditional_get('investments')
+def get_investment_balance(id):
+    """Get an investment's balance at a point in time
+    Returns the current value the investment had at the end of a given day, read from its movement ledger.
+    The ledger keeps a snapshot every LEDGER_SNAPSHOT_INTERVAL movements, so the answer comes from one snapshot plus a short tail of movements.
+    ---
+    tags:
+      - Investment
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the investment.
+      - name: at
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Day (YYYY-MM-DD) whose closing balance to return. Defaults to now.
+    responses:
+      200:
+        description: The balance at the requested point in time.
+      400:
+        description: Bad request (e.g., invalid date).
+      404:
+        description: Investment not found.
+    """
+    user_id = get_jwt_identity()
+    try:
+        at = balance_cutoff(request.args.get("at"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    investment = Investment.query.filter_by(id=id, user_id=user_id).first_or_404()
+    return jsonify({
+        "investment_id": investment.id,
+        "at": request.args.get("at"),
+        "balance": investment_ledger.balance_at(db.session, investment.id, at),
+    })
+
+@investment_bp.route("/investments/<int:id>/history", methods=["GET"])
+@jwt_required()
+@conditional_get('investments')
+def get_investment_history(id):
+    """Get an investment's valuation history
+    Returns the investment's value over time, downsampled on the server to the last value of each day, week or month.
+    Periods in which the value did not change are omitted; the value carries over from the previous point.
+    ---
+    tags:
+      - Investment
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: id
+        in: path
+        type: integer
+        required: true
+        description: The ID of the investment.
+      - name: resolution
+        in: query
+        type: string
+        enum: [day, week, month]
+        required: false
+        description: Bucket size. Weeks start on Monday. Defaults to day.
+      - name: start_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: First day of the history (YYYY-MM-DD). The value in force on that day opens the series, labelled with this date.
+      - name: end_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Last day of the history, inclusive (YYYY-MM-DD).
+    responses:
+      200:
+        description: One point per bucket with a valuation, oldest first.
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                investment_id:
+                  type: integer
+                resolution:
+                  type: string
+                series:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      period:
+                        type: string
+                        example: "2024-01"
+                      value:
+                        type: number
+                        format: float
+      400:
+        description: Bad request (e.g., invalid resolution or date).
+      404:
+        description: Investment not found.
+    """
+    user_id = get_jwt_identity()
+    resolution = request.args.get("resolution", "day")
+    if resolution not in RESOLUTIONS:
+        return jsonify({"message": "Invalid resolution. Must be 'day', 'week' or 'month'"}), 400
+    try:
+        filters = date_range_filters(InvestmentValuation.date, request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    start = range_start(request.args)
+
+    investment = Investment.query.filter_by(id=id, user_id=user_id).first_or_404()
+    return jsonify({
+        "investment_id": investment.id,
+        "resolution": resolution,
+        "series": investment_valuations.downsample(db.session, investment.id, resolution, filters, start),
+    })
+
+@investment_bp.route("/investments/performance", methods=["GET"])
+@jwt_required()
+@conditional_get('investments', 'investment_types')
+def get_investments_performance():
+    """Get investment performance
+    Returns time-weighted (TWR) and money-weighted (XIRR) returns per investment, per investment type and for the whole portfolio.
+    Cash flows are the openings, contributions and withdrawals in each investment's ledger; every other value change counts as market movement.
+    TWR is cumulative and XIRR is annualised, both as percentages. XIRR is null when it has no solution or the flows span less than a day.
+    ---
+    tags:
+      - Investment
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: at
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Day (YYYY-MM-DD) at whose close to measure performance. Defaults to now.
+    responses:
+      200:
+        description: Performance for the portfolio, each investment type and each investment.
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                portfolio:
+                  type: object
+                  properties:
+                    current_value:
+                      type: number
+                      format: float
+                    net_contributions:
+                      type: number
+                      format: float
+                    twr_percentage:
+                      type: number
+                      format: float
+                    xirr_percentage:
+                      type: number
+                      format: float
+                      nullable: true
+                by_investment_type:
+                  type: array
+                  items:
+                    type: object
+                investments:
+                  type: array
+                  items:
+                    type: object
+      400:
+        description: Bad request (e.g., invalid date).
+    """
+    user_id = get_jwt_identity()
+    try:
+        before = balance_cutoff(request.args.get("at"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify(portfolio_performance(db.session, user_id, before))
+
+@investment_bp.route("/investments/allocation", methods=["GET"])
+@jwt_required()
+@conditional_get('investments', 'investment_types')
+@response_cache.cached('investments', 'investment_types')
+def get_investments_allocation():
+    """Get asset allocation
+    Retrieves the current value and weight of each of the user's investment types, from one grouped query.
+    Investment types without investments are listed with a zero weight.
+    ---
+    tags:
+      - Investment
+    security:
+      - bearerAuth: []
+    responses:
+      200:
+        description: Allocation by investment type.
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                total_current_value:
+                  type: number
+                  format: float
+                by_investment_type:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      investment_type_id:
+                        type: integer
+                      investment_type_name:
+                        type: string
+                      current_value:
+                        type: number
+                        format: float
+                      investment_count:
+                        type: integer
+                      weight_percentage:
+                        type: number
+                        format: float
+    """
+    user_id = get_jwt_identity()
+    return jsonify(investment_allocation(user_id))
+
+@investment_bp.route("/investments/rebalance", methods=["POST"])
+@jwt_required()
+def rebalance_investments():
+    """Calculate a rebalance
+    Returns the contributions and withdrawals per investment type that bring the portfolio to the given target weights.
+    Investment types left out of the targets are given a zero weight. Nothing is changed; apply the result with the contribute and withdraw endpoints.
+    ---
+    tags:
+      - Investment
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - targets
+            properties:
+              targets:
+                type: array
+                description: Target weights, which must add up to 100.
+                items:
+                  type: object
+                  required:
+                    - investment_type_id
+                    - weight_percentage
+                  properties:
+                    investment_type_id:
+                      type: integer
+                    weight_percentage:
+                      type: number
+                      format: float
+                      example: 60
+              cash:
+                type: number
+                format: float
+                description: New money to invest (negative to take money out). Defaults to 0.
+              allow_withdrawals:
+                type: boolean
+                description: When false, only contributions are proposed. Defaults to true.
+    responses:
+      200:
+        description: Only the types that need a trade, with the amount to contribute (positive) or withdraw (negative).
+      400:
+        description: Bad request (e.g., weights not adding up to 100, targets unreachable without withdrawals).
+      404:
+        description: Investment type not found.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    targets = data.get("targets")
+    if not isinstance(targets, list) or not targets:
+        return jsonify({"message": "targets must be a non-empty list"}), 400
+
+    weights = {}
+    for target in targets:
+        try:
+            investment_type_id = int(target["investment_type_id"])
+            weight = float(target["weight_percentage"])
+        except (TypeError, KeyError, ValueError):
+            return jsonify({"message": "Each target needs a numeric investment_type_id and weight_percentage"}), 400
+        if not math.isfinite(weight):
+            return jsonify({"message": "Weights must be finite numbers"}), 400
+        if weight < 0:
+            return jsonify({"message": "Weights must not be negative"}), 400
+        if investment_type_id in weights:
+            return jsonify({"message": "Each investment type may only have one target"}), 400
+        weights[investment_type_id] = weight
+    if abs(sum(weights.values()) - 100) > 0.01:
+        return jsonify({"message": "Target weights must add up to 100"}), 400
+
+    try:
+        cash = float(data.get("cash") or 0)
+    except (TypeError, ValueError):
+        return jsonify({"message": "Cash must be a valid number"}), 400
+    if not math.isfinite(cash):
+        return jsonify({"message": "Cash must be a valid number"}), 400
+    allow_withdrawals = data.get("allow_withdrawals", True)
+    if not isinstance(allow_withdrawals, bool):
+        return jsonify({"message": "allow_withdrawals must be a boolean"}), 400
+
+    allocation = investment_allocation(user_id)["by_investment_type"]
+    if not set(weights) <= {row["investment_type_id"] for row in allocation}:
+        return jsonify({"message": "Investment type not found or does not belong to user"}), 404
+
+    target_weights = [weights.get(row["investment_type_id"], 0) / 100 for row in allocation]
+    try:
+        trades, total_after = rebalance_trades(
+            [row["current_value"] for row in allocation], target_weights, cash, allow_withdrawals
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify({
+        "total_current_value": sum(row["current_value"] for row in allocation),
+        "total_after": round(float(total_after), 2),
+        "trades": [
+            {
+                "investment_type_id": row["investment_type_id"],
+                "investment_type_name": row["investment_type_name"],
+                "current_value": row["current_value"],
+                "target_weight_percentage": weight * 100,
+                "amount": float(amount),
+                "action": "contribute" if amount > 0 else "withdraw"
+            }
+            for row, weight, amount in zip(allocation, target_weights, trades)
+            if amount != 0
+        ]
+    })
 
 @investment_bp.route("/investments/summary", methods=["GET"])
 @jwt_required()
+@conditional_get('investments', 'investment_types')
+@response_cache.cached('investments', 'investment_types')
 def get_investments_summary():
     """Get investments summary
     Retrieves a summary of all investments for the authenticated user.
@@ -451,6 +850,13 @@ def get_investments_summary():
       - Investment
     security:
       - bearerAuth: []
+    parameters:
+      - name: group_by
+        in: query
+        type: string
+        enum: [investment_type]
+        required: false
+        description: Also break the totals down per investment type.
     responses:
       200:
         description: A summary of investments.
@@ -473,24 +879,20 @@ def get_investments_summary():
                   format: float
                 investment_count:
                   type: integer
+                by_investment_type:
+                  type: array
+                  description: Only present when group_by=investment_type. Same totals per investment type.
+                  items:
+                    type: object
+      400:
+        description: Bad request (e.g., invalid grouping).
     """
     user_id = get_jwt_identity()
-    
-    query = Investment.query
-    
-    query = query.filter_by(user_id=user_id)
-    
-    investments = query.all()
-    total_initial_amount = sum(i.amount for i in investments)
-    total_current_value = sum(i.current_value for i in investments)
-    total_profit_loss = total_current_value - total_initial_amount
-    total_profit_loss_percentage = (total_profit_loss / total_initial_amount * 100) if total_initial_amount > 0 else 0
-    
-    return jsonify({
-        "total_invested": total_initial_amount,
-        "total_current_value": total_current_value,
-        "total_profit_loss": total_profit_loss,
-        "total_profit_loss_percentage": total_profit_loss_percentage,
-        "investment_count": len(investments)
-    })
+    group_by = request.args.get("group_by")
+
+    if group_by == "investment_type":
+        return jsonify(investment_totals_by_type(user_id))
+    if group_by:
+        return jsonify({"message": "Invalid grouping. Must be 'investment_type'"}), 400
 
+    return jsonify(investment_totals(user_id))
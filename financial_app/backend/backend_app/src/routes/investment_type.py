@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from src.models.user import db
 from src.models.investment_type import InvestmentType
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get
+from src.cache import response_cache
 
 investment_type_bp = Blueprint("investment_type_bp", __name__)
 
@@ -47,6 +49,8 @@ def add_investment_type():
 
 @investment_type_bp.route("/investment-types", methods=["GET"])
 @jwt_required()
+@conditional_get('investment_types')
+@response_cache.cached('investment_types')
 def get_investment_types():
     """Get all investment types
     Retrieves a list of all investment types for the authenticated user.
@@ -65,6 +69,7 @@ def get_investment_types():
 
 @investment_type_bp.route("/investment-types/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional_get('investment_types')
 def get_investment_type(id):
     """Get a specific investment type
     Retrieves a single investment type by its ID.
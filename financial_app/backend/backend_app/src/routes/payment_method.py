@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from src.models.user import db
 from src.models.payment_method import PaymentMethod
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get
+from src.cache import response_cache
 
 payment_method_bp = Blueprint("payment_method_bp", __name__, url_prefix="/api")
 
@@ -47,6 +49,8 @@ def add_payment_method():
 
 @payment_method_bp.route("/payment-methods", methods=["GET"])
 @jwt_required()
+@conditional_get('payment_methods')
+@response_cache.cached('payment_methods')
 def get_payment_methods():
     """Get all payment methods
     Retrieves a list of all payment methods for the authenticated user.
@@ -65,6 +69,7 @@ def get_payment_methods():
 
 @payment_method_bp.route("/payment-methods/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional_get('payment_methods')
 def get_payment_method(id):
     """Get a specific payment method
     Retrieves a single payment method by its ID.
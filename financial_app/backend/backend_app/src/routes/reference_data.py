@@ -0,0 +1,65 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get
+from src.cache import response_cache
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.models.investment_type import InvestmentType
+
+reference_data_bp = Blueprint("reference_data_bp", __name__)
+
+@reference_data_bp.route("/reference-data", methods=["GET"])
+@jwt_required()
+@conditional_get('categories', 'payment_methods', 'investment_types')
+@response_cache.cached('categories', 'payment_methods', 'investment_types')
+def get_reference_data():
+    """Get reference data
+    Retrieves the categories, payment methods and investment types the transaction and investment forms need, in one response.
+    The ETag combines the versions of all three lists, so a form that already holds the bundle revalidates with a single 304.
+    ---
+    tags:
+      - Reference Data
+    security:
+      - bearerAuth: []
+    responses:
+      200:
+        description: Categories grouped by type, payment methods and investment types.
+        schema:
+          type: object
+          properties:
+            categories:
+              type: object
+              properties:
+                income:
+                  type: array
+                  items:
+                    type: object
+                expense:
+                  type: array
+                  items:
+                    type: object
+            payment_methods:
+              type: array
+              items:
+                type: object
+            investment_types:
+              type: array
+              items:
+                type: object
+      304:
+        description: Not modified since the ETag sent in If-None-Match.
+    """
+    user_id = get_jwt_identity()
+
+    categories = {"income": [], "expense": []}
+    for category in Category.query.filter_by(user_id=user_id).order_by(Category.name, Category.id):
+        categories.setdefault(category.category_type, []).append(category.to_dict())
+
+    payment_methods = PaymentMethod.query.filter_by(user_id=user_id).order_by(PaymentMethod.name, PaymentMethod.id)
+    investment_types = InvestmentType.query.filter_by(user_id=user_id).order_by(InvestmentType.name, InvestmentType.id)
+
+    return jsonify({
+        "categories": categories,
+        "payment_methods": [payment_method.to_dict() for payment_method in payment_methods],
+        "investment_types": [investment_type.to_dict() for investment_type in investment_types],
+    })
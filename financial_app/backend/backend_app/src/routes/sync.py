@@ -0,0 +1,73 @@
+from datetime import timedelta
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.models.user import db
+from src.models.timestamps import utcnow
+from src.versioning import conditional_get, RESOURCES
+from src.sync import collect_changes, encode_sync_cursor, decode_sync_cursor
+
+sync_bp = Blueprint("sync_bp", __name__)
+
+@sync_bp.route("/sync", methods=["GET"])
+@jwt_required()
+@conditional_get(*RESOURCES.values())
+def get_sync():
+    """Get changes since a cursor
+    Returns the rows created or updated and the ids deleted since `since`, for every resource type, so a client can keep a local copy current in O(changes).
+    Without `since`, or when the cursor is older than the tombstone retention window, a full snapshot is returned with `full: true` and the client should replace its copy.
+    Apply `deleted` before `changes`, then store the returned `cursor` for the next call. Rows near the cursor may be sent twice, so apply changes as upserts.
+    Transactions and investments that embed the name of a changed category, payment method or investment type are sent again as well.
+    ---
+    tags:
+      - Sync
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: since
+        in: query
+        type: string
+        required: false
+        description: Cursor returned by the previous sync call.
+    responses:
+      200:
+        description: Changed rows and deleted ids grouped by resource.
+        schema:
+          type: object
+          properties:
+            cursor:
+              type: string
+            full:
+              type: boolean
+            changes:
+              type: object
+              description: Keyed by categories, payment_methods, investment_types, transactions, investments and goals.
+            deleted:
+              type: object
+              description: Deleted ids, keyed like `changes`.
+      304:
+        description: Not modified since the ETag sent in If-None-Match.
+      400:
+        description: Invalid cursor.
+    """
+    user_id = int(get_jwt_identity())
+    # Taken before reading so writes that land during the queries are picked up next time
+    started_at = utcnow()
+
+    since = None
+    if request.args.get("since"):
+        try:
+            since = decode_sync_cursor(request.args["since"])
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+        retention = timedelta(days=current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 90))
+        if since < started_at - retention:
+            since = None
+
+    overlap = timedelta(seconds=current_app.config.get("SYNC_CURSOR_OVERLAP_SECONDS", 5))
+    changes, deleted = collect_changes(db.session, user_id, since, overlap)
+    return jsonify({
+        "cursor": encode_sync_cursor(started_at),
+        "full": since is None,
+        "changes": changes,
+        "deleted": deleted,
+    })
@@ -1,14 +1,174 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from src.models.user import db
 from src.models.transaction import Transaction
 from src.models.category import Category
 from src.models.payment_method import PaymentMethod
-from datetime import datetime, timezone
+from src.models.monthly_rollup import MonthlyRollup
+from src.date_filters import (
+    date_range_filters, month_bounds, parse_year_month,
+    GRANULARITIES, bucket_start, iter_buckets, bucket_label, parse_date
+)
+from src.aggregates import transaction_totals
+from src.rollup import period_filters, rollup_changes, apply_rollup_deltas
+from src.pagination import encode_cursor, decode_cursor, parse_limit
+from src.importer import TransactionImporter, csv_records, ofx_records, qif_records, IMPORT_BATCH_SIZE
+from collections import defaultdict
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import func, or_, select, insert, update, delete, bindparam
+from sqlalchemy.orm import joinedload
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.versioning import conditional_get, bump_versions
+from src.cache import response_cache
+from src.sync import record_tombstones
+from src.events import record_events
 import bleach
+import codecs
+import csv
+import io
+import json
+import os
 
 transaction_bp = Blueprint("transaction_bp", __name__)
 
+MAX_BATCH_OPERATIONS = 5000
+IMPORT_FORMATS = ('csv', 'ofx', 'qif')
+_transactions = Transaction.__table__
+
+
+def _parse_int(value, message):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+
+
+def _parse_amount(amount):
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        raise ValueError("Amount must be a valid number")
+    if amount <= 0:
+        raise ValueError("Amount must be a positive number")
+    return amount
+
+
+def _parse_date(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+
+def _parse_new_transaction(data):
+    """Validates a create payload into column values. Raises ValueError with the message for a 400."""
+    description = data.get("description")
+    if description:
+        description = bleach.clean(description)
+    amount = data.get("amount")
+    date_str = data.get("date")
+    transaction_type = data.get("transaction_type")
+    category_id = data.get("category_id")
+    payment_method_id = data.get("payment_method_id")
+
+    if not description:
+        raise ValueError("Description is required")
+    if amount is None:
+        raise ValueError("Amount is required")
+    if not transaction_type:
+        raise ValueError("Transaction type is required")
+    if category_id is None:
+        raise ValueError("Category ID is required")
+    amount = _parse_amount(amount)
+
+    if transaction_type not in ['income', 'expense']:
+        raise ValueError("Invalid transaction type. Must be 'income' or 'expense'")
+
+    date = _parse_date(date_str) if date_str else datetime.now(timezone.utc).date()
+
+    if transaction_type == 'income':
+        payment_method_id = None
+    elif payment_method_id is None:
+        raise ValueError("Payment method ID is required for expense transactions")
+    else:
+        payment_method_id = _parse_int(payment_method_id, "Payment method ID must be a valid integer")
+
+    return {
+        "description": description,
+        "amount": amount,
+        "date": date,
+        "transaction_type": transaction_type,
+        "category_id": _parse_int(category_id, "Category ID must be a valid integer"),
+        "payment_method_id": payment_method_id,
+        "notes": bleach.clean(data.get("notes", "")),
+    }
+
+
+def _parse_transaction_changes(data):
+    """Validates an update payload into the column values to change. Raises ValueError with the message for a 400."""
+    changes = {}
+    if data.get("description") is not None:
+        changes["description"] = bleach.clean(data["description"])
+    if data.get("amount") is not None:
+        changes["amount"] = _parse_amount(data["amount"])
+    if data.get("date") is not None:
+        changes["date"] = _parse_date(data["date"])
+    if data.get("transaction_type") is not None:
+        if data["transaction_type"] not in ['income', 'expense']:
+            raise ValueError("Invalid transaction type. Must be 'income' or 'expense'")
+        changes["transaction_type"] = data["transaction_type"]
+    if data.get("category_id") is not None:
+        changes["category_id"] = _parse_int(data["category_id"], "Category ID must be a valid integer")
+    if data.get("payment_method_id") is not None:
+        changes["payment_method_id"] = _parse_int(data["payment_method_id"], "Payment method ID must be a valid integer")
+    if data.get("notes") is not None:
+        changes["notes"] = bleach.clean(data["notes"])
+    return changes
+
+
+def _owned_ids(model, user_id, ids):
+    """The subset of `ids` that belong to the user, checked with one IN query."""
+    if not ids:
+        return set()
+    return set(db.session.execute(
+        select(model.id).where(model.user_id == user_id, model.id.in_(ids))
+    ).scalars())
+
+
+def _reference_error(values, category_ids, payment_method_ids):
+    if "category_id" in values and values["category_id"] not in category_ids:
+        return "Category not found or does not belong to user"
+    if values.get("payment_method_id") is not None and values["payment_method_id"] not in payment_method_ids:
+        return "Payment method not found or does not belong to user"
+    return None
+
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    ("id", Transaction.id),
+    ("date", Transaction.date),
+    ("description", Transaction.description),
+    ("amount", Transaction.amount),
+    ("transaction_type", Transaction.transaction_type),
+    ("category", Category.name),
+    ("payment_method", PaymentMethod.name),
+    ("notes", Transaction.notes),
+)
+
+
+def _csv_safe_row(row):
+    # Spreadsheets run cells starting with these as formulas
+    return [
+        f"'{value}" if isinstance(value, str) and value[:1] in ("=", "+", "-", "@") else value
+        for value in row
+    ]
+
+
+def _export_record(fields, row):
+    record = dict(zip(fields, row))
+    record["date"] = record["date"].isoformat()
+    return record
+
 @transaction_bp.route("/transactions", methods=["POST"])
 @jwt_required()
 def add_transaction():
@@ -64,75 +224,475 @@ def add_transaction():
         description: Not found (e.g., category or payment method not found).
     """
     user_id = get_jwt_identity()
-    data = request.get_json()
-
-    description = data.get("description")
-    if description:
-        description = bleach.clean(description)
-    amount = data.get("amount")
-    date_str = data.get("date")
-    transaction_type = data.get("transaction_type")
-    category_id = data.get("category_id")
-    payment_method_id = data.get("payment_method_id")
-    notes = bleach.clean(data.get("notes", ""))
-
-    if not description:
-        return jsonify({"message": "Description is required"}), 400
-    if amount is None:
-        return jsonify({"message": "Amount is required"}), 400
-    if not transaction_type:
-        return jsonify({"message": "Transaction type is required"}), 400
-    if category_id is None:
-        return jsonify({"message": "Category ID is required"}), 400
     try:
-        amount = float(amount)
-        if amount <= 0:
-            return jsonify({"message": "Amount must be a positive number"}), 400
-    except ValueError:
-        return jsonify({"message": "Amount must be a valid number"}), 400
-
-    if transaction_type not in ['income', 'expense']:
-        return jsonify({"message": "Invalid transaction type. Must be 'income' or 'expense'"}), 400
-
-    date = datetime.now(timezone.utc).date()
-    if date_str:
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
-
-    if transaction_type == 'income':
-        payment_method_id = None
-    elif payment_method_id is None:
-        return jsonify({"message": "Payment method ID is required for expense transactions"}), 400
+        values = _parse_new_transaction(request.get_json())
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
     # Validate category_id exists and belongs to user
-    category = Category.query.filter_by(id=category_id, user_id=user_id).first()
+    category = Category.query.filter_by(id=values["category_id"], user_id=user_id).first()
     if not category:
         return jsonify({"message": "Category not found or does not belong to user"}), 404
 
     # Validate payment_method_id exists and belongs to user, only if provided
-    if payment_method_id is not None:
-        payment_method = PaymentMethod.query.filter_by(id=payment_method_id, user_id=user_id).first()
+    if values["payment_method_id"] is not None:
+        payment_method = PaymentMethod.query.filter_by(id=values["payment_method_id"], user_id=user_id).first()
         if not payment_method:
             return jsonify({"message": "Payment method not found or does not belong to user"}), 404
 
-    new_transaction = Transaction(
-        description=description,
-        amount=amount,
-        date=date,
-        transaction_type=transaction_type,
-        category_id=category_id,
-        payment_method_id=payment_method_id,
-        user_id=user_id,
-        notes=notes
-    )
+    new_transaction = Transaction(user_id=user_id, **values)
     db.session.add(new_transaction)
     db.session.commit()
     return jsonify(new_transaction.to_dict()), 201
 
+@transaction_bp.route("/transactions/batch", methods=["POST"])
+@jwt_required()
+def batch_transactions():
+    """Create, update and delete transactions in bulk
+    Applies up to 5000 operations in one request and one database transaction. Each operation is validated on its own;
+    invalid ones are reported in the results and skipped, the rest are written. Category and payment method ownership is
+    checked with one query per table, and all inserts go through a single executemany.
+    ---
+    tags:
+      - Transaction
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - operations
+            properties:
+              operations:
+                type: array
+                maxItems: 5000
+                items:
+                  type: object
+                  required:
+                    - op
+                  properties:
+                    op:
+                      type: string
+                      enum: [create, update, delete]
+                    id:
+                      type: integer
+                      description: Transaction to update or delete.
+                    data:
+                      type: object
+                      description: Fields as accepted by POST /transactions (create) or PUT /transactions/{id} (update).
+                example:
+                  - op: create
+                    data: {description: Rent, amount: 1200.0, date: "2024-07-01", transaction_type: expense, category_id: 1, payment_method_id: 1}
+                  - op: update
+                    id: 42
+                    data: {amount: 55.9}
+                  - op: delete
+                    id: 43
+    responses:
+      200:
+        description: Per-operation results, in request order.
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  op:
+                    type: string
+                  status:
+                    type: integer
+                    example: 201
+                  id:
+                    type: integer
+                  message:
+                    type: string
+            succeeded:
+              type: integer
+            failed:
+              type: integer
+      400:
+        description: Bad request (e.g., operations missing or more than 5000).
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json()
+    operations = data.get("operations") if isinstance(data, dict) else None
+
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"message": "Operations must be a non-empty list"}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({"message": f"Too many operations. Maximum is {MAX_BATCH_OPERATIONS}"}), 400
+
+    results = [None] * len(operations)
+    creates, updates, deletes = [], [], []
+    targeted_ids = set()
+
+    for index, operation in enumerate(operations):
+        op = operation.get("op") if isinstance(operation, dict) else None
+        try:
+            if op not in ('create', 'update', 'delete'):
+                raise ValueError("Invalid op. Must be 'create', 'update' or 'delete'")
+            payload = operation.get("data", {}) if op != 'delete' else {}
+            if not isinstance(payload, dict):
+                raise ValueError("Data must be an object")
+            if op == 'create':
+                creates.append((index, _parse_new_transaction(payload)))
+                continue
+
+            transaction_id = _parse_int(operation.get("id"), "Transaction ID must be a valid integer")
+            if transaction_id in targeted_ids:
+                raise ValueError("Transaction is targeted by more than one operation")
+            targeted_ids.add(transaction_id)
+            if op == 'update':
+                updates.append((index, transaction_id, _parse_transaction_changes(payload)))
+            else:
+                deletes.append((index, transaction_id))
+        except ValueError as e:
+            results[index] = {"index": index, "op": op, "status": 400, "message": str(e)}
+
+    # One ownership query per referenced table
+    written = [values for _, values in creates] + [changes for _, _, changes in updates]
+    category_ids = _owned_ids(Category, user_id, {values["category_id"] for values in written if "category_id" in values})
+    payment_method_ids = _owned_ids(
+        PaymentMethod, user_id,
+        {values["payment_method_id"] for values in written if values.get("payment_method_id") is not None}
+    )
+    existing = {}
+    if targeted_ids:
+        # Locked so a concurrent write cannot change the rows between this read and the rollup deltas taken from it
+        rows = db.session.execute(
+            select(_transactions)
+            .where(_transactions.c.user_id == user_id, _transactions.c.id.in_(targeted_ids))
+            .with_for_update()
+        )
+        existing = {row.id: dict(row._mapping) for row in rows}
+
+    new_rows, new_indexes = [], []
+    for index, values in creates:
+        error = _reference_error(values, category_ids, payment_method_ids)
+        if error:
+            results[index] = {"index": index, "op": "create", "status": 404, "message": error}
+            continue
+        new_rows.append(dict(values, user_id=user_id))
+        new_indexes.append(index)
+
+    updated_rows, replaced_rows = [], []
+    # Items grouped by the columns they change, so each UPDATE only writes those columns
+    changes_by_columns = defaultdict(list)
+    for index, transaction_id, changes in updates:
+        error = "Transaction not found" if transaction_id not in existing else \
+            _reference_error(changes, category_ids, payment_method_ids)
+        if error:
+            results[index] = {"index": index, "op": "update", "status": 404, "message": error}
+            continue
+        replaced_rows.append(existing[transaction_id])
+        updated_rows.append(dict(existing[transaction_id], **changes))
+        if changes:
+            changes_by_columns[tuple(sorted(changes))].append(dict(changes, b_id=transaction_id))
+        results[index] = {"index": index, "op": "update", "status": 200, "id": transaction_id}
+
+    deleted_ids = []
+    for index, transaction_id in deletes:
+        if transaction_id not in existing:
+            results[index] = {"index": index, "op": "delete", "status": 404, "message": "Transaction not found"}
+            continue
+        replaced_rows.append(existing[transaction_id])
+        deleted_ids.append(transaction_id)
+        results[index] = {"index": index, "op": "delete", "status": 200, "id": transaction_id}
+
+    if new_rows:
+        # RETURNING order is not guaranteed for multi-row inserts, so ids are matched back by value
+        columns = list(new_rows[0])
+        pending = defaultdict(list)
+        for index, row in zip(new_indexes, new_rows):
+            pending[tuple(row[column] for column in columns)].append(index)
+        inserted = db.session.execute(
+            insert(_transactions).returning(_transactions.c.id, *[_transactions.c[column] for column in columns]),
+            new_rows
+        )
+        for transaction_id, *values in inserted:
+            index = pending[tuple(values)].pop()
+            results[index] = {"index": index, "op": "create", "status": 201, "id": transaction_id}
+    for params in changes_by_columns.values():
+        # One executemany per column set; updated_at is left out so the column's onupdate stamps the rows
+        db.session.execute(update(_transactions).where(_transactions.c.id == bindparam("b_id")), params)
+    if deleted_ids:
+        db.session.execute(delete(_transactions).where(_transactions.c.id.in_(deleted_ids)))
+        record_tombstones(db.session, user_id, 'transactions', deleted_ids)
+
+    if new_rows or updated_rows or deleted_ids:
+        # Core writes skip the session hooks that keep these in step
+        apply_rollup_deltas(db.session.connection(), rollup_changes(new_rows + updated_rows, replaced_rows))
+        bump_versions(db.session, user_id, ['transactions'])
+        for op in ("create", "update", "delete"):
+            record_events(db.session, user_id, 'transactions', [
+                result["id"] for result in results if result["op"] == op and result["status"] < 400
+            ], op)
+    db.session.commit()
+
+    failed = sum(1 for result in results if result["status"] >= 400)
+    return jsonify({"results": results, "succeeded": len(results) - failed, "failed": failed})
+
+@transaction_bp.route("/transactions/import", methods=["POST"])
+@jwt_required()
+def import_transactions():
+    """Import transactions from a bank statement
+    Streams an uploaded CSV, OFX or QIF statement into transactions. Records are parsed one at a time and inserted and
+    committed in fixed-size batches, so large files are imported in bounded memory. Category and payment method names
+    are matched case-insensitively against the user's own. Lines already imported before, identified by a hash of
+    their date, signed amount and normalized description, are skipped.
+
+    The response is newline-delimited JSON written as the import runs - an `error` line per rejected record,
+    a `progress` line per committed batch, and a final `done` line (or `failed` if the file became unreadable).
+    ---
+    tags:
+      - Transaction
+    security:
+      - bearerAuth: []
+    consumes:
+      - multipart/form-data
+    parameters:
+      - name: file
+        in: formData
+        type: file
+        required: true
+        description: Statement file. CSV needs a header row with date, description and amount columns; transaction_type, category, payment_method and notes are optional.
+      - name: format
+        in: formData
+        type: string
+        enum: [csv, ofx, qif]
+        required: false
+        description: File format. Defaults to the file extension, then csv.
+      - name: encoding
+        in: formData
+        type: string
+        required: false
+        description: Text encoding of the file (default UTF-8; OFX reads its header).
+      - name: mapping
+        in: formData
+        type: string
+        required: false
+        description: 'CSV only - JSON object mapping import fields to header names, e.g. {"date": "Data", "amount": "Valor"}.'
+      - name: delimiter
+        in: formData
+        type: string
+        required: false
+        description: CSV only - column delimiter (default ",").
+      - name: decimal_separator
+        in: formData
+        type: string
+        enum: [".", ","]
+        required: false
+        description: Decimal separator used in amounts (default ".").
+      - name: date_format
+        in: formData
+        type: string
+        required: false
+        description: CSV only - strptime format of the date column (default "%Y-%m-%d").
+      - name: default_category_id
+        in: formData
+        type: integer
+        required: false
+        description: Category for rows without one, or whose category is not found.
+      - name: default_payment_method_id
+        in: formData
+        type: integer
+        required: false
+        description: Payment method for expense rows without one, or whose payment method is not found.
+      - name: day_first
+        in: formData
+        type: boolean
+        required: false
+        description: QIF only - read dates as day/month/year instead of month/day/year.
+      - name: skip_duplicates
+        in: formData
+        type: boolean
+        required: false
+        description: Skip lines imported before (default true). When false they are imported again, without a fingerprint.
+    responses:
+      200:
+        description: 'NDJSON stream, e.g. {"event": "error", "row": 7, "message": "..."} and {"event": "done", "rows_processed": 100000, "imported": 99990, "skipped": 8, "failed": 2}.'
+      400:
+        description: Bad request (e.g., missing file, missing required columns, invalid options).
+      404:
+        description: Default category or payment method not found.
+    """
+    user_id = get_jwt_identity()
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"message": "File is required"}), 400
+
+    file_format = request.form.get("format")
+    if not file_format:
+        # Fall back to the file extension, then CSV
+        extension = os.path.splitext(upload.filename)[1].lstrip(".").lower()
+        file_format = extension if extension in IMPORT_FORMATS else "csv"
+    if file_format not in IMPORT_FORMATS:
+        return jsonify({"message": "Invalid format. Must be 'csv', 'ofx' or 'qif'"}), 400
+
+    mapping = request.form.get("mapping")
+    if mapping:
+        try:
+            mapping = json.loads(mapping)
+        except ValueError:
+            mapping = None
+        if not isinstance(mapping, dict):
+            return jsonify({"message": "Invalid mapping. Must be a JSON object"}), 400
+
+    delimiter = request.form.get("delimiter", ",")
+    if len(delimiter) != 1:
+        return jsonify({"message": "Invalid delimiter. Must be a single character"}), 400
+    decimal_separator = request.form.get("decimal_separator", ".")
+    if decimal_separator not in ('.', ','):
+        return jsonify({"message": "Invalid decimal separator. Must be '.' or ','"}), 400
+    encoding = request.form.get("encoding") or None
+    if encoding:
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            return jsonify({"message": "Invalid encoding"}), 400
+
+    try:
+        importer = TransactionImporter(
+            user_id,
+            # OFX records are already normalized to ISO dates and dot decimals
+            date_format=request.form.get("date_format", "%Y-%m-%d") if file_format == "csv" else "%Y-%m-%d",
+            decimal_separator=decimal_separator if file_format != "ofx" else ".",
+            default_category_id=request.form.get("default_category_id"),
+            default_payment_method_id=request.form.get("default_payment_method_id"),
+            skip_duplicates=request.form.get("skip_duplicates", "true").lower() != "false",
+            batch_size=current_app.config.get("IMPORT_BATCH_SIZE", IMPORT_BATCH_SIZE),
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except LookupError as e:
+        return jsonify({"message": str(e)}), 404
+
+    # The request closes its uploads when the view returns, before the body is streamed,
+    # so the import takes ownership of the spooled file and closes it itself
+    stream, upload.stream = upload.stream, io.BytesIO()
+    try:
+        if file_format == "ofx":
+            records = ofx_records(stream, encoding)
+        elif file_format == "qif":
+            records = qif_records(
+                stream, day_first=request.form.get("day_first", "false").lower() == "true",
+                encoding=encoding or "utf-8-sig"
+            )
+        else:
+            records = csv_records(stream, mapping, delimiter, encoding or "utf-8-sig")
+    except UnicodeDecodeError:
+        stream.close()
+        return jsonify({"message": f"File must be {encoding or 'UTF-8'} encoded"}), 400
+    except (ValueError, csv.Error) as e:
+        stream.close()
+        return jsonify({"message": str(e)}), 400
+
+    def generate():
+        try:
+            for event in importer.run(records):
+                yield json.dumps(event) + "\n"
+        finally:
+            stream.close()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@transaction_bp.route("/transactions/export", methods=["GET"])
+@jwt_required()
+def export_transactions():
+    """Export transactions
+    Streams the authenticated user's transactions as CSV or NDJSON, oldest first. Rows are read from a server-side
+    cursor in batches and written as they arrive, so memory stays flat however many rows the user has and the
+    header goes out before the query finishes.
+    ---
+    tags:
+      - Transaction
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [csv, ndjson]
+        required: false
+        description: Output format (default csv).
+      - name: from
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or after this date (YYYY-MM-DD).
+      - name: to
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or before this date (YYYY-MM-DD).
+    produces:
+      - text/csv
+      - application/x-ndjson
+    responses:
+      200:
+        description: The transactions as a CSV attachment (with a header row) or as one JSON object per line.
+      400:
+        description: Bad request (e.g., invalid format or date).
+    """
+    user_id = get_jwt_identity()
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": "Invalid format. Must be 'csv' or 'ndjson'"}), 400
+
+    filters = [Transaction.user_id == user_id]
+    try:
+        if request.args.get("from"):
+            filters.append(Transaction.date >= parse_date(request.args["from"], "from"))
+        if request.args.get("to"):
+            filters.append(Transaction.date < parse_date(request.args["to"], "to") + timedelta(days=1))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Plain column tuples rather than ORM objects; names come from the same query
+    query = (
+        select(*[column for _, column in EXPORT_COLUMNS])
+        .select_from(Transaction)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .outerjoin(PaymentMethod, Transaction.payment_method_id == PaymentMethod.id)
+        .where(*filters)
+        .order_by(Transaction.date, Transaction.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    fields = [name for name, _ in EXPORT_COLUMNS]
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+        for partition in db.session.execute(query).partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(_csv_safe_row(row) for row in partition)
+            yield buffer.getvalue()
+
+    def generate_ndjson():
+        for partition in db.session.execute(query).partitions():
+            yield "".join(json.dumps(_export_record(fields, row)) + "\n" for row in partition)
+
+    generate = generate_csv if export_format == "csv" else generate_ndjson
+    mimetype = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=transactions.{export_format}"
+    return response
+
 @transaction_bp.route("/transactions", methods=["GET"])
 @jwt_required()
+@conditional_get('transactions', 'categories', 'payment_methods')
 def get_transactions():
     """Get all transactions
     Retrieves a list of all transactions for the authenticated user, with optional filtering by year and month.
@@ -152,39 +712,89 @@ def get_transactions():
         type: integer
         required: false
         description: Filter transactions by month.
+      - name: start_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or after this date (YYYY-MM-DD).
+      - name: end_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or before this date (YYYY-MM-DD).
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500). When limit or cursor is given the response is a page object instead of a plain list.
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: The next_cursor value returned by the previous page.
     responses:
       200:
-        description: A list of transactions.
+        description: A list of transactions, or a page ({items, next_cursor}) when paginating. Ordered by date and id, newest first.
       400:
         description: Bad request (e.g., invalid year or month).
     """
     user_id = get_jwt_identity()
-    year = request.args.get("year")
-    month = request.args.get("month")
     
     query = Transaction.query
     
     query = query.filter_by(user_id=user_id)
     
-    if year:
-        try:
-            year = int(year)
-            query = query.filter(db.extract('year', Transaction.date) == year)
-        except ValueError:
-            return jsonify({"message": "Invalid year"}), 400
+    try:
+        query = query.filter(*date_range_filters(Transaction.date, request.args))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     
-    if month:
+    # Load category and payment method names in the same query; to_dict reads both
+    query = query.options(
+        joinedload(Transaction.category),
+        joinedload(Transaction.payment_method)
+    ).order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    if "limit" not in request.args and "cursor" not in request.args:
+        transactions = query.all()
+        return jsonify([transaction.to_dict() for transaction in transactions])
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    cursor = request.args.get("cursor")
+    if cursor:
         try:
-            month = int(month)
-            query = query.filter(db.extract('month', Transaction.date) == month)
-        except ValueError:
-            return jsonify({"message": "Invalid month"}), 400
-    
-    transactions = query.order_by(Transaction.date.desc()).all()
-    return jsonify([transaction.to_dict() for transaction in transactions])
+            cursor_date, cursor_id = decode_cursor(cursor)
+            cursor_date = datetime.strptime(cursor_date, "%Y-%m-%d").date()
+            cursor_id = int(cursor_id)
+        except (ValueError, TypeError):
+            return jsonify({"message": "Invalid cursor"}), 400
+        # Keyset predicate on (date DESC, id DESC): seeks straight to the next page
+        query = query.filter(
+            Transaction.date <= cursor_date,
+            or_(Transaction.date < cursor_date, Transaction.id < cursor_id)
+        )
+
+    transactions = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.date.isoformat(), last.id)
+
+    return jsonify({
+        "items": [transaction.to_dict() for transaction in transactions],
+        "next_cursor": next_cursor
+    })
 
 @transaction_bp.route("/transactions/<int:id>", methods=["GET"])
 @jwt_required()
+@conditional_get('transactions', 'categories', 'payment_methods')
 def get_transaction(id):
     """Get a specific transaction
     Retrieves a single transaction by its ID.
@@ -259,62 +869,24 @@ def update_transaction(id):
     """
     user_id = get_jwt_identity()
     transaction = Transaction.query.filter_by(id=id, user_id=user_id).first_or_404()
-    data = request.get_json()
-    
-    description = data.get("description")
-    amount = data.get("amount")
-    date_str = data.get("date")
-    transaction_type = data.get("transaction_type")
-    category_id = data.get("category_id")
-    payment_method_id = data.get("payment_method_id")
-    notes = data.get("notes")
-
-    if description is not None:
-        transaction.description = bleach.clean(description)
-
-    if amount is not None:
-        try:
-            amount = float(amount)
-            if amount <= 0:
-                return jsonify({"message": "Amount must be a positive number"}), 400
-            transaction.amount = amount
-        except ValueError:
-            return jsonify({"message": "Amount must be a valid number"}), 400
-
-    if date_str is not None:
-        try:
-            transaction.date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
+    try:
+        changes = _parse_transaction_changes(request.get_json())
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    if transaction_type is not None:
-        if transaction_type not in ['income', 'expense']:
-            return jsonify({"message": "Invalid transaction type. Must be 'income' or 'expense'"}), 400
-        transaction.transaction_type = transaction_type
+    if "category_id" in changes:
+        category = Category.query.filter_by(id=changes["category_id"], user_id=user_id).first()
+        if not category:
+            return jsonify({"message": "Category not found or does not belong to user"}), 404
 
-    if category_id is not None:
-        try:
-            category_id = int(category_id)
-            category = Category.query.filter_by(id=category_id, user_id=user_id).first()
-            if not category:
-                return jsonify({"message": "Category not found or does not belong to user"}), 404
-            transaction.category_id = category_id
-        except ValueError:
-            return jsonify({"message": "Category ID must be a valid integer"}), 400
+    if "payment_method_id" in changes:
+        payment_method = PaymentMethod.query.filter_by(id=changes["payment_method_id"], user_id=user_id).first()
+        if not payment_method:
+            return jsonify({"message": "Payment method not found or does not belong to user"}), 404
 
-    if payment_method_id is not None:
-        try:
-            payment_method_id = int(payment_method_id)
-            payment_method = PaymentMethod.query.filter_by(id=payment_method_id, user_id=user_id).first()
-            if not payment_method:
-                return jsonify({"message": "Payment method not found or does not belong to user"}), 404
-            transaction.payment_method_id = payment_method_id
-        except ValueError:
-            return jsonify({"message": "Payment method ID must be a valid integer"}), 400
+    for attribute, value in changes.items():
+        setattr(transaction, attribute, value)
 
-    if notes is not None:
-        transaction.notes = bleach.clean(notes)
-    
     db.session.commit()
     return jsonify(transaction.to_dict())
 
@@ -348,6 +920,8 @@ def delete_transaction(id):
 
 @transaction_bp.route("/transactions/summary", methods=["GET"])
 @jwt_required()
+@conditional_get('transactions')
+@response_cache.cached('transactions')
 def get_transactions_summary():
     """Get transactions summary
     Retrieves a summary of income, expenses, and balance for the authenticated user, with optional filtering by year and month.
@@ -367,6 +941,18 @@ def get_transactions_summary():
         type: integer
         required: false
         description: Filter summary by month.
+      - name: start_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or after this date (YYYY-MM-DD).
+      - name: end_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or before this date (YYYY-MM-DD).
     responses:
       200:
         description: A summary of transactions.
@@ -390,36 +976,242 @@ def get_transactions_summary():
         description: Bad request (e.g., invalid year or month).
     """
     user_id = get_jwt_identity()
-    year = request.args.get("year")
-    month = request.args.get("month")
-    
-    query = Transaction.query
-    
-    query = query.filter_by(user_id=user_id)
-    
-    if year:
-        try:
-            year = int(year)
-            query = query.filter(db.extract('year', Transaction.date) == year)
-        except ValueError:
-            return jsonify({"message": "Invalid year"}), 400
-    
-    if month:
-        try:
-            month = int(month)
-            query = query.filter(db.extract('month', Transaction.date) == month)
-        except ValueError:
-            return jsonify({"message": "Invalid month"}), 400
     
-    transactions = query.all()
-    
-    total_income = sum(t.amount for t in transactions if t.transaction_type == 'income')
-    total_expense = sum(t.amount for t in transactions if t.transaction_type == 'expense')
-    balance = total_income - total_expense
+    try:
+        filters = date_range_filters(Transaction.date, request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     
+    return jsonify(transaction_totals(user_id, filters, period_filters(request.args)))
+
+@transaction_bp.route("/transactions/breakdown", methods=["GET"])
+@jwt_required()
+@conditional_get('transactions', 'categories', 'payment_methods')
+def get_transactions_breakdown():
+    """Get transactions breakdown
+    Retrieves transaction totals grouped by category or payment method for the authenticated user, with optional filtering by period and type.
+    ---
+    tags:
+      - Transaction
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: by
+        in: query
+        type: string
+        enum: [category, payment_method]
+        required: true
+        description: Dimension to group by.
+      - name: transaction_type
+        in: query
+        type: string
+        enum: [income, expense]
+        required: false
+        description: Only include transactions of this type.
+      - name: year
+        in: query
+        type: integer
+        required: false
+        description: Filter breakdown by year.
+      - name: month
+        in: query
+        type: integer
+        required: false
+        description: Filter breakdown by month.
+      - name: start_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or after this date (YYYY-MM-DD).
+      - name: end_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Only include transactions on or before this date (YYYY-MM-DD).
+    responses:
+      200:
+        description: One entry per group, largest total first.
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  name:
+                    type: string
+                  total:
+                    type: number
+                    format: float
+                  count:
+                    type: integer
+      400:
+        description: Bad request (e.g., invalid grouping, type or period).
+    """
+    user_id = get_jwt_identity()
+    by = request.args.get("by")
+    transaction_type = request.args.get("transaction_type")
+
+    if by == "category":
+        group_model, key_name = Category, "category_id"
+    elif by == "payment_method":
+        group_model, key_name = PaymentMethod, "payment_method_id"
+    else:
+        return jsonify({"message": "Invalid grouping. Must be 'category' or 'payment_method'"}), 400
+
+    if transaction_type and transaction_type not in ['income', 'expense']:
+        return jsonify({"message": "Invalid transaction type. Must be 'income' or 'expense'"}), 400
+
+    try:
+        filters = date_range_filters(Transaction.date, request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Whole-month periods are answered from the rollup, anything else from raw rows
+    rollup_filters = period_filters(request.args)
+    if rollup_filters is not None:
+        source, filters = MonthlyRollup, rollup_filters
+        total, count = func.sum(MonthlyRollup.total), func.sum(MonthlyRollup.count)
+    else:
+        source = Transaction
+        total, count = func.sum(Transaction.amount), func.count(Transaction.id)
+    key_column = getattr(source, key_name)
+
+    # Group in SQL so the payload is O(groups) rather than O(transactions)
+    query = db.session.query(
+        key_column, group_model.name, total, count
+    ).select_from(source).outerjoin(group_model, group_model.id == key_column)
+
+    query = query.filter(source.user_id == user_id, *filters)
+    if transaction_type:
+        query = query.filter(source.transaction_type == transaction_type)
+
+    rows = query.group_by(key_column, group_model.name).order_by(total.desc()).all()
+    return jsonify([
+        {"id": key, "name": name, "total": group_total, "count": group_count}
+        for key, name, group_total, group_count in rows
+    ])
+
+MAX_TREND_BUCKETS = 1000
+
+@transaction_bp.route("/transactions/trend", methods=["GET"])
+@jwt_required()
+@conditional_get('transactions')
+def get_transactions_trend():
+    """Get transactions trend
+    Retrieves income, expense and balance per month, week or day over a range of months, with empty periods filled with zeros.
+    ---
+    tags:
+      - Transaction
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: from
+        in: query
+        type: string
+        required: true
+        description: First month of the range (YYYY-MM).
+      - name: to
+        in: query
+        type: string
+        required: false
+        description: Last month of the range, inclusive (YYYY-MM). Defaults to the first month.
+      - name: granularity
+        in: query
+        type: string
+        enum: [month, week, day]
+        required: false
+        description: Bucket size. Weeks start on Monday. Defaults to month.
+    responses:
+      200:
+        description: One point per bucket, oldest first. A week that starts before 'from' is labelled with the first day of 'from', and a week running past 'to' only counts days up to the end of 'to'.
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                granularity:
+                  type: string
+                series:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      period:
+                        type: string
+                        example: "2024-01"
+                      income:
+                        type: number
+                        format: float
+                      expense:
+                        type: number
+                        format: float
+                      balance:
+                        type: number
+                        format: float
+      400:
+        description: Bad request (e.g., invalid range or granularity).
+    """
+    user_id = get_jwt_identity()
+    granularity = request.args.get("granularity", "month")
+
+    if granularity not in GRANULARITIES:
+        return jsonify({"message": "Invalid granularity. Must be 'month', 'week' or 'day'"}), 400
+
+    try:
+        from_year, from_month = parse_year_month(request.args.get("from"), "from")
+        to_year, to_month = parse_year_month(request.args.get("to") or request.args.get("from"), "to")
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    start = month_bounds(from_year, from_month)[0]
+    end = month_bounds(to_year, to_month)[1]
+    if end <= start:
+        return jsonify({"message": "'to' must not be before 'from'"}), 400
+
+    buckets = list(iter_buckets(start, end, granularity))
+    if len(buckets) > MAX_TREND_BUCKETS:
+        return jsonify({"message": "Range too large for the requested granularity"}), 400
+
+    series = {bucket: {"income": 0, "expense": 0} for bucket in buckets}
+
+    if granularity == "month":
+        # Monthly buckets map one-to-one onto the rollup: O(months x categories) rows
+        rows = db.session.query(
+            MonthlyRollup.year_month, MonthlyRollup.transaction_type, func.sum(MonthlyRollup.total)
+        ).filter(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.year_month.between(start.strftime("%Y-%m"), f"{to_year:04d}-{to_month:02d}")
+        ).group_by(MonthlyRollup.year_month, MonthlyRollup.transaction_type)
+        rows = ((datetime.strptime(year_month, "%Y-%m").date(), transaction_type, total)
+                for year_month, transaction_type, total in rows)
+    else:
+        # One grouped query over the (user_id, date) range; rows are O(days), not O(transactions)
+        rows = db.session.query(
+            Transaction.date, Transaction.transaction_type, func.sum(Transaction.amount)
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.date >= start,
+            Transaction.date < end
+        ).group_by(Transaction.date, Transaction.transaction_type)
+
+    for day, transaction_type, total in rows:
+        if transaction_type in ("income", "expense"):
+            series[max(bucket_start(day, granularity), start)][transaction_type] += total
+
     return jsonify({
-        "total_income": total_income,
-        "total_expense": total_expense,
-        "balance": balance,
-        "transaction_count": len(transactions)
+        "granularity": granularity,
+        "series": [
+            {
+                "period": bucket_label(bucket, granularity),
+                "income": totals["income"],
+                "expense": totals["expense"],
+                "balance": totals["income"] - totals["expense"]
+            }
+            for bucket, totals in series.items()
+        ]
     })
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from sqlalchemy import event, select, insert, delete, or_
+from sqlalchemy.orm import Session, joinedload
+from src.models.tombstone import Tombstone
+from src.models.timestamps import utcnow
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.models.investment_type import InvestmentType
+from src.models.transaction import Transaction
+from src.models.investment import Investment
+from src.versioning import RESOURCES
+from src.pagination import encode_cursor, decode_cursor
+
+# Relationships each resource's to_dict reads, loaded up front to avoid per-row queries
+_EAGER = {
+    Transaction: (joinedload(Transaction.category), joinedload(Transaction.payment_method)),
+    Investment: (joinedload(Investment.investment_type),),
+}
+# Foreign keys whose referenced row's name is embedded in each resource's to_dict
+_EMBEDDED = {
+    Transaction: ((Transaction.category_id, Category), (Transaction.payment_method_id, PaymentMethod)),
+    Investment: ((Investment.investment_type_id, InvestmentType),),
+}
+
+_tombstones = Tombstone.__table__
+
+
+def record_tombstones(session, user_id, resource, ids):
+    """Records deleted row ids for delta sync inside the session's transaction.
+
+    ORM deletes are recorded by the session hook below; Core deletes that
+    bypass the flush must call this themselves.
+    """
+    if not ids:
+        return
+    deleted_at = utcnow()
+    session.connection().execute(
+        insert(_tombstones),
+        [
+            {"user_id": int(user_id), "resource": resource, "resource_id": resource_id, "deleted_at": deleted_at}
+            for resource_id in ids
+        ]
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _record_deleted_rows(session, flush_context):
+    deleted = {}
+    for obj in session.deleted:
+        resource = RESOURCES.get(type(obj))
+        if resource is None or obj.user_id is None:
+            continue
+        deleted.setdefault((int(obj.user_id), resource), []).append(obj.id)
+
+    for (user_id, resource), ids in deleted.items():
+        record_tombstones(session, user_id, resource, ids)
+
+
+def encode_sync_cursor(moment):
+    return encode_cursor(moment.isoformat())
+
+
+def decode_sync_cursor(cursor):
+    """Reverses encode_sync_cursor. Raises ValueError for tokens we did not issue."""
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], str):
+        raise ValueError("Invalid cursor")
+    try:
+        return datetime.fromisoformat(values[0])
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def collect_changes(session, user_id, since=None, overlap=timedelta(0)):
+    """Rows written and ids deleted for a user since a point in time, per resource.
+
+    `since=None` returns every row. The window is widened by `overlap` so a
+    row whose transaction committed after an earlier read started is not
+    missed; clients apply changes as idempotent upserts, so re-sent rows are
+    harmless. Rows that embed the name of a changed category, payment
+    method or investment type are re-sent too, so renames reach them.
+    """
+    changes, deleted, changed_ids = {}, {}, {}
+    threshold = since - overlap if since is not None else None
+    # RESOURCES lists the referenced resources before the ones embedding them
+    for model, resource in RESOURCES.items():
+        query = select(model).where(model.user_id == user_id).options(*_EAGER.get(model, ()))
+        if threshold is not None:
+            stale = [column.in_(changed_ids[referenced])
+                     for column, referenced in _EMBEDDED.get(model, ()) if changed_ids[referenced]]
+            query = query.where(or_(model.updated_at >= threshold, *stale))
+        rows = session.scalars(query.order_by(model.id)).unique().all()
+        changed_ids[model] = [obj.id for obj in rows]
+        changes[resource] = [obj.to_dict() for obj in rows]
+        deleted[resource] = []
+
+    if threshold is not None:
+        rows = session.execute(
+            select(_tombstones.c.resource, _tombstones.c.resource_id)
+            .where(_tombstones.c.user_id == user_id, _tombstones.c.deleted_at >= threshold)
+            .distinct()
+            .order_by(_tombstones.c.resource_id)
+        )
+        for resource, resource_id in rows:
+            deleted.setdefault(resource, []).append(resource_id)
+    return changes, deleted
+
+
+def prune_tombstones(session, older_than):
+    """Deletes tombstones recorded before `older_than`; returns how many were removed."""
+    result = session.execute(delete(_tombstones).where(_tombstones.c.deleted_at < older_than))
+    return result.rowcount
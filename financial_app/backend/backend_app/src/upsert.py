@@ -0,0 +1,16 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def upsert(connection, table):
+    """INSERT for `table` in the connection's dialect, which supports ON CONFLICT.
+
+    Both supported databases take on_conflict_do_update/on_conflict_do_nothing,
+    so a concurrent first write lands on the existing row instead of racing an
+    UPDATE-then-INSERT into a duplicate or an IntegrityError.
+    """
+    return _INSERTS[connection.dialect.name](table)
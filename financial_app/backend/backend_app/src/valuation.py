@@ -0,0 +1,58 @@
+from sqlalchemy import select, delete
+from src.models.investment_valuation import InvestmentValuation
+from src.date_filters import bucket_start, bucket_label
+from src.upsert import upsert
+
+RESOLUTIONS = ('day', 'week', 'month')
+
+_valuations = InvestmentValuation.__table__
+
+
+class ValuationSeries:
+    """Daily closing values of investments, kept up to date by the investment ledger.
+
+    Every ledger movement overwrites the value for the day it happened on,
+    so the series holds at most one point per investment and day.
+    """
+
+    def record(self, connection, investment_id, day, value):
+        statement = upsert(connection, _valuations).values(investment_id=investment_id, date=day, value=value)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[_valuations.c.investment_id, _valuations.c.date],
+            set_={"value": statement.excluded.value}
+        ))
+
+    def purge(self, connection, investment_id):
+        connection.execute(delete(_valuations).where(_valuations.c.investment_id == investment_id))
+
+    def downsample(self, session, investment_id, resolution, filters=(), start=None):
+        """Last value of each day/week/month bucket that has one, oldest first.
+
+        Streams the day rows in date order and keeps the latest per bucket,
+        so the payload is at most one point per bucket however often the
+        investment was valued. Buckets without a change are omitted. With a
+        `start`, the value in force before it opens the first bucket, which
+        is labelled with `start` itself.
+        """
+        points = {}
+        if start is not None:
+            carried = session.execute(
+                select(_valuations.c.value)
+                .where(_valuations.c.investment_id == investment_id, _valuations.c.date < start)
+                .order_by(_valuations.c.date.desc())
+                .limit(1)
+            ).scalar()
+            if carried is not None:
+                points[start] = carried
+
+        rows = session.execute(
+            select(_valuations.c.date, _valuations.c.value)
+            .where(_valuations.c.investment_id == investment_id, *filters)
+            .order_by(_valuations.c.date)
+        )
+        for day, value in rows:
+            bucket = bucket_start(day, resolution)
+            points[bucket if start is None else max(bucket, start)] = value
+        return [{"period": bucket_label(bucket, resolution), "value": value} for bucket, value in points.items()]
+
+investment_valuations = ValuationSeries()
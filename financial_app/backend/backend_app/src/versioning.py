@@ -0,0 +1,119 @@
+import hashlib
+from functools import wraps
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.data_version import DataVersion
+from src.upsert import upsert
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.models.investment_type import InvestmentType
+from src.models.transaction import Transaction
+from src.models.investment import Investment
+from src.models.goal import Goal
+
+# Resource name bumped when a row of each user-owned model is written
+RESOURCES = {
+    Category: 'categories',
+    PaymentMethod: 'payment_methods',
+    InvestmentType: 'investment_types',
+    Transaction: 'transactions',
+    Investment: 'investments',
+    Goal: 'goals',
+}
+
+_versions = DataVersion.__table__
+_REQUEST_VERSIONS = 'financial_app.data_versions'
+
+
+def bump_versions(session, user_id, resources):
+    """Increments the version of each resource for a user inside the session's transaction.
+
+    Core writes that bypass the ORM flush (and so the session hook below) must
+    call this themselves. The resources are also recorded in
+    session.info['written_resources'] so caches can be invalidated on commit.
+    Each bump is one INSERT ... ON CONFLICT DO UPDATE, so concurrent first
+    writes for a resource cannot collide on the primary key.
+    """
+    session.info.setdefault('written_resources', {}).setdefault(int(user_id), set()).update(resources)
+    connection = session.connection()
+    for resource in sorted(set(resources)):
+        statement = upsert(connection, _versions).values(user_id=int(user_id), resource=resource, version=1)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[_versions.c.user_id, _versions.c.resource],
+            set_={"version": _versions.c.version + 1}
+        ))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_written_resources(session, flush_context):
+    changed = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        resource = RESOURCES.get(type(obj))
+        if resource is None or obj.user_id is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        changed.setdefault(int(obj.user_id), set()).add(resource)
+
+    for user_id, resources in changed.items():
+        bump_versions(session, user_id, resources)
+
+
+def current_versions(session, user_id, resources):
+    """Reads the versions of `resources` for a user with a single primary-key lookup."""
+    rows = session.execute(
+        select(_versions.c.resource, _versions.c.version)
+        .where(_versions.c.user_id == user_id, _versions.c.resource.in_(resources))
+    )
+    versions = dict(rows.all())
+    return [versions.get(resource, 0) for resource in resources]
+
+
+def request_versions(user_id, resources):
+    """Versions of `resources` for this request, read at most once per resource.
+
+    Kept in the WSGI environ so conditional_get and the response cache key
+    the same request off the same versions, while batched sub-requests, each
+    with their own environ, read their own.
+    """
+    known = request.environ.setdefault(_REQUEST_VERSIONS, {})
+    missing = [resource for resource in resources if resource not in known]
+    if missing:
+        known.update(zip(missing, current_versions(db.session, user_id, missing)))
+    return [known[resource] for resource in resources]
+
+
+def build_etag(user_id, resources, versions):
+    payload = f"{user_id}|{request.full_path}|" + ",".join(
+        f"{resource}:{version}" for resource, version in zip(resources, versions)
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def conditional_get(*resources):
+    """Answers GETs with a strong ETag derived from the user's resource versions.
+
+    A matching If-None-Match short-circuits to 304 before the view runs, so an
+    unchanged poll costs one indexed lookup. Must be applied under @jwt_required().
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()
+            etag = build_etag(user_id, resources, request_versions(user_id, resources))
+
+            if request.if_none_match.contains(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -8,6 +8,8 @@ from src.models.goal import Goal
 from src.models.investment import Investment
 from src.models.investment_type import InvestmentType
 from datetime import date
+from contextlib import contextmanager
+from sqlalchemy import event
 import json
 
 @pytest.fixture
@@ -24,10 +26,41 @@ def app():
         yield app
         db.drop_all()
 
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """An app backed by an on-disk SQLite file, for tests that need several connections."""
+    from src.config import TestingConfig
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'app.db'}")
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
 @pytest.fixture
 def client(app):
     return app.test_client()
 
+@pytest.fixture
+def count_queries(app):
+    """Returns a context manager that collects every SQL statement run inside it."""
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return _count_queries
+
 @pytest.fixture
 def new_user(app):
     with app.app_context():
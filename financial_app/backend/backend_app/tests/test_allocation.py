@@ -0,0 +1,151 @@
+from http import HTTPStatus
+import pytest
+from src.models.user import db
+from src.models.investment import Investment
+from src.models.investment_type import InvestmentType
+from src.rebalance import rebalance_trades
+
+
+@pytest.fixture
+def portfolio(auth_client):
+    """Stocks worth 700, bonds 300 and an empty cash type."""
+    client, user = auth_client
+    types = {}
+    for name in ('Stocks', 'Bonds', 'Cash'):
+        investment_type = InvestmentType(name=name, user_id=user.id)
+        db.session.add(investment_type)
+        db.session.flush()
+        types[name] = investment_type.id
+    db.session.add_all([
+        Investment(name='World ETF', amount=400.0, investment_type_id=types['Stocks'], user_id=user.id),
+        Investment(name='Tech ETF', amount=300.0, investment_type_id=types['Stocks'], user_id=user.id),
+        Investment(name='Treasury', amount=300.0, investment_type_id=types['Bonds'], user_id=user.id),
+    ])
+    db.session.commit()
+    return client, types
+
+
+def test_rebalance_trades_with_withdrawals():
+    trades, total = rebalance_trades([700, 300, 0], [0.5, 0.3, 0.2])
+    assert total == 1000
+    assert trades.tolist() == [-200, 0, 200]
+
+
+def test_rebalance_trades_contributions_only():
+    trades, total = rebalance_trades([700, 300, 0], [0.5, 0.3, 0.2], allow_withdrawals=False)
+    # Stocks already hold 700, so the portfolio must grow to 1400 to make them 50%
+    assert total == 1400
+    assert trades.tolist() == [0, 120, 280]
+
+    with pytest.raises(ValueError):
+        rebalance_trades([700, 300, 0], [0, 0.5, 0.5], allow_withdrawals=False)
+
+
+def test_rebalance_trades_with_cash():
+    trades, total = rebalance_trades([700, 300], [0.5, 0.5], cash=400)
+    assert total == 1400
+    assert trades.tolist() == [0, 400]
+
+
+def test_allocation(portfolio):
+    client, types = portfolio
+
+    response = client.get('/api/investments/allocation')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['total_current_value'] == 1000.0
+    rows = {row['investment_type_name']: row for row in response.json['by_investment_type']}
+    assert rows['Stocks']['weight_percentage'] == pytest.approx(70)
+    assert rows['Stocks']['investment_count'] == 2
+    assert rows['Bonds']['weight_percentage'] == pytest.approx(30)
+    assert rows['Cash'] == {
+        'investment_type_id': types['Cash'], 'investment_type_name': 'Cash',
+        'current_value': 0, 'investment_count': 0, 'weight_percentage': 0,
+    }
+
+
+def test_allocation_runs_one_query(portfolio, count_queries):
+    client, types = portfolio
+    with count_queries() as queries:
+        client.get('/api/investments/allocation')
+    assert len([q for q in queries if 'investment_type' in q and 'GROUP BY' in q]) == 1
+
+
+def test_rebalance(portfolio):
+    client, types = portfolio
+
+    response = client.post('/api/investments/rebalance', json={'targets': [
+        {'investment_type_id': types['Stocks'], 'weight_percentage': 50},
+        {'investment_type_id': types['Bonds'], 'weight_percentage': 30},
+        {'investment_type_id': types['Cash'], 'weight_percentage': 20},
+    ]})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['total_after'] == 1000.0
+    trades = {trade['investment_type_name']: (trade['action'], trade['amount']) for trade in response.json['trades']}
+    assert trades == {'Stocks': ('withdraw', -200.0), 'Cash': ('contribute', 200.0)}
+
+
+def test_rebalance_omitted_types_are_sold(portfolio):
+    client, types = portfolio
+
+    response = client.post('/api/investments/rebalance', json={
+        'targets': [{'investment_type_id': types['Bonds'], 'weight_percentage': 100}],
+        'cash': 500,
+    })
+
+    trades = {trade['investment_type_id']: trade['amount'] for trade in response.json['trades']}
+    assert trades == {types['Stocks']: -700.0, types['Bonds']: 1200.0}
+
+
+def test_rebalance_without_withdrawals(portfolio):
+    client, types = portfolio
+    targets = [
+        {'investment_type_id': types['Stocks'], 'weight_percentage': 50},
+        {'investment_type_id': types['Bonds'], 'weight_percentage': 50},
+    ]
+
+    response = client.post('/api/investments/rebalance', json={'targets': targets, 'allow_withdrawals': False})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['total_after'] == 1400.0
+    assert [(t['investment_type_id'], t['amount']) for t in response.json['trades']] == [(types['Bonds'], 400.0)]
+
+
+def test_rebalance_validation(portfolio):
+    client, types = portfolio
+    stocks = types['Stocks']
+
+    for body in [
+        {},
+        {'targets': [{'investment_type_id': stocks}]},
+        {'targets': [{'investment_type_id': stocks, 'weight_percentage': 90}]},
+        {'targets': [{'investment_type_id': stocks, 'weight_percentage': -10},
+                     {'investment_type_id': types['Bonds'], 'weight_percentage': 110}]},
+        {'targets': [{'investment_type_id': stocks, 'weight_percentage': 50},
+                     {'investment_type_id': stocks, 'weight_percentage': 50}]},
+        {'targets': [{'investment_type_id': stocks, 'weight_percentage': 100}], 'cash': 'lots'},
+        {'targets': [{'investment_type_id': stocks, 'weight_percentage': 100}], 'cash': -5000},
+        {'targets': [{'investment_type_id': types['Cash'], 'weight_percentage': 100}], 'allow_withdrawals': False},
+    ]:
+        assert client.post('/api/investments/rebalance', json=body).status_code == HTTPStatus.BAD_REQUEST, body
+
+    unknown = {'targets': [{'investment_type_id': 999999, 'weight_percentage': 100}]}
+    assert client.post('/api/investments/rebalance', json=unknown).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_rebalance_rejects_non_finite_numbers(portfolio):
+    client, types = portfolio
+    stocks = types['Stocks']
+
+    for value in ['nan', 'NaN', 'inf', '-inf']:
+        weights = {'targets': [{'investment_type_id': stocks, 'weight_percentage': 100},
+                               {'investment_type_id': types['Bonds'], 'weight_percentage': value}]}
+        response = client.post('/api/investments/rebalance', json=weights)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, value
+        assert response.json['message'] == 'Weights must be finite numbers'
+
+        cash = {'targets': [{'investment_type_id': stocks, 'weight_percentage': 100}], 'cash': value}
+        response = client.post('/api/investments/rebalance', json=cash)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, value
+        assert response.json['message'] == 'Cash must be a valid number'
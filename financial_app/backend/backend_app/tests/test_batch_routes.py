@@ -0,0 +1,131 @@
+from http import HTTPStatus
+from src.models.user import db
+from flask_jwt_extended import create_access_token
+from src.cache import response_cache
+
+
+def test_batch_runs_sub_requests_in_order(auth_client, new_category, new_goal):
+    client, user = auth_client
+
+    response = client.post('/api/batch', json={'requests': [
+        {'method': 'GET', 'path': '/api/categories'},
+        {'path': '/api/goals'},
+        {'path': f'/api/goals/{new_goal.id}'},
+    ]})
+
+    assert response.status_code == HTTPStatus.OK
+    categories, goals, goal = response.json['responses']
+    assert categories['status'] == 200
+    assert [c['name'] for c in categories['body']] == ['Test Category']
+    assert categories['headers']['ETag']
+    assert [g['id'] for g in goals['body']] == [new_goal.id]
+    assert goal['body']['name'] == 'Test Goal'
+
+
+def test_batch_matches_individual_responses(auth_client, new_transaction):
+    client, user = auth_client
+    path = '/api/transactions/summary?year=2024&month=1'
+
+    single = client.get(path)
+    batched = client.post('/api/batch', json={'requests': [{'path': path}]}).json['responses'][0]
+
+    assert batched['status'] == single.status_code
+    assert batched['body'] == single.json
+    assert batched['headers']['ETag'] == single.headers['ETag']
+
+
+def test_batch_reports_sub_request_errors(auth_client):
+    client, user = auth_client
+
+    responses = client.post('/api/batch', json={'requests': [
+        {'path': '/api/goals/999999'},
+        {'path': '/api/no-such-route'},
+        {'path': '/api/categories?category_type=bogus'},
+    ]}).json['responses']
+
+    assert [r['status'] for r in responses] == [404, 404, 400]
+    assert responses[2]['body'] == {'message': "Invalid category type filter. Must be 'income' or 'expense'"}
+
+
+def test_batch_honours_if_none_match(auth_client, new_category):
+    client, user = auth_client
+    etag = client.get('/api/categories').headers['ETag']
+
+    response = client.post('/api/batch', json={'requests': [
+        {'path': '/api/categories', 'headers': {'If-None-Match': etag}},
+    ]}).json['responses'][0]
+
+    assert response['status'] == 304
+    assert response['body'] is None
+
+
+def test_batch_runs_no_extra_queries(auth_client, new_category, count_queries):
+    client, user = auth_client
+    backend, response_cache.backend = response_cache.backend, None
+    db.session.expunge_all()
+    try:
+        with count_queries() as queries:
+            client.get('/api/categories')
+            client.get('/api/payment-methods')
+        separate = len(queries)
+
+        with count_queries() as queries:
+            client.post('/api/batch', json={'requests': [
+                {'path': '/api/categories'},
+                {'path': '/api/payment-methods'},
+            ]})
+        assert len(queries) == separate
+    finally:
+        response_cache.backend = backend
+
+
+def test_batch_rejects_writes_and_foreign_paths(auth_client):
+    client, user = auth_client
+
+    for item in [
+        {'method': 'POST', 'path': '/api/categories'},
+        {'path': '/apidocs/'},
+        {'path': '/api/goals', 'headers': 'nope'},
+    ]:
+        response = client.post('/api/batch', json={'requests': [item]})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_batch_rejects_streams_and_non_api_routes(auth_client):
+    client, user = auth_client
+
+    responses = client.post('/api/batch', json={'requests': [
+        {'path': '/api/batch'},
+        {'path': '/api/events'},
+    ]}).json['responses']
+
+    # /api/batch only answers POST, so a GET falls through to the frontend catch-all
+    assert [r['status'] for r in responses] == [404, 400]
+
+
+def test_batch_limits(auth_client):
+    client, user = auth_client
+    assert client.post('/api/batch', json={'requests': []}).status_code == HTTPStatus.BAD_REQUEST
+    too_many = {'requests': [{'path': '/api/goals'}] * 21}
+    assert client.post('/api/batch', json=too_many).status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_batch_requires_auth(client):
+    response = client.post('/api/batch', json={'requests': [{'path': '/api/goals'}]})
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_batch_forwards_cookie_credentials(app, client, new_category, monkeypatch):
+    monkeypatch.setitem(app.config, 'JWT_TOKEN_LOCATION', ['cookies'])
+    monkeypatch.setitem(app.config, 'JWT_COOKIE_CSRF_PROTECT', False)
+    with app.app_context():
+        token = create_access_token(identity=str(new_category.user_id))
+    client.set_cookie('access_token_cookie', token)
+
+    responses = client.post('/api/batch', json={'requests': [
+        {'path': '/api/categories'},
+        {'path': '/api/goals', 'headers': {'Cookie': 'access_token_cookie=forged'}},
+    ]}).json['responses']
+
+    assert [r['status'] for r in responses] == [200, 200]
+    assert [c['name'] for c in responses[0]['body']] == ['Test Category']
@@ -0,0 +1,161 @@
+import os
+import time
+from http import HTTPStatus
+from src.cache import response_cache, MemoryCacheBackend, SQLiteCacheBackend
+from src.models.user import db
+from src.models.category import Category
+
+
+def test_categories_served_from_cache(auth_client, count_queries):
+    client, user = auth_client
+    client.post('/api/categories', json={'name': 'Food', 'category_type': 'expense'})
+
+    first = client.get('/api/categories')
+    db.session.expunge_all()
+    with count_queries() as statements:
+        second = client.get('/api/categories')
+
+    assert second.status_code == HTTPStatus.OK
+    assert second.json == first.json
+    # Only the ETag version lookup hits the database
+    assert len(statements) == 1
+    stats = response_cache.stats()['endpoints']['category_bp.get_categories']
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_query_args_are_normalized_into_the_key(auth_client):
+    client, user = auth_client
+    client.get('/api/investments/summary?year=2024&month=1')
+    client.get('/api/investments/summary?month=1&year=2024')
+    client.get('/api/investments/summary?year=2024')
+
+    stats = response_cache.stats()['endpoints']['investment_bp.get_investments_summary']
+    assert stats == {'hits': 1, 'misses': 2, 'hit_ratio': 0.3333}
+
+
+def test_write_handlers_invalidate(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    assert client.get('/api/transactions/summary').json['transaction_count'] == 0
+
+    client.post('/api/transactions', json={
+        'description': 'Lunch', 'amount': 20.0, 'transaction_type': 'expense',
+        'date': '2024-01-10', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id,
+    })
+    assert client.get('/api/transactions/summary').json['transaction_count'] == 1
+
+    client.put(f'/api/categories/{new_category.id}', json={'name': 'Meals'})
+    assert client.get('/api/categories').json[0]['name'] == 'Meals'
+
+    client.delete(f'/api/payment-methods/{new_payment_method.id}')
+    assert client.get('/api/payment-methods').json == []
+
+
+def test_invalidation_is_per_user(auth_client):
+    client, user = auth_client
+    client.get('/api/categories')
+
+    db.session.add(Category(name='Other', category_type='expense', user_id=user.id + 1))
+    db.session.commit()
+    client.get('/api/categories')
+
+    assert response_cache.stats()['endpoints']['category_bp.get_categories']['hits'] == 1
+
+
+def test_rollback_does_not_invalidate(auth_client):
+    client, user = auth_client
+    client.get('/api/categories')
+
+    db.session.add(Category(name='Pending', category_type='expense', user_id=user.id))
+    db.session.flush()
+    db.session.rollback()
+    client.get('/api/categories')
+
+    assert response_cache.stats()['endpoints']['category_bp.get_categories']['hits'] == 1
+
+
+def test_error_responses_are_not_cached(auth_client):
+    client, user = auth_client
+    client.get('/api/goals/summary?group_by=bogus')
+    client.get('/api/goals/summary?group_by=bogus')
+    assert response_cache.stats()['entries'] == 0
+
+
+def test_cache_stats_requires_api_key(auth_client):
+    client, user = auth_client
+    assert client.get('/api/admin/cache-stats').status_code == HTTPStatus.UNAUTHORIZED
+
+    os.environ['CLEAN_DB_SECRET_KEY'] = 'test-secret-key'
+    try:
+        client.get('/api/categories')
+        response = client.get('/api/admin/cache-stats?reset=true', headers={'X-API-KEY': 'test-secret-key'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json['backend'] == 'memory'
+        assert response.json['misses'] == 1
+        assert response_cache.stats()['misses'] == 0
+    finally:
+        del os.environ['CLEAN_DB_SECRET_KEY']
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2, ttl=60)
+    backend.set('a', 1, 1, {'categories'})
+    backend.set('b', 2, 1, {'categories'})
+    backend.get('a')
+    backend.set('c', 3, 1, {'categories'})
+    assert backend.get('b') is None
+    assert backend.get('a') == 1 and backend.get('c') == 3
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend(ttl=0.01)
+    backend.set('a', 1, 1, {'categories'})
+    time.sleep(0.02)
+    assert backend.get('a') is None
+
+
+def test_sqlite_backend_is_shared_and_invalidates_by_tag(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    writer = SQLiteCacheBackend(path, ttl=60)
+    reader = SQLiteCacheBackend(path, ttl=60)
+
+    writer.set('1:summary', (b'{}', 'application/json'), 1, {'investments', 'investment_types'})
+    writer.set('1:categories', (b'[]', 'application/json'), 1, {'categories'})
+    writer.set('2:categories', (b'[]', 'application/json'), 2, {'categories'})
+    assert reader.get('1:summary') == (b'{}', 'application/json')
+
+    reader.invalidate(1, {'investment_types'})
+    assert writer.get('1:summary') is None
+    assert writer.get('1:categories') is not None
+    assert len(writer) == 2
+
+
+def test_sqlite_backend_is_bounded(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.db'), max_entries=3, ttl=60)
+    for i in range(5):
+        backend.set(f'key{i}', (f'[{i}]'.encode(), 'application/json'), 1, {'categories'})
+    assert len(backend) == 3
+    assert backend.get('key4') == (b'[4]', 'application/json')
+
+
+def test_entries_from_before_a_write_are_unreachable(auth_client, monkeypatch):
+    client, user = auth_client
+    client.post('/api/categories', json={'name': 'Food', 'category_type': 'expense'})
+    client.get('/api/categories')
+
+    # As if the write happened in another worker, whose commit cannot reach this memory backend
+    monkeypatch.setattr(response_cache, 'invalidate', lambda user_id, resources: None)
+    client.post('/api/categories', json={'name': 'Rent', 'category_type': 'expense'})
+
+    response = client.get('/api/categories')
+    assert sorted(c['name'] for c in response.json) == ['Food', 'Rent']
+
+
+def test_sqlite_backend_tags_match_literally(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.db'), ttl=60)
+    backend.set('1:a', (b'[]', 'application/json'), 1, {'payment_methods'})
+    backend.set('1:b', (b'[]', 'application/json'), 1, {'paymentXmethods'})
+
+    backend.invalidate(1, {'payment_methods'})
+
+    assert backend.get('1:a') is None
+    assert backend.get('1:b') == (b'[]', 'application/json')
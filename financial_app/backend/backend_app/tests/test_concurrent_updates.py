@@ -0,0 +1,148 @@
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+import pytest
+from flask_jwt_extended import create_access_token
+from src.extensions import limiter
+from src.models.user import db, User
+from src.models.investment import Investment
+from src.models.investment_type import InvestmentType
+from src.models.goal import Goal
+from src.models.data_version import DataVersion
+from src.models.investment_valuation import InvestmentValuation
+
+WORKERS = 8
+REQUESTS_PER_WORKER = 25
+
+
+@pytest.fixture
+def stress_client(file_app, monkeypatch):
+    monkeypatch.setattr(limiter, 'enabled', False)
+    user = User(username='stressuser', email='stress@example.com')
+    user.set_password('Password123!')
+    db.session.add(user)
+    db.session.commit()
+    token = create_access_token(identity=str(user.id))
+
+    def make_client():
+        client = file_app.test_client()
+        client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        return client
+
+    return make_client, user.id
+
+
+def _run_parallel(make_client, requests):
+    """Sends `requests(client)` from WORKERS threads at once and returns every status code."""
+    def worker(_):
+        client = make_client()
+        return requests(client)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        return [status for statuses in pool.map(worker, range(WORKERS)) for status in statuses]
+
+
+def test_parallel_contributions_and_withdrawals_keep_exact_totals(stress_client):
+    make_client, user_id = stress_client
+    investment_type = InvestmentType(name='Stocks', user_id=user_id)
+    db.session.add(investment_type)
+    db.session.commit()
+    investment = Investment(name='Index fund', amount=100.0, investment_type_id=investment_type.id, user_id=user_id)
+    db.session.add(investment)
+    db.session.commit()
+    investment_id = investment.id
+
+    def requests(client):
+        statuses = []
+        for _ in range(REQUESTS_PER_WORKER):
+            statuses.append(client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 3}).status_code)
+            statuses.append(client.post(f'/api/investments/{investment_id}/withdraw', json={'amount': 1}).status_code)
+        return statuses
+
+    statuses = _run_parallel(make_client, requests)
+
+    assert set(statuses) == {HTTPStatus.OK}
+    db.session.expire_all()
+    assert db.session.get(Investment, investment_id).current_value == 100.0 + WORKERS * REQUESTS_PER_WORKER * 2
+
+
+def test_parallel_withdrawals_never_overdraw(stress_client):
+    make_client, user_id = stress_client
+    investment_type = InvestmentType(name='Bonds', user_id=user_id)
+    db.session.add(investment_type)
+    db.session.commit()
+    investment = Investment(name='Treasury', amount=50.0, investment_type_id=investment_type.id, user_id=user_id)
+    db.session.add(investment)
+    db.session.commit()
+    investment_id = investment.id
+
+    def requests(client):
+        return [
+            client.post(f'/api/investments/{investment_id}/withdraw', json={'amount': 1}).status_code
+            for _ in range(REQUESTS_PER_WORKER)
+        ]
+
+    statuses = _run_parallel(make_client, requests)
+
+    assert statuses.count(HTTPStatus.OK) == 50
+    assert statuses.count(HTTPStatus.BAD_REQUEST) == WORKERS * REQUESTS_PER_WORKER - 50
+    db.session.expire_all()
+    assert db.session.get(Investment, investment_id).current_value == 0.0
+
+
+def test_parallel_goal_contributions_keep_exact_total(stress_client):
+    make_client, user_id = stress_client
+    goal = Goal(name='Emergency fund', target_amount=150.0, user_id=user_id)
+    db.session.add(goal)
+    db.session.commit()
+    goal_id = goal.id
+
+    def requests(client):
+        return [
+            client.post(f'/api/goals/{goal_id}/contribute', json={'amount': 1}).status_code
+            for _ in range(REQUESTS_PER_WORKER)
+        ]
+
+    statuses = _run_parallel(make_client, requests)
+
+    assert set(statuses) == {HTTPStatus.OK}
+    db.session.expire_all()
+    goal = db.session.get(Goal, goal_id)
+    assert goal.current_amount == WORKERS * REQUESTS_PER_WORKER
+    assert goal.status == 'completed'
+
+
+def test_parallel_first_writes_share_one_version_row(stress_client):
+    make_client, user_id = stress_client
+
+    def requests(client):
+        return [
+            client.post('/api/categories', json={'name': f'Category {id(client)}-{i}', 'category_type': 'expense'}).status_code
+            for i in range(3)
+        ]
+
+    statuses = _run_parallel(make_client, requests)
+
+    assert set(statuses) == {HTTPStatus.CREATED}
+    db.session.expire_all()
+    assert db.session.get(DataVersion, (user_id, 'categories')).version == WORKERS * 3
+
+
+def test_parallel_first_valuations_of_a_day_share_one_row(stress_client):
+    make_client, user_id = stress_client
+    investment_type = InvestmentType(name='Stocks', user_id=user_id)
+    db.session.add(investment_type)
+    db.session.commit()
+    investment_id = make_client().post('/api/investments', json={
+        'name': 'Index fund', 'amount': 100, 'date': '2024-01-01', 'investment_type_id': investment_type.id,
+    }).json['id']
+
+    def requests(client):
+        return [client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 1}).status_code]
+
+    statuses = _run_parallel(make_client, requests)
+
+    assert set(statuses) == {HTTPStatus.OK}
+    db.session.expire_all()
+    valuations = InvestmentValuation.query.filter_by(investment_id=investment_id).order_by(InvestmentValuation.date).all()
+    assert [(v.date, v.value) for v in valuations] == [(date(2024, 1, 1), 100.0), (date.today(), 100.0 + WORKERS)]
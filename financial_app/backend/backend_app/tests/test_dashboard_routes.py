@@ -0,0 +1,74 @@
+from http import HTTPStatus
+from flask_jwt_extended import create_access_token
+from src.models.user import db, User
+
+
+def _seed(client):
+    category = client.post('/api/categories', json={'name': 'General', 'category_type': 'expense'}).json
+    payment_method = client.post('/api/payment-methods', json={'name': 'PIX'}).json
+    investment_type = client.post('/api/investment-types', json={'name': 'Stocks'}).json
+    client.post('/api/transactions', json={'description': 'Salary', 'amount': 1000.0, 'date': '2024-05-05', 'transaction_type': 'income', 'category_id': category['id']})
+    client.post('/api/transactions', json={'description': 'Rent', 'amount': 300.0, 'date': '2024-05-06', 'transaction_type': 'expense', 'category_id': category['id'], 'payment_method_id': payment_method['id']})
+    client.post('/api/transactions', json={'description': 'Old rent', 'amount': 300.0, 'date': '2024-04-06', 'transaction_type': 'expense', 'category_id': category['id'], 'payment_method_id': payment_method['id']})
+    client.post('/api/investments', json={'name': 'ETF', 'amount': 200.0, 'current_value': 250.0, 'date': '2024-05-10', 'investment_type_id': investment_type['id']})
+    client.post('/api/investments', json={'name': 'Bond', 'amount': 100.0, 'date': '2023-01-10', 'investment_type_id': investment_type['id']})
+    client.post('/api/goals', json={'name': 'Car', 'target_amount': 1000.0, 'current_amount': 250.0})
+    client.post('/api/goals', json={'name': 'Phone', 'target_amount': 100.0, 'current_amount': 100.0, 'status': 'completed'})
+
+
+EXPECTED_DASHBOARD = {
+    'transactions': {'total_income': 1000.0, 'total_expense': 300.0, 'balance': 700.0, 'transaction_count': 2},
+    'investments': {'total_invested': 200.0, 'total_current_value': 250.0, 'total_profit_loss': 50.0,
+                    'total_profit_loss_percentage': 25.0, 'investment_count': 1},
+    'goals': {'total_goals': 2, 'active_goals': 1, 'completed_goals': 1, 'total_target_amount': 1000.0,
+              'total_current_amount': 250.0, 'total_progress_percentage': 25.0},
+}
+
+
+def test_get_dashboard(auth_client, count_queries):
+    client, user = auth_client
+    _seed(client)
+
+    with count_queries() as statements:
+        response = client.get('/api/dashboard?year=2024&month=5')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == EXPECTED_DASHBOARD
+    # ETag version lookup, then one aggregate per table
+    assert len(statements) == 4
+
+
+def test_get_dashboard_empty(auth_client):
+    client, user = auth_client
+    response = client.get('/api/dashboard')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['transactions']['transaction_count'] == 0
+    assert response.json['investments']['investment_count'] == 0
+    assert response.json['goals']['total_goals'] == 0
+
+
+def test_get_dashboard_parallel_queries(file_app):
+    file_app.config['DASHBOARD_PARALLEL_QUERIES'] = True
+    user = User(username='paralleluser', email='parallel@example.com')
+    user.set_password('Password123!')
+    db.session.add(user)
+    db.session.commit()
+    client = file_app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {create_access_token(identity=str(user.id))}'
+    _seed(client)
+
+    response = client.get('/api/dashboard?year=2024&month=5')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == EXPECTED_DASHBOARD
+
+
+def test_get_dashboard_invalid_period(auth_client):
+    client, user = auth_client
+    response = client.get('/api/dashboard?year=2024&month=13')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json['message'] == 'Invalid month'
+
+
+def test_get_dashboard_unauthenticated(client):
+    response = client.get('/api/dashboard')
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,76 @@
+import pytest
+from datetime import date
+from sqlalchemy import text
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.investment import Investment
+from src.date_filters import date_range_filters, month_bounds
+
+
+def test_month_bounds_is_half_open():
+    assert month_bounds(2024, 2) == (date(2024, 2, 1), date(2024, 3, 1))
+    assert month_bounds(2024, 12) == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+@pytest.mark.parametrize("args, expected_message", [
+    ({"year": "abc"}, "Invalid year"),
+    ({"year": "0"}, "Invalid year"),
+    ({"year": "9999", "month": "12"}, "Invalid year"),
+    ({"year": "9999"}, "Invalid year"),
+    ({"year": "2024", "month": "13"}, "Invalid month"),
+    ({"month": "x"}, "Invalid month"),
+    ({"start_date": "2024-13-01"}, "Invalid start_date format. Use YYYY-MM-DD"),
+    ({"end_date": "yesterday"}, "Invalid end_date format. Use YYYY-MM-DD"),
+    ({"end_date": "9999-12-31"}, "Invalid end_date"),
+])
+def test_date_range_filters_invalid_args(args, expected_message):
+    with pytest.raises(ValueError) as excinfo:
+        date_range_filters(Transaction.date, args)
+    assert str(excinfo.value) == expected_message
+
+
+def _query_plan(query):
+    sql = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return " ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("model, index_name", [
+    (Transaction, "ix_transaction_user_id_date"),
+    (Investment, "ix_investment_user_id_date"),
+])
+def test_month_filter_uses_user_date_index(app, model, index_name):
+    query = model.query.filter_by(user_id=1).filter(
+        *date_range_filters(model.date, {"year": "2024", "month": "5"})
+    )
+    plan = _query_plan(query)
+    assert index_name in plan
+    assert "date>? AND date<?" in plan
+
+
+def test_date_range_filters_by_start_and_end_date(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    for day in ['2024-03-09', '2024-03-10', '2024-03-20', '2024-03-21']:
+        client.post('/api/transactions', json={
+            'description': day,
+            'amount': 10.0,
+            'date': day,
+            'transaction_type': 'expense',
+            'category_id': new_category.id,
+            'payment_method_id': new_payment_method.id
+        })
+
+    response = client.get('/api/transactions?start_date=2024-03-10&end_date=2024-03-20')
+    assert response.status_code == 200
+    assert sorted(t['date'] for t in response.json) == ['2024-03-10', '2024-03-20']
+
+    response = client.get('/api/transactions?start_date=03/10/2024')
+    assert response.status_code == 400
+
+
+def test_out_of_range_year_is_a_parameter_error(auth_client):
+    client, user = auth_client
+    for query in ['year=9999&month=12', 'year=9999', 'end_date=9999-12-31']:
+        response = client.get(f'/api/transactions?{query}')
+        assert response.status_code == 400, query
+        assert response.json['message'] in ('Invalid year', 'Invalid end_date'), query
@@ -0,0 +1,142 @@
+import json
+import queue
+import time
+from http import HTTPStatus
+import pytest
+from src.events import event_broker, EventBroker, SQLiteEventBus, MAX_EVENTS_PER_RESOURCE
+from src.models.user import db
+from src.models.goal import Goal
+
+
+@pytest.fixture
+def subscription(auth_client):
+    client, user = auth_client
+    subscription = event_broker.subscribe(user.id)
+    yield subscription
+    event_broker.unsubscribe(user.id, subscription)
+
+
+def _drain(subscription):
+    events = []
+    while True:
+        try:
+            events.append(subscription.get_nowait())
+        except queue.Empty:
+            return events
+
+
+def _parse(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_orm_writes_publish_change_events(auth_client, subscription, new_category):
+    client, user = auth_client
+    _drain(subscription)
+
+    created = client.post('/api/goals', json={'name': 'Trip', 'target_amount': 500}).json
+    client.put(f"/api/goals/{created['id']}", json={'name': 'Big trip'})
+    client.delete(f"/api/goals/{created['id']}")
+
+    assert _drain(subscription) == [
+        {'resource': 'goals', 'id': created['id'], 'op': 'create'},
+        {'resource': 'goals', 'id': created['id'], 'op': 'update'},
+        {'resource': 'goals', 'id': created['id'], 'op': 'delete'},
+    ]
+
+
+def test_events_are_published_only_on_commit(app, auth_client, subscription):
+    client, user = auth_client
+    db.session.add(Goal(name='Draft', target_amount=10.0, user_id=user.id))
+    db.session.flush()
+    db.session.rollback()
+    assert _drain(subscription) == []
+
+
+def test_events_are_scoped_to_user(auth_client, subscription):
+    client, user = auth_client
+    db.session.add(Goal(name='Not mine', target_amount=10.0, user_id=user.id + 1))
+    db.session.commit()
+    assert _drain(subscription) == []
+
+
+def test_batch_route_publishes_events(auth_client, subscription, new_transaction):
+    client, user = auth_client
+    transaction_id = new_transaction.id
+    _drain(subscription)
+
+    client.post('/api/transactions/batch', json={'operations': [
+        {'op': 'update', 'id': transaction_id, 'data': {'description': 'Edited'}},
+        {'op': 'delete', 'id': 999999},
+    ]})
+
+    assert _drain(subscription) == [{'resource': 'transactions', 'id': transaction_id, 'op': 'update'}]
+
+
+def test_large_commits_collapse_into_bulk_event(auth_client, subscription):
+    client, user = auth_client
+    db.session.add_all([
+        Goal(name=f'Goal {i}', target_amount=10.0, user_id=user.id) for i in range(MAX_EVENTS_PER_RESOURCE + 1)
+    ])
+    db.session.commit()
+    assert _drain(subscription) == [{'resource': 'goals', 'id': None, 'op': 'bulk'}]
+
+
+def test_slow_stream_gets_resync_instead_of_backlog():
+    broker = EventBroker()
+    broker.queue_size = 2
+    subscription = broker.subscribe(1)
+
+    broker.publish(1, [{'resource': 'goals', 'id': i, 'op': 'update'} for i in range(5)])
+
+    assert _drain(subscription) == [{'resource': None, 'id': None, 'op': 'resync'}]
+
+
+def test_stream_limit_per_user():
+    broker = EventBroker()
+    broker.max_streams_per_user = 1
+    first = broker.subscribe(1)
+    assert broker.subscribe(1) is None
+    broker.unsubscribe(1, first)
+    assert broker.subscribe(1) is not None
+
+
+def test_sqlite_bus_relays_between_brokers(tmp_path):
+    path = str(tmp_path / 'events.db')
+    publisher, listener = EventBroker(), EventBroker()
+    publisher.bus = SQLiteEventBus(path, poll_interval=0.01)
+    listener.bus = SQLiteEventBus(path, poll_interval=0.01)
+    subscription = listener.subscribe(7)
+    try:
+        time.sleep(0.05)
+        publisher.publish(7, [{'resource': 'goals', 'id': 1, 'op': 'create'}])
+        assert subscription.get(timeout=2) == {'resource': 'goals', 'id': 1, 'op': 'create'}
+    finally:
+        listener.bus.close()
+
+
+def test_event_stream(app, auth_client):
+    client, user = auth_client
+    app.config['EVENTS_HEARTBEAT_SECONDS'] = 0.05
+    app.config['EVENTS_STREAM_MAX_SECONDS'] = 1
+
+    response = client.get('/api/events')
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == 'text/event-stream'
+    chunks = response.iter_encoded()
+    assert next(chunks) == b'retry: 3000\n\n'
+    assert _parse(next(chunks)) == ('ready', {})
+    assert next(chunks) == b': keepalive\n\n'
+
+    created = client.post('/api/goals', json={'name': 'Live', 'target_amount': 50}).json
+    chunk = next(chunks)
+    while chunk == b': keepalive\n\n':
+        chunk = next(chunks)
+    assert _parse(chunk) == ('change', {'resource': 'goals', 'id': created['id'], 'op': 'create'})
+
+    response.close()
+    assert event_broker.stream_count(user.id) == 0
+
+
+def test_event_stream_requires_auth(client):
+    assert client.get('/api/events').status_code == HTTPStatus.UNAUTHORIZED
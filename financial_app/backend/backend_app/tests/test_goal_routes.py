@@ -58,6 +58,36 @@ def test_get_goals_summary(auth_client):
     assert summary['total_current_amount'] == 200.0
     assert summary['total_progress_percentage'] == 50.0
 
+def test_get_goals_summary_by_status(auth_client, count_queries):
+    client, user = auth_client
+    client.post('/api/goals', json={'name': 'Goal 1', 'target_amount': 100.0, 'current_amount': 50.0, 'status': 'active'})
+    client.post('/api/goals', json={'name': 'Goal 2', 'target_amount': 200.0, 'current_amount': 200.0, 'status': 'completed'})
+    client.post('/api/goals', json={'name': 'Goal 3', 'target_amount': 300.0, 'current_amount': 150.0, 'status': 'active'})
+    client.post('/api/goals', json={'name': 'Goal 4', 'target_amount': 50.0, 'current_amount': 10.0, 'status': 'paused'})
+
+    with count_queries() as statements:
+        response = client.get('/api/goals/summary?group_by=status')
+
+    assert response.status_code == HTTPStatus.OK
+    # ETag version lookup plus one grouped query
+    assert len(statements) == 2
+    summary = response.json
+    assert summary['total_goals'] == 4
+    assert summary['active_goals'] == 2
+    assert summary['completed_goals'] == 1
+    assert summary['total_target_amount'] == 400.0
+    assert summary['total_progress_percentage'] == 50.0
+    assert summary['by_status'] == [
+        {'status': 'active', 'goal_count': 2, 'total_target_amount': 400.0, 'total_current_amount': 200.0, 'progress_percentage': 50.0},
+        {'status': 'completed', 'goal_count': 1, 'total_target_amount': 200.0, 'total_current_amount': 200.0, 'progress_percentage': 100.0},
+        {'status': 'paused', 'goal_count': 1, 'total_target_amount': 50.0, 'total_current_amount': 10.0, 'progress_percentage': 20.0},
+    ]
+
+def test_get_goals_summary_invalid_grouping(auth_client):
+    client, user = auth_client
+    response = client.get('/api/goals/summary?group_by=name')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
 def test_add_goal_unauthenticated(client):
     response = client.post('/api/goals', json={
         'name': 'Unauthorized Goal',
@@ -0,0 +1,118 @@
+from datetime import date, datetime
+from http import HTTPStatus
+from src.models.user import db
+from src.models.investment import Investment
+from src.models.investment_valuation import InvestmentValuation
+from src.ledger import investment_ledger
+
+
+def _valuations(investment_id):
+    return [(v.date, v.value) for v in InvestmentValuation.query.filter_by(investment_id=investment_id).order_by(InvestmentValuation.date)]
+
+
+def _record_daily_values(investment_id, user_id, values):
+    """Replays (day, value) pairs into the ledger as adjustments, oldest first."""
+    investment = db.session.get(Investment, investment_id)
+    balance, sequence = investment.current_value, investment.movement_count
+    for day, value in values:
+        sequence += 1
+        investment_ledger.record(db.session, investment_id, user_id, 'adjustment', value - balance, sequence, value,
+                                 occurred_at=datetime.combine(day, datetime.min.time()))
+        balance = value
+    db.session.commit()
+
+
+def test_value_changes_are_recorded_once_per_day(auth_client, new_investment):
+    client, user = auth_client
+    investment_id = new_investment.id
+
+    client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 100})
+    client.post(f'/api/investments/{investment_id}/withdraw', json={'amount': 30})
+    client.put(f'/api/investments/{investment_id}', json={'current_value': 1200})
+    client.put(f'/api/investments/{investment_id}', json={'name': 'Renamed'})
+
+    assert _valuations(investment_id) == [(date.today(), 1200.0)]
+
+
+def test_opening_value_is_dated_with_the_investment(auth_client, new_investment_type):
+    client, user = auth_client
+    investment_id = client.post('/api/investments', json={
+        'name': 'Old fund', 'amount': 300, 'date': '2023-06-01', 'investment_type_id': new_investment_type.id,
+    }).json['id']
+    client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 50})
+
+    assert _valuations(investment_id) == [(date(2023, 6, 1), 300.0), (date.today(), 350.0)]
+
+
+def test_history_downsamples_to_last_value_per_bucket(auth_client, new_investment_type):
+    client, user = auth_client
+    investment_id = client.post('/api/investments', json={
+        'name': 'Index fund', 'amount': 100, 'date': '2024-01-01', 'investment_type_id': new_investment_type.id,
+    }).json['id']
+    _record_daily_values(investment_id, user.id, [
+        (date(2024, 1, 2), 101),
+        (date(2024, 1, 8), 105),   # Monday of the next week
+        (date(2024, 1, 31), 110),
+        (date(2024, 2, 15), 120),
+    ])
+
+    days = client.get(f'/api/investments/{investment_id}/history')
+    assert days.status_code == HTTPStatus.OK
+    assert days.json['resolution'] == 'day'
+    assert [p['value'] for p in days.json['series']] == [100.0, 101.0, 105.0, 110.0, 120.0]
+
+    weeks = client.get(f'/api/investments/{investment_id}/history?resolution=week').json['series']
+    assert weeks == [
+        {'period': '2024-01-01', 'value': 101.0},
+        {'period': '2024-01-08', 'value': 105.0},
+        {'period': '2024-01-29', 'value': 110.0},
+        {'period': '2024-02-12', 'value': 120.0},
+    ]
+
+    months = client.get(f'/api/investments/{investment_id}/history?resolution=month').json['series']
+    assert months == [{'period': '2024-01', 'value': 110.0}, {'period': '2024-02', 'value': 120.0}]
+
+    ranged = client.get(f'/api/investments/{investment_id}/history?start_date=2024-01-05&end_date=2024-01-31').json['series']
+    assert ranged == [
+        {'period': '2024-01-05', 'value': 101.0},
+        {'period': '2024-01-08', 'value': 105.0},
+        {'period': '2024-01-31', 'value': 110.0},
+    ]
+
+
+def test_history_window_opens_with_the_value_in_force(auth_client, new_investment_type):
+    client, user = auth_client
+    investment_id = client.post('/api/investments', json={
+        'name': 'Savings', 'amount': 100, 'date': '2024-01-01', 'investment_type_id': new_investment_type.id,
+    }).json['id']
+    _record_daily_values(investment_id, user.id, [(date(2024, 1, 10), 150), (date(2024, 1, 20), 160)])
+
+    unchanged = client.get(f'/api/investments/{investment_id}/history?start_date=2024-01-21&end_date=2024-01-31')
+    assert unchanged.json['series'] == [{'period': '2024-01-21', 'value': 160.0}]
+
+    months = client.get(f'/api/investments/{investment_id}/history?resolution=month&start_date=2024-02-01').json['series']
+    assert months == [{'period': '2024-02', 'value': 160.0}]
+
+    # Replaced by a valuation in the window's first bucket
+    weeks = client.get(f'/api/investments/{investment_id}/history?resolution=week&start_date=2024-01-09').json['series']
+    assert weeks == [{'period': '2024-01-09', 'value': 150.0}, {'period': '2024-01-15', 'value': 160.0}]
+
+    before_any = client.get(f'/api/investments/{investment_id}/history?end_date=2023-12-31').json['series']
+    assert before_any == []
+
+
+def test_history_validation(auth_client, new_investment):
+    client, user = auth_client
+    investment_id = new_investment.id
+
+    assert client.get(f'/api/investments/{investment_id}/history?resolution=year').status_code == HTTPStatus.BAD_REQUEST
+    assert client.get(f'/api/investments/{investment_id}/history?start_date=bogus').status_code == HTTPStatus.BAD_REQUEST
+    assert client.get('/api/investments/999999/history').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_deleting_investment_purges_valuations(auth_client, new_investment):
+    client, user = auth_client
+    investment_id = new_investment.id
+
+    assert client.delete(f'/api/investments/{investment_id}').status_code == HTTPStatus.OK
+    assert _valuations(investment_id) == []
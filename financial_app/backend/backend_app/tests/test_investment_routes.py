@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from src.models.user import db
 
 def test_add_investment(auth_client, new_investment_type):
     client, user = auth_client
@@ -17,6 +18,27 @@ def test_get_investments(auth_client, new_investment):
     assert len(response.json) == 1
     assert response.json[0]['id'] == new_investment.id
 
+def test_get_investments_query_count_is_constant(auth_client, count_queries):
+    client, user = auth_client
+    investment_types = [client.post('/api/investment-types', json={'name': f'Type {i}'}).json for i in range(4)]
+    for i in range(12):
+        client.post('/api/investments', json={
+            'name': f'Investment {i}',
+            'amount': 100.0 + i,
+            'investment_type_id': investment_types[i % 4]['id']
+        })
+    # Drop the identity map so relationship loads cannot be served from it
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/investments')
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json) == 12
+    assert all(i['investment_type']['name'].startswith('Type') for i in response.json)
+    # ETag version lookup plus one query
+    assert len(statements) == 2
+
 def test_get_single_investment(auth_client, new_investment):
     client, user = auth_client
     response = client.get(f'/api/investments/{new_investment.id}')
@@ -63,6 +85,44 @@ def test_get_investment_summary(auth_client, new_investment_type):
     assert summary['total_current_value'] == 360.0
     assert summary['total_profit_loss'] == 10.0
 
+def test_get_investment_summary_by_type(auth_client, count_queries):
+    client, user = auth_client
+    stocks = client.post('/api/investment-types', json={'name': 'Stocks'}).json
+    bonds = client.post('/api/investment-types', json={'name': 'Bonds'}).json
+    client.post('/api/investments', json={'name': 'Stock A', 'amount': 100.0, 'current_value': 120.0, 'investment_type_id': stocks['id']})
+    client.post('/api/investments', json={'name': 'Stock B', 'amount': 200.0, 'current_value': 180.0, 'investment_type_id': stocks['id']})
+    client.post('/api/investments', json={'name': 'Bond C', 'amount': 50.0, 'current_value': 60.0, 'investment_type_id': bonds['id']})
+
+    with count_queries() as statements:
+        response = client.get('/api/investments/summary?group_by=investment_type')
+
+    assert response.status_code == HTTPStatus.OK
+    # ETag version lookup plus one query
+    assert len(statements) == 2
+    summary = response.json
+    assert summary['investment_count'] == 3
+    assert summary['total_invested'] == 350.0
+    assert summary['total_current_value'] == 360.0
+    assert summary['total_profit_loss'] == 10.0
+    assert [group['investment_type_name'] for group in summary['by_investment_type']] == ['Bonds', 'Stocks']
+    assert summary['by_investment_type'][0] == {
+        'investment_type_id': bonds['id'], 'investment_type_name': 'Bonds', 'total_invested': 50.0,
+        'total_current_value': 60.0, 'total_profit_loss': 10.0, 'total_profit_loss_percentage': 20.0, 'investment_count': 1
+    }
+    assert summary['by_investment_type'][1]['total_invested'] == 300.0
+    assert summary['by_investment_type'][1]['investment_count'] == 2
+
+def test_get_investment_summary_empty(auth_client):
+    client, user = auth_client
+    response = client.get('/api/investments/summary?group_by=investment_type')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['investment_count'] == 0
+    assert response.json['total_profit_loss_percentage'] == 0
+    assert response.json['by_investment_type'] == []
+
+    response = client.get('/api/investments/summary?group_by=date')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
 def test_add_investment_unauthenticated(client):
     response = client.post('/api/investments', json={
         'name': 'Unauthorized Investment',
@@ -0,0 +1,125 @@
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from src.models.user import db
+from src.models.investment import Investment
+from src.models.investment_movement import InvestmentMovement, InvestmentSnapshot
+from src.models.goal_movement import GoalMovement, GoalSnapshot
+from src.ledger import investment_ledger, goal_ledger
+
+
+def _movements(model, **owner):
+    return [(m.kind, m.amount, m.sequence) for m in model.query.filter_by(**owner).order_by(model.sequence)]
+
+
+def test_investment_ledger_records_every_balance_change(auth_client, new_investment):
+    client, user = auth_client
+    investment_id = new_investment.id
+
+    assert client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 200}).status_code == HTTPStatus.OK
+    assert client.post(f'/api/investments/{investment_id}/withdraw', json={'amount': 50}).status_code == HTTPStatus.OK
+    assert client.post(f'/api/investments/{investment_id}/withdraw', json={'amount': 5000}).status_code == HTTPStatus.BAD_REQUEST
+    assert client.put(f'/api/investments/{investment_id}', json={'current_value': 1000}).status_code == HTTPStatus.OK
+
+    assert _movements(InvestmentMovement, investment_id=investment_id) == [
+        ('opening', 1000.0, 1),
+        ('contribution', 200.0, 2),
+        ('withdrawal', -50.0, 3),
+        ('adjustment', -150.0, 4),
+    ]
+    investment = db.session.get(Investment, investment_id)
+    assert investment.movement_count == 4
+    assert sum(m.amount for m in investment_ledger.history(db.session, investment_id)) == investment.current_value
+
+
+def test_goal_ledger_records_contributions(auth_client, new_goal):
+    client, user = auth_client
+    goal_id = new_goal.id
+
+    client.post(f'/api/goals/{goal_id}/contribute', json={'amount': 100})
+    client.post(f'/api/goals/{goal_id}/contribute', json={'amount': 25})
+
+    assert _movements(GoalMovement, goal_id=goal_id) == [
+        ('opening', 0.0, 1),
+        ('contribution', 100.0, 2),
+        ('contribution', 25.0, 3),
+    ]
+
+
+def test_snapshots_every_interval(app, auth_client, new_investment):
+    client, user = auth_client
+    app.config['LEDGER_SNAPSHOT_INTERVAL'] = 3
+    investment_id = new_investment.id
+
+    for _ in range(6):
+        client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 10})
+
+    snapshots = InvestmentSnapshot.query.filter_by(investment_id=investment_id).order_by(InvestmentSnapshot.sequence).all()
+    assert [(s.sequence, s.balance) for s in snapshots] == [(3, 1020.0), (6, 1050.0)]
+
+
+def test_balance_at_reads_snapshot_plus_tail(app, auth_client, new_investment):
+    client, user = auth_client
+    app.config['LEDGER_SNAPSHOT_INTERVAL'] = 2
+    investment_id = new_investment.id
+    start = datetime(2024, 1, 1)
+    balance = 0.0
+    expected = {}
+    for day in range(1, 8):
+        balance += day
+        investment_ledger.record(db.session, investment_id, user.id, 'contribution', day, day + 1, balance,
+                                 occurred_at=start + timedelta(days=day))
+        expected[day] = balance
+    db.session.commit()
+    # The fixture's opening movement happened today, after every movement above
+
+    for day, balance in expected.items():
+        assert investment_ledger.balance_at(db.session, investment_id, start + timedelta(days=day, hours=1)) == balance
+    assert investment_ledger.balance_at(db.session, investment_id, start) == 0
+
+
+def test_balance_endpoints(auth_client, new_investment, new_goal):
+    client, user = auth_client
+    investment_id, goal_id = new_investment.id, new_goal.id
+    client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 500})
+    client.post(f'/api/goals/{goal_id}/contribute', json={'amount': 40})
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    response = client.get(f'/api/investments/{investment_id}/balance')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {'investment_id': investment_id, 'at': None, 'balance': 1500.0}
+    assert client.get(f'/api/investments/{investment_id}/balance?at={date.today().isoformat()}').json['balance'] == 1500.0
+    assert client.get(f'/api/investments/{investment_id}/balance?at={yesterday}').json['balance'] == 0
+    assert client.get(f'/api/goals/{goal_id}/balance').json['balance'] == 40.0
+    assert client.get(f'/api/goals/{goal_id}/balance?at={yesterday}').json['balance'] == 0
+
+    assert client.get(f'/api/investments/{investment_id}/balance?at=bogus').status_code == HTTPStatus.BAD_REQUEST
+    assert client.get('/api/investments/999999/balance').status_code == HTTPStatus.NOT_FOUND
+    assert client.get('/api/goals/999999/balance').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_opening_uses_investment_date(auth_client, new_investment_type):
+    client, user = auth_client
+    response = client.post('/api/investments', json={
+        'name': 'Old fund', 'amount': 300, 'date': '2023-06-01',
+        'investment_type_id': new_investment_type.id,
+    })
+    investment_id = response.json['id']
+
+    assert client.get(f'/api/investments/{investment_id}/balance?at=2023-05-31').json['balance'] == 0
+    assert client.get(f'/api/investments/{investment_id}/balance?at=2023-06-01').json['balance'] == 300.0
+
+
+def test_deleting_owner_purges_ledger(app, auth_client, new_investment, new_goal):
+    client, user = auth_client
+    app.config['LEDGER_SNAPSHOT_INTERVAL'] = 1
+    investment_id, goal_id = new_investment.id, new_goal.id
+    client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 10})
+    client.post(f'/api/goals/{goal_id}/contribute', json={'amount': 10})
+
+    assert client.delete(f'/api/investments/{investment_id}').status_code == HTTPStatus.OK
+    assert client.delete(f'/api/goals/{goal_id}').status_code == HTTPStatus.OK
+
+    assert InvestmentMovement.query.filter_by(investment_id=investment_id).count() == 0
+    assert InvestmentSnapshot.query.filter_by(investment_id=investment_id).count() == 0
+    assert GoalMovement.query.filter_by(goal_id=goal_id).count() == 0
+    assert GoalSnapshot.query.filter_by(goal_id=goal_id).count() == 0
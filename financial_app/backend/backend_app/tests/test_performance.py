@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+import numpy as np
+import pytest
+from src.models.user import db
+from src.models.investment import Investment
+from src.models.investment_type import InvestmentType
+from src.ledger import investment_ledger
+from src.performance import time_weighted_returns, money_weighted_returns
+
+
+def test_time_weighted_return_ignores_cash_flows():
+    # Open 100, +10% to 110, contribute 100, -10% to 189
+    amounts = np.array([100.0, 10.0, 100.0, -21.0])
+    is_flow = np.array([True, False, True, False])
+    groups = np.zeros(4, dtype=np.int64)
+
+    assert time_weighted_returns(groups, amounts, is_flow, 1)[0] == pytest.approx(1.1 * 0.9 - 1)
+
+
+def test_time_weighted_return_per_group():
+    groups = np.array([0, 0, 1, 1, 1])
+    amounts = np.array([100.0, 50.0, 200.0, -100.0, 0.0])
+    is_flow = np.array([True, False, True, False, False])
+
+    assert time_weighted_returns(groups, amounts, is_flow, 2) == pytest.approx([0.5, -0.5])
+
+
+def test_money_weighted_return_solves_several_groups_at_once():
+    # Group 0: 1000 in at t=0 and t=1, 2310 out at t=2 is 10% a year
+    # Group 1: 100 in, 80 back a year later is -20%
+    # Group 2: only money in, no solution
+    groups = np.array([0, 0, 0, 1, 1, 2])
+    cash_flows = np.array([-1000.0, -1000.0, 2310.0, -100.0, 80.0, -50.0])
+    years = np.array([0.0, 1.0, 2.0, 0.0, 1.0, 0.0])
+
+    rates = money_weighted_returns(groups, cash_flows, years, 3)
+
+    assert rates[:2] == pytest.approx([0.10, -0.20])
+    assert np.isnan(rates[2])
+
+
+def test_money_weighted_return_matches_npv_for_many_flows():
+    rng = np.random.default_rng(7)
+    groups = np.repeat(np.arange(300), 40)
+    years = np.tile(np.linspace(0, 10, 40), 300)
+    cash_flows = -rng.uniform(10, 100, len(groups))
+    cash_flows[39::40] = rng.uniform(2000, 8000, 300)
+
+    rates = money_weighted_returns(groups, cash_flows, years, 300)
+
+    assert not np.isnan(rates).any()
+    npv = np.bincount(groups, weights=cash_flows * (1 + rates[groups]) ** -years)
+    assert np.abs(npv).max() < 1e-6
+
+
+def _investment(user_id, type_name, value, opened):
+    investment_type = InvestmentType(name=type_name, user_id=user_id)
+    db.session.add(investment_type)
+    db.session.flush()
+    investment = Investment(name=f'{type_name} fund', amount=value, date=opened,
+                            investment_type_id=investment_type.id, user_id=user_id)
+    db.session.add(investment)
+    db.session.commit()
+    return investment.id, investment_type.id
+
+
+def test_performance_endpoint(auth_client):
+    client, user = auth_client
+    opened = date(2020, 1, 1)
+    stocks_id, stocks_type_id = _investment(user.id, 'Stocks', 1000.0, opened)
+    bonds_id, bonds_type_id = _investment(user.id, 'Bonds', 500.0, opened)
+    # Stocks gain 10% just before the 365th day closes
+    investment_ledger.record(db.session, stocks_id, user.id, 'adjustment', 100.0, 2, 1100.0,
+                             occurred_at=datetime(2020, 12, 30, 12))
+    db.session.commit()
+    at = (opened + timedelta(days=364)).isoformat()
+
+    response = client.get(f'/api/investments/performance?at={at}')
+
+    assert response.status_code == HTTPStatus.OK
+    portfolio = response.json['portfolio']
+    assert portfolio['current_value'] == 1600.0
+    assert portfolio['net_contributions'] == 1500.0
+    assert portfolio['twr_percentage'] == pytest.approx(100 / 15)
+    assert portfolio['xirr_percentage'] == pytest.approx(100 / 15)
+
+    by_type = {row['investment_type_id']: row for row in response.json['by_investment_type']}
+    assert by_type[stocks_type_id]['twr_percentage'] == pytest.approx(10)
+    assert by_type[stocks_type_id]['xirr_percentage'] == pytest.approx(10)
+    assert by_type[bonds_type_id]['investment_type_name'] == 'Bonds'
+    assert by_type[bonds_type_id]['xirr_percentage'] == pytest.approx(0)
+
+    investments = {row['investment_id']: row for row in response.json['investments']}
+    assert investments[stocks_id]['twr_percentage'] == pytest.approx(10)
+    assert investments[bonds_id]['current_value'] == 500.0
+
+
+def test_performance_revalidates_with_etag(auth_client, new_investment):
+    client, user = auth_client
+    first = client.get('/api/investments/performance')
+    assert first.headers['ETag']
+
+    unchanged = client.get('/api/investments/performance', headers={'If-None-Match': first.headers['ETag']})
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+
+    client.post(f'/api/investments/{new_investment.id}/contribute', json={'amount': 10})
+    changed = client.get('/api/investments/performance', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == HTTPStatus.OK
+
+
+def test_performance_before_any_movement(auth_client, new_investment):
+    client, user = auth_client
+
+    response = client.get('/api/investments/performance?at=2000-01-01')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['portfolio'] == {
+        'current_value': 0.0, 'net_contributions': 0.0, 'twr_percentage': 0.0, 'xirr_percentage': None,
+    }
+    assert response.json['investments'][0]['xirr_percentage'] is None
+
+
+def test_performance_counts_contributions_as_cash_flows(auth_client, new_investment):
+    client, user = auth_client
+    investment_id = new_investment.id
+    client.post(f'/api/investments/{investment_id}/contribute', json={'amount': 500})
+    client.post(f'/api/investments/{investment_id}/withdraw', json={'amount': 200})
+
+    row = client.get('/api/investments/performance').json['investments'][0]
+
+    assert row['net_contributions'] == 1300.0
+    assert row['twr_percentage'] == 0.0
+
+
+def test_performance_rejects_invalid_date(auth_client):
+    client, user = auth_client
+    assert client.get('/api/investments/performance?at=bogus').status_code == HTTPStatus.BAD_REQUEST
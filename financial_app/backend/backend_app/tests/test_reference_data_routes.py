@@ -0,0 +1,62 @@
+from http import HTTPStatus
+from src.models.user import db
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.models.investment_type import InvestmentType
+
+
+def test_get_reference_data(auth_client):
+    client, user = auth_client
+    db.session.add_all([
+        Category(name='Salary', category_type='income', user_id=user.id),
+        Category(name='Rent', category_type='expense', user_id=user.id),
+        Category(name='Food', category_type='expense', user_id=user.id),
+        Category(name='Elsewhere', category_type='expense', user_id=user.id + 1),
+        PaymentMethod(name='PIX', user_id=user.id),
+        InvestmentType(name='Stocks', user_id=user.id),
+    ])
+    db.session.commit()
+
+    response = client.get('/api/reference-data')
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json
+    assert [c['name'] for c in data['categories']['income']] == ['Salary']
+    assert [c['name'] for c in data['categories']['expense']] == ['Food', 'Rent']
+    assert [p['name'] for p in data['payment_methods']] == ['PIX']
+    assert [t['name'] for t in data['investment_types']] == ['Stocks']
+
+
+def test_get_reference_data_empty(auth_client):
+    client, user = auth_client
+    response = client.get('/api/reference-data')
+    assert response.json == {
+        'categories': {'income': [], 'expense': []},
+        'payment_methods': [],
+        'investment_types': [],
+    }
+
+
+def test_reference_data_etag_tracks_all_three_lists(auth_client, count_queries):
+    client, user = auth_client
+    etag = client.get('/api/reference-data').headers['ETag']
+
+    with count_queries() as statements:
+        response = client.get('/api/reference-data', headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert len(statements) == 1
+
+    for path, payload in [
+        ('/api/categories', {'name': 'Food', 'category_type': 'expense'}),
+        ('/api/payment-methods', {'name': 'PIX'}),
+        ('/api/investment-types', {'name': 'Stocks'}),
+    ]:
+        client.post(path, json=payload)
+        response = client.get('/api/reference-data', headers={'If-None-Match': etag})
+        assert response.status_code == HTTPStatus.OK
+        etag = response.headers['ETag']
+
+
+def test_get_reference_data_unauthorized(client):
+    response = client.get('/api/reference-data')
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
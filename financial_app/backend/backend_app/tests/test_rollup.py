@@ -0,0 +1,121 @@
+from datetime import date
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.monthly_rollup import MonthlyRollup
+import pytest
+from sqlalchemy.exc import IntegrityError
+from src.rollup import rebuild_monthly_rollup, apply_rollup_deltas
+
+
+def _rollup_snapshot(user_id):
+    rows = MonthlyRollup.query.filter_by(user_id=user_id).all()
+    return sorted(
+        (r.year_month, r.category_id, r.payment_method_id, r.transaction_type, round(r.total, 6), r.count)
+        for r in rows
+    )
+
+
+def _post(client, **payload):
+    response = client.post('/api/transactions', json=payload)
+    assert response.status_code == 201
+    return response.json
+
+
+def test_rollup_tracks_create_update_delete(auth_client):
+    client, user = auth_client
+    food = client.post('/api/categories', json={'name': 'Food', 'category_type': 'expense'}).json
+    salary = client.post('/api/categories', json={'name': 'Salary', 'category_type': 'income'}).json
+    pix = client.post('/api/payment-methods', json={'name': 'PIX'}).json
+    cash = client.post('/api/payment-methods', json={'name': 'Cash'}).json
+
+    lunch = _post(client, description='Lunch', amount=20.0, date='2024-01-10', transaction_type='expense', category_id=food['id'], payment_method_id=pix['id'])
+    _post(client, description='Dinner', amount=30.0, date='2024-01-11', transaction_type='expense', category_id=food['id'], payment_method_id=pix['id'])
+    pay = _post(client, description='Pay', amount=1000.0, date='2024-01-05', transaction_type='income', category_id=salary['id'])
+
+    assert _rollup_snapshot(user.id) == [
+        ('2024-01', food['id'], pix['id'], 'expense', 50.0, 2),
+        ('2024-01', salary['id'], None, 'income', 1000.0, 1),
+    ]
+
+    # Moving a transaction to another month and payment method moves its contribution
+    client.put(f"/api/transactions/{lunch['id']}", json={'date': '2024-02-01', 'payment_method_id': cash['id'], 'amount': 25.0})
+    client.delete(f"/api/transactions/{pay['id']}")
+
+    assert _rollup_snapshot(user.id) == [
+        ('2024-01', food['id'], pix['id'], 'expense', 30.0, 1),
+        ('2024-02', food['id'], cash['id'], 'expense', 25.0, 1),
+    ]
+
+    expected = _rollup_snapshot(user.id)
+    rebuild_monthly_rollup(user.id)
+    assert _rollup_snapshot(user.id) == expected
+
+
+def test_rollup_tracks_direct_orm_writes(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    transaction = Transaction(
+        description='Direct', amount=12.5, date=date(2023, 7, 3), transaction_type='expense',
+        category_id=new_category.id, payment_method_id=new_payment_method.id, user_id=user.id
+    )
+    db.session.add(transaction)
+    db.session.commit()
+    assert _rollup_snapshot(user.id) == [('2023-07', new_category.id, new_payment_method.id, 'expense', 12.5, 1)]
+
+    # Setting an attribute on an expired instance: the old value comes from the database
+    transaction.amount = 20.0
+    db.session.commit()
+    assert _rollup_snapshot(user.id) == [('2023-07', new_category.id, new_payment_method.id, 'expense', 20.0, 1)]
+
+    db.session.delete(transaction)
+    db.session.commit()
+    assert _rollup_snapshot(user.id) == []
+
+
+def test_summary_reads_rollup_for_whole_months(auth_client, new_category, new_payment_method, count_queries):
+    client, user = auth_client
+    _post(client, description='A', amount=10.0, date='2024-03-01', transaction_type='expense', category_id=new_category.id, payment_method_id=new_payment_method.id)
+    _post(client, description='B', amount=15.0, date='2024-03-20', transaction_type='expense', category_id=new_category.id, payment_method_id=new_payment_method.id)
+
+    with count_queries() as statements:
+        response = client.get('/api/transactions/summary?year=2024&month=3')
+    assert response.json['total_expense'] == 25.0
+    assert response.json['transaction_count'] == 2
+    # ETag version lookup, then the rollup query
+    assert len(statements) == 2 and 'monthly_rollup' in statements[1]
+
+    # Arbitrary day ranges still come from the transaction table
+    with count_queries() as statements:
+        response = client.get('/api/transactions/summary?start_date=2024-03-10&end_date=2024-03-31')
+    assert response.json['total_expense'] == 15.0
+    assert 'monthly_rollup' not in statements[1]
+
+
+def test_rebuild_monthly_rollup_from_scratch(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    _post(client, description='A', amount=10.0, date='2024-03-01', transaction_type='expense', category_id=new_category.id, payment_method_id=new_payment_method.id)
+    _post(client, description='B', amount=5.0, date='2024-04-01', transaction_type='income', category_id=new_category.id)
+    expected = _rollup_snapshot(user.id)
+
+    MonthlyRollup.query.delete()
+    db.session.commit()
+    assert _rollup_snapshot(user.id) == []
+
+    rebuild_monthly_rollup()
+    assert _rollup_snapshot(user.id) == expected
+
+
+def test_rollup_key_is_unique_even_without_payment_method(auth_client, new_category):
+    client, user = auth_client
+    key = (user.id, '2024-03', new_category.id, None, 'expense')
+
+    # Two writers that both miss the row still land on one
+    apply_rollup_deltas(db.session.connection(), {key: (10.0, 1)})
+    apply_rollup_deltas(db.session.connection(), {key: (5.0, 1)})
+    db.session.commit()
+    assert _rollup_snapshot(user.id) == [('2024-03', new_category.id, None, 'expense', 15.0, 2)]
+
+    db.session.add(MonthlyRollup(user_id=user.id, year_month='2024-03', category_id=new_category.id,
+                                 payment_method_id=None, transaction_type='expense', total=1.0, count=1))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from http import HTTPStatus
+import pytest
+from sqlalchemy import select, text
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.investment import Investment
+from src.models.goal import Goal
+from src.models.tombstone import Tombstone
+from src.models.timestamps import utcnow
+from src.sync import encode_sync_cursor, prune_tombstones
+
+RESOURCE_KEYS = {'categories', 'payment_methods', 'investment_types', 'transactions', 'investments', 'goals'}
+
+
+@pytest.fixture(autouse=True)
+def no_cursor_overlap(app):
+    app.config['SYNC_CURSOR_OVERLAP_SECONDS'] = 0
+
+
+def test_sync_without_cursor_returns_full_snapshot(auth_client, new_transaction, new_investment, new_goal):
+    client, user = auth_client
+
+    response = client.get('/api/sync')
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json
+    assert data['full'] is True
+    assert data['cursor']
+    assert set(data['changes']) == RESOURCE_KEYS
+    assert [t['id'] for t in data['changes']['transactions']] == [new_transaction.id]
+    assert data['changes']['transactions'][0]['category_name'] == 'Test Category'
+    assert data['changes']['investments'][0]['investment_type']['name'] == 'Test Investment Type'
+    assert [g['id'] for g in data['changes']['goals']] == [new_goal.id]
+    assert all(ids == [] for ids in data['deleted'].values())
+
+
+def test_sync_since_cursor_returns_only_changes(auth_client, new_transaction, new_goal):
+    client, user = auth_client
+    cursor = client.get('/api/sync').json['cursor']
+
+    client.put(f'/api/goals/{new_goal.id}', json={'name': 'Renamed Goal'})
+    created = client.post('/api/categories', json={'name': 'Travel'}).json
+    client.delete(f'/api/transactions/{new_transaction.id}')
+
+    data = client.get(f'/api/sync?since={cursor}').json
+
+    assert data['full'] is False
+    assert [g['name'] for g in data['changes']['goals']] == ['Renamed Goal']
+    assert [c['id'] for c in data['changes']['categories']] == [created['id']]
+    assert data['changes']['transactions'] == []
+    assert data['deleted']['transactions'] == [new_transaction.id]
+
+    # Nothing happened since the cursor just issued
+    quiet = client.get(f"/api/sync?since={data['cursor']}").json
+    assert all(rows == [] for rows in quiet['changes'].values())
+    assert all(ids == [] for ids in quiet['deleted'].values())
+
+
+def test_sync_resends_rows_embedding_a_renamed_reference(auth_client, new_transaction, new_investment):
+    client, user = auth_client
+    cursor = client.get('/api/sync').json['cursor']
+
+    client.put(f'/api/categories/{new_transaction.category_id}', json={'name': 'Groceries'})
+    client.put(f'/api/investment-types/{new_investment.investment_type_id}', json={'name': 'Bonds'})
+
+    data = client.get(f'/api/sync?since={cursor}').json
+
+    assert [t['category_name'] for t in data['changes']['transactions']] == ['Groceries']
+    assert [i['investment_type']['name'] for i in data['changes']['investments']] == ['Bonds']
+    assert data['changes']['goals'] == []
+
+
+def test_sync_records_batch_deletes(auth_client, new_transaction):
+    client, user = auth_client
+    transaction_id = new_transaction.id
+    cursor = client.get('/api/sync').json['cursor']
+
+    client.post('/api/transactions/batch', json={'operations': [
+        {'op': 'update', 'id': transaction_id, 'data': {'description': 'Edited'}},
+    ]})
+    first = client.get(f'/api/sync?since={cursor}').json
+    assert [t['description'] for t in first['changes']['transactions']] == ['Edited']
+
+    client.post('/api/transactions/batch', json={'operations': [{'op': 'delete', 'id': transaction_id}]})
+    second = client.get(f"/api/sync?since={first['cursor']}").json
+    assert second['deleted']['transactions'] == [transaction_id]
+
+
+def test_sync_is_scoped_to_user(auth_client, new_goal):
+    client, user = auth_client
+    cursor = client.get('/api/sync').json['cursor']
+    db.session.add(Goal(name='Not mine', target_amount=10.0, user_id=user.id + 1))
+    db.session.commit()
+
+    data = client.get(f'/api/sync?since={cursor}').json
+
+    assert data['changes']['goals'] == []
+
+
+def test_sync_expired_cursor_falls_back_to_full_snapshot(app, auth_client, new_goal):
+    client, user = auth_client
+    stale = encode_sync_cursor(utcnow() - timedelta(days=app.config['SYNC_TOMBSTONE_RETENTION_DAYS'] + 1))
+
+    data = client.get(f'/api/sync?since={stale}').json
+
+    assert data['full'] is True
+    assert [g['id'] for g in data['changes']['goals']] == [new_goal.id]
+
+
+def test_sync_rejects_invalid_cursor(auth_client):
+    client, user = auth_client
+    response = client.get('/api/sync?since=not-a-cursor')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_sync_revalidates_with_etag(auth_client, new_goal):
+    client, user = auth_client
+    cursor = client.get('/api/sync').json['cursor']
+    first = client.get(f'/api/sync?since={cursor}')
+
+    unchanged = client.get(f'/api/sync?since={cursor}', headers={'If-None-Match': first.headers['ETag']})
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+
+    client.put(f'/api/goals/{new_goal.id}', json={'name': 'Changed'})
+    changed = client.get(f'/api/sync?since={cursor}', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == HTTPStatus.OK
+
+
+def test_prune_tombstones(auth_client, new_goal):
+    client, user = auth_client
+    client.delete(f'/api/goals/{new_goal.id}')
+    assert Tombstone.query.filter_by(user_id=user.id, resource='goals').count() == 1
+
+    assert prune_tombstones(db.session, utcnow() - timedelta(days=1)) == 0
+    assert prune_tombstones(db.session, utcnow() + timedelta(seconds=1)) == 1
+    db.session.commit()
+    assert Tombstone.query.count() == 0
+
+
+@pytest.mark.parametrize("model, index_name", [
+    (Transaction, 'ix_transaction_user_id_updated_at'),
+    (Investment, 'ix_investment_user_id_updated_at'),
+    (Goal, 'ix_goal_user_id_updated_at'),
+])
+def test_delta_queries_use_user_updated_at_index(app, model, index_name):
+    query = select(model).where(model.user_id == 1, model.updated_at >= utcnow())
+    sql = query.compile(db.engine, compile_kwargs={'literal_binds': True})
+    plan = ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')))
+    assert index_name in plan
@@ -0,0 +1,316 @@
+import io
+import json
+import pytest
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.category import Category
+from src.models.payment_method import PaymentMethod
+from src.importer import TransactionImporter
+
+
+@pytest.fixture
+def statement_refs(auth_client):
+    client, user = auth_client
+    food = Category(name='Food', category_type='expense', user_id=user.id)
+    salary = Category(name='Salary', category_type='income', user_id=user.id)
+    card = PaymentMethod(name='Credit Card', user_id=user.id)
+    db.session.add_all([food, salary, card])
+    db.session.commit()
+    return food, salary, card
+
+
+def _import(client, content, filename='statement.csv', **form):
+    data = {'file': (io.BytesIO(content.encode() if isinstance(content, str) else content), filename)}
+    data.update(form)
+    response = client.post('/api/transactions/import', data=data, content_type='multipart/form-data')
+    if response.mimetype != 'application/x-ndjson':
+        return response, None
+    return response, [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_import_csv(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+    csv_text = (
+        "date,description,amount,category,payment_method,notes\n"
+        "2024-01-05,Supermarket,-120.50,food,credit  card,weekly\n"
+        "2024-01-06,Paycheck,3000,Salary,,\n"
+    )
+
+    response, events = _import(client, csv_text)
+
+    assert response.status_code == 200
+    assert events[-1] == {'event': 'done', 'rows_processed': 2, 'imported': 2, 'skipped': 0, 'failed': 0}
+    rows = Transaction.query.filter_by(user_id=user.id).order_by(Transaction.date).all()
+    assert [(t.description, t.amount, t.transaction_type, t.category_id, t.payment_method_id) for t in rows] == [
+        ('Supermarket', 120.5, 'expense', food.id, card.id),
+        ('Paycheck', 3000.0, 'income', salary.id, None),
+    ]
+    assert rows[0].notes == 'weekly'
+    summary = client.get('/api/transactions/summary?year=2024&month=1').json
+    assert summary['total_expense'] == 120.5 and summary['total_income'] == 3000.0
+
+
+def test_import_reports_row_errors_and_keeps_valid_rows(auth_client, statement_refs):
+    client, user = auth_client
+    csv_text = (
+        "date,description,amount,category,payment_method\n"
+        "2024-01-05,Ok,-10,Food,Credit Card\n"
+        "05/01/2024,Bad date,-10,Food,Credit Card\n"
+        "2024-01-05,Bad amount,abc,Food,Credit Card\n"
+        "2024-01-05,Unknown,-10,Travel,Credit Card\n"
+        "\n"
+        "2024-01-05,No method,-10,Food,\n"
+    )
+
+    response, events = _import(client, csv_text)
+
+    errors = [e for e in events if e['event'] == 'error']
+    assert [(e['row'], e['message']) for e in errors] == [
+        (3, "Invalid date '05/01/2024'. Expected format %Y-%m-%d"),
+        (4, "Invalid amount 'abc'"),
+        (5, "Category 'Travel' not found"),
+        (7, 'Payment method is required for expense transactions'),
+    ]
+    assert events[-1] == {'event': 'done', 'rows_processed': 5, 'imported': 1, 'skipped': 0, 'failed': 4}
+    assert Transaction.query.filter_by(user_id=user.id).count() == 1
+
+
+def test_import_with_mapping_and_locale_options(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+    csv_text = "﻿Data;Histórico;Valor\n05/01/2024;Padaria;-1.234,56\n"
+
+    response, events = _import(
+        client, csv_text,
+        mapping=json.dumps({'date': 'Data', 'description': 'Histórico', 'amount': 'Valor'}),
+        delimiter=';', decimal_separator=',', date_format='%d/%m/%Y',
+        default_category_id=str(food.id), default_payment_method_id=str(card.id),
+    )
+
+    assert events[-1]['imported'] == 1
+    transaction = Transaction.query.filter_by(user_id=user.id).one()
+    assert transaction.amount == 1234.56
+    assert transaction.date.isoformat() == '2024-01-05'
+    assert transaction.category_id == food.id and transaction.payment_method_id == card.id
+
+
+def test_import_inserts_in_batches(app, auth_client, statement_refs, count_queries):
+    client, user = auth_client
+    app.config['IMPORT_BATCH_SIZE'] = 10
+    lines = ["date,description,amount,category,payment_method"]
+    lines += [f"2024-02-{i % 28 + 1:02d},Row {i},-{i + 1},Food,Credit Card" for i in range(25)]
+
+    with count_queries() as statements:
+        response, events = _import(client, "\n".join(lines))
+
+    assert [e['event'] for e in events] == ['progress', 'progress', 'progress', 'done']
+    assert [e['imported'] for e in events] == [10, 20, 25, 25]
+    assert len([s for s in statements if s.startswith('INSERT INTO "transaction"')]) == 3
+    # Names are resolved from one lookup per table, not one per row
+    assert len([s for s in statements if 'FROM category' in s]) == 1
+    assert len([s for s in statements if 'FROM payment_method' in s]) == 1
+
+
+@pytest.mark.parametrize('content, form, message', [
+    ('', {}, 'CSV file is empty'),
+    ('date,amount\n2024-01-01,5\n', {}, 'Missing required column(s): description'),
+    ('date,description,amount\n', {'mapping': '[1]'}, 'Invalid mapping. Must be a JSON object'),
+    ('date,description,amount\n', {'delimiter': ';;'}, 'Invalid delimiter. Must be a single character'),
+    ('date,description,amount\n', {'decimal_separator': 'x'}, "Invalid decimal separator. Must be '.' or ','"),
+    (b'\xff\xfe\x00d', {}, 'File must be UTF-8 encoded'),
+])
+def test_import_rejects_bad_requests(auth_client, content, form, message):
+    client, user = auth_client
+    response, events = _import(client, content, **form)
+    assert response.status_code == 400
+    assert response.json['message'] == message
+
+
+def test_import_requires_file(auth_client):
+    client, user = auth_client
+    response = client.post('/api/transactions/import', data={}, content_type='multipart/form-data')
+    assert response.status_code == 400
+    assert response.json['message'] == 'File is required'
+
+
+def test_import_default_category_must_belong_to_user(auth_client):
+    client, user = auth_client
+    other = Category(name='Theirs', category_type='expense', user_id=user.id + 1)
+    db.session.add(other)
+    db.session.commit()
+
+    response, events = _import(client, 'date,description,amount\n', default_category_id=str(other.id))
+
+    assert response.status_code == 404
+    assert response.json['message'] == 'Category not found or does not belong to user'
+
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+CHARSET:1252
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240105120000[-3:BRT]
+<TRNAMT>-42,50
+<FITID>1
+<NAME>Padaria Pão &amp; Cia
+<MEMO>Cartão final 1234
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240106<TRNAMT>3000.00<FITID>2<MEMO>Salary</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+QIF = """!Type:Bank
+D1/ 5'24
+T-1,042.50
+PRent
+LFood
+^
+D01/06/2024
+T3,000.00
+PPaycheck
+MJanuary
+LUnknown:Sub
+^
+"""
+
+
+def test_import_ofx(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+
+    response, events = _import(
+        client, OFX_SGML.encode('cp1252'), filename='extrato.ofx',
+        default_category_id=str(food.id), default_payment_method_id=str(card.id),
+    )
+
+    assert events[-1]['event'] == 'done' and events[-1]['imported'] == 2
+    rows = Transaction.query.filter_by(user_id=user.id).order_by(Transaction.date).all()
+    assert [(t.date.isoformat(), t.description, t.amount, t.transaction_type) for t in rows] == [
+        ('2024-01-05', 'Padaria P\xe3o &amp; Cia', 42.5, 'expense'),
+        ('2024-01-06', 'Salary', 3000.0, 'income'),
+    ]
+    assert rows[0].notes == 'Cart\xe3o final 1234'
+
+
+def test_import_ofx_xml_split_across_chunks(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+    body = "".join(
+        f"<STMTTRN><DTPOSTED>202401{i % 28 + 1:02d}</DTPOSTED><TRNAMT>-{i + 1}.00</TRNAMT><NAME>Item {i}</NAME></STMTTRN>"
+        for i in range(3000)
+    )
+    xml = f'<?xml version="1.0" encoding="UTF-8"?><OFX><BANKTRANLIST>{body}</BANKTRANLIST></OFX>'
+
+    response, events = _import(
+        client, xml, format='ofx', default_category_id=str(food.id), default_payment_method_id=str(card.id)
+    )
+
+    assert events[-1]['imported'] == 3000
+    assert Transaction.query.filter_by(user_id=user.id, description='Item 2999').one().amount == 3000.0
+
+
+def test_import_qif(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+
+    response, events = _import(
+        client, QIF, filename='export.qif', default_category_id=str(salary.id), default_payment_method_id=str(card.id)
+    )
+
+    assert events[-1]['imported'] == 2
+    rows = Transaction.query.filter_by(user_id=user.id).order_by(Transaction.date).all()
+    assert [(t.date.isoformat(), t.description, t.amount, t.transaction_type, t.category_id) for t in rows] == [
+        ('2024-01-05', 'Rent', 1042.5, 'expense', food.id),
+        # An unknown category falls back to the default
+        ('2024-01-06', 'Paycheck', 3000.0, 'income', salary.id),
+    ]
+
+
+def test_import_qif_day_first(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+    qif = "!Type:Cash\nD05/01/2024\nT-10\nPCoffee\n^\n!Type:Invst\nD01/01/2024\nT-99\nPShares\n^\n"
+
+    response, events = _import(
+        client, qif, format='qif', day_first='true',
+        default_category_id=str(food.id), default_payment_method_id=str(card.id),
+    )
+
+    assert events[-1]['imported'] == 1
+    assert Transaction.query.filter_by(user_id=user.id).one().date.isoformat() == '2024-01-05'
+
+
+def test_reimport_skips_existing_lines(auth_client, statement_refs):
+    client, user = auth_client
+    first = (
+        "date,description,amount,category,payment_method\n"
+        "2024-03-01,Coffee,-5,Food,Credit Card\n"
+        "2024-03-01,Coffee,-5,Food,Credit Card\n"
+        "2024-03-02,Lunch,-20,Food,Credit Card\n"
+    )
+    overlapping = (
+        "date,description,amount,category,payment_method\n"
+        "2024-03-01,  COFFEE ,-5.00,Food,Credit Card\n"
+        "2024-03-01,Coffee,-5,Food,Credit Card\n"
+        "2024-03-01,Coffee,-5,Food,Credit Card\n"
+        "2024-03-02,Lunch,-20,Food,Credit Card\n"
+        "2024-03-03,Dinner,-30,Food,Credit Card\n"
+    )
+
+    _import(client, first)
+    response, events = _import(client, overlapping)
+
+    assert events[-1] == {'event': 'done', 'rows_processed': 5, 'imported': 2, 'skipped': 3, 'failed': 0}
+    # The third coffee is new: only as many repeats as were imported before are skipped
+    assert Transaction.query.filter_by(user_id=user.id, description='Coffee').count() == 3
+    assert Transaction.query.filter_by(user_id=user.id).count() == 5
+
+    response, events = _import(client, first, skip_duplicates='false')
+    assert events[-1]['imported'] == 3
+
+
+def test_concurrent_imports_of_one_file_insert_each_line_once(auth_client, statement_refs):
+    client, user = auth_client
+    records = [
+        (2, {'date': '2024-03-01', 'description': 'Coffee', 'amount': '-5', 'category': 'Food', 'payment_method': 'Credit Card'}),
+        (3, {'date': '2024-03-02', 'description': 'Lunch', 'amount': '-20', 'category': 'Food', 'payment_method': 'Credit Card'}),
+    ]
+    first, second = TransactionImporter(user.id), TransactionImporter(user.id)
+    # Both have parsed their batch before either inserts, so neither could have seen the other's rows
+    first_batch = [first.to_row(raw) for _, raw in records]
+    second_batch = [second.to_row(raw) for _, raw in records]
+
+    first._flush(first_batch)
+    second._flush(second_batch)
+
+    assert (first.imported, first.skipped) == (2, 0)
+    assert (second.imported, second.skipped) == (0, 2)
+    assert Transaction.query.filter_by(user_id=user.id).count() == 2
+    month = client.get('/api/transactions/summary?year=2024&month=3').json
+    assert month['total_expense'] == 25.0
+
+
+def test_import_hash_is_unique_per_user(auth_client, statement_refs):
+    client, user = auth_client
+    food, salary, card = statement_refs
+    for _ in range(2):
+        db.session.add(Transaction(description='Coffee', amount=5.0, transaction_type='expense',
+                                   category_id=food.id, user_id=user.id, import_hash='a' * 64))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+def test_import_rejects_unknown_format(auth_client):
+    client, user = auth_client
+    response, events = _import(client, 'x', format='xlsx')
+    assert response.status_code == 400
+    assert response.json['message'] == "Invalid format. Must be 'csv', 'ofx' or 'qif'"
@@ -1,4 +1,10 @@
+import json
+import pytest
 from http import HTTPStatus
+from src.models.user import db
+from src.models.transaction import Transaction
+from src.models.category import Category
+from datetime import date
 
 def test_add_transaction(auth_client, new_category, new_payment_method):
     client, user = auth_client
@@ -20,6 +26,69 @@ def test_get_transactions(auth_client, new_transaction):
     assert len(response.json) == 1
     assert response.json[0]['id'] == new_transaction.id
 
+def test_get_transactions_query_count_is_constant(auth_client, count_queries):
+    client, user = auth_client
+    categories = [client.post('/api/categories', json={'name': f'Category {i}', 'category_type': 'expense'}).json for i in range(5)]
+    payment_methods = [client.post('/api/payment-methods', json={'name': f'Method {i}'}).json for i in range(5)]
+    for i in range(20):
+        client.post('/api/transactions', json={
+            'description': f'Expense {i}',
+            'amount': 10.0 + i,
+            'transaction_type': 'expense',
+            'category_id': categories[i % 5]['id'],
+            'payment_method_id': payment_methods[i % 5]['id']
+        })
+    # Drop the identity map so relationship loads cannot be served from it
+    db.session.expunge_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/transactions')
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json) == 20
+    assert all(t['category_name'] and t['payment_method_name'] for t in response.json)
+    # ETag version lookup plus one joined query
+    assert len(statements) == 2
+
+def test_get_transactions_keyset_pagination(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    # Several rows share a date so the id tie-breaker is exercised
+    for i in range(7):
+        client.post('/api/transactions', json={
+            'description': f'Expense {i}',
+            'amount': 10.0,
+            'date': f'2024-05-0{1 + i // 3}',
+            'transaction_type': 'expense',
+            'category_id': new_category.id,
+            'payment_method_id': new_payment_method.id
+        })
+    expected = [t['id'] for t in client.get('/api/transactions').json]
+
+    seen = []
+    params = {'limit': 3}
+    while True:
+        response = client.get('/api/transactions', query_string=params)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json['items']) <= 3
+        seen += [t['id'] for t in response.json['items']]
+        if response.json['next_cursor'] is None:
+            break
+        params['cursor'] = response.json['next_cursor']
+
+    assert seen == expected
+    assert len(seen) == 7
+
+@pytest.mark.parametrize("params, expected_message", [
+    ({'limit': 'ten'}, 'Invalid limit'),
+    ({'limit': 0}, 'Limit must be between 1 and 500'),
+    ({'limit': 10, 'cursor': 'not-a-cursor'}, 'Invalid cursor'),
+])
+def test_get_transactions_pagination_invalid_params(auth_client, params, expected_message):
+    client, user = auth_client
+    response = client.get('/api/transactions', query_string=params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json['message'] == expected_message
+
 def test_get_single_transaction(auth_client, new_transaction):
     client, user = auth_client
     response = client.get(f'/api/transactions/{new_transaction.id}')
@@ -56,6 +125,120 @@ def test_get_transactions_summary(auth_client, new_category, new_payment_method)
     assert summary['balance'] == 250.0
     assert summary['transaction_count'] == 3
 
+def test_get_transactions_summary_empty(auth_client):
+    client, user = auth_client
+    response = client.get('/api/transactions/summary')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {'total_income': 0, 'total_expense': 0, 'balance': 0, 'transaction_count': 0}
+
+def test_get_transactions_summary_filtered_by_month(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    client.post('/api/transactions', json={'description': 'Jan income', 'amount': 100.0, 'date': '2024-01-10', 'transaction_type': 'income', 'category_id': new_category.id})
+    client.post('/api/transactions', json={'description': 'Jan expense', 'amount': 40.0, 'date': '2024-01-31', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+    client.post('/api/transactions', json={'description': 'Feb expense', 'amount': 70.0, 'date': '2024-02-01', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+
+    response = client.get('/api/transactions/summary?year=2024&month=1')
+    assert response.status_code == HTTPStatus.OK
+    summary = response.json
+    assert summary['total_income'] == 100.0
+    assert summary['total_expense'] == 40.0
+    assert summary['balance'] == 60.0
+    assert summary['transaction_count'] == 2
+
+def test_get_transactions_breakdown(auth_client):
+    client, user = auth_client
+    food = client.post('/api/categories', json={'name': 'Food', 'category_type': 'expense'}).json
+    rent = client.post('/api/categories', json={'name': 'Rent', 'category_type': 'expense'}).json
+    salary = client.post('/api/categories', json={'name': 'Salary', 'category_type': 'income'}).json
+    pix = client.post('/api/payment-methods', json={'name': 'PIX'}).json
+    for description, amount, category, transaction_type in [
+        ('Market', 30.0, food, 'expense'),
+        ('Restaurant', 20.0, food, 'expense'),
+        ('Rent', 900.0, rent, 'expense'),
+        ('Salary', 3000.0, salary, 'income'),
+    ]:
+        payload = {'description': description, 'amount': amount, 'date': '2024-06-10',
+                   'transaction_type': transaction_type, 'category_id': category['id']}
+        if transaction_type == 'expense':
+            payload['payment_method_id'] = pix['id']
+        client.post('/api/transactions', json=payload)
+
+    response = client.get('/api/transactions/breakdown?by=category&transaction_type=expense&year=2024&month=6')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == [
+        {'id': rent['id'], 'name': 'Rent', 'total': 900.0, 'count': 1},
+        {'id': food['id'], 'name': 'Food', 'total': 50.0, 'count': 2},
+    ]
+
+    response = client.get('/api/transactions/breakdown?by=payment_method&year=2024&month=6')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == [
+        {'id': None, 'name': None, 'total': 3000.0, 'count': 1},
+        {'id': pix['id'], 'name': 'PIX', 'total': 950.0, 'count': 3},
+    ]
+
+    response = client.get('/api/transactions/breakdown?by=category&year=2024&month=7')
+    assert response.json == []
+
+@pytest.mark.parametrize("query_string, expected_message", [
+    ('', "Invalid grouping. Must be 'category' or 'payment_method'"),
+    ('by=user', "Invalid grouping. Must be 'category' or 'payment_method'"),
+    ('by=category&transaction_type=transfer', "Invalid transaction type. Must be 'income' or 'expense'"),
+    ('by=category&month=13&year=2024', 'Invalid month'),
+])
+def test_get_transactions_breakdown_invalid_params(auth_client, query_string, expected_message):
+    client, user = auth_client
+    response = client.get(f'/api/transactions/breakdown?{query_string}')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json['message'] == expected_message
+
+def test_get_transactions_trend_fills_empty_months(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    client.post('/api/transactions', json={'description': 'Salary', 'amount': 1000.0, 'date': '2024-01-05', 'transaction_type': 'income', 'category_id': new_category.id})
+    client.post('/api/transactions', json={'description': 'Rent', 'amount': 400.0, 'date': '2024-01-31', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+    client.post('/api/transactions', json={'description': 'Trip', 'amount': 250.0, 'date': '2024-03-01', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+    client.post('/api/transactions', json={'description': 'Out of range', 'amount': 99.0, 'date': '2024-04-01', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+
+    response = client.get('/api/transactions/trend?from=2024-01&to=2024-03')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        'granularity': 'month',
+        'series': [
+            {'period': '2024-01', 'income': 1000.0, 'expense': 400.0, 'balance': 600.0},
+            {'period': '2024-02', 'income': 0, 'expense': 0, 'balance': 0},
+            {'period': '2024-03', 'income': 0, 'expense': 250.0, 'balance': -250.0},
+        ]
+    }
+
+def test_get_transactions_trend_by_week_and_day(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    client.post('/api/transactions', json={'description': 'Coffee', 'amount': 5.0, 'date': '2024-02-06', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+    client.post('/api/transactions', json={'description': 'Lunch', 'amount': 15.0, 'date': '2024-02-08', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+    client.post('/api/transactions', json={'description': 'Snack', 'amount': 3.0, 'date': '2024-02-03', 'transaction_type': 'expense', 'category_id': new_category.id, 'payment_method_id': new_payment_method.id})
+
+    weekly = client.get('/api/transactions/trend?from=2024-02&granularity=week').json['series']
+    # February 2024 starts on a Thursday, so the first bucket covers Thursday to Sunday and is labelled with the 1st
+    assert [point['period'] for point in weekly] == ['2024-02-01', '2024-02-05', '2024-02-12', '2024-02-19', '2024-02-26']
+    assert weekly[0]['expense'] == 3.0
+    assert weekly[1]['expense'] == 20.0
+
+    daily = client.get('/api/transactions/trend?from=2024-02&granularity=day').json['series']
+    assert len(daily) == 29
+    assert daily[5] == {'period': '2024-02-06', 'income': 0, 'expense': 5.0, 'balance': -5.0}
+
+@pytest.mark.parametrize("query_string, expected_message", [
+    ('', 'Invalid from format. Use YYYY-MM'),
+    ('from=2024-01&to=2024/03', 'Invalid to format. Use YYYY-MM'),
+    ('from=2024-03&to=2024-01', "'to' must not be before 'from'"),
+    ('from=2024-01&granularity=year', "Invalid granularity. Must be 'month', 'week' or 'day'"),
+    ('from=2000-01&to=2024-12&granularity=day', 'Range too large for the requested granularity'),
+])
+def test_get_transactions_trend_invalid_params(auth_client, query_string, expected_message):
+    client, user = auth_client
+    response = client.get(f'/api/transactions/trend?{query_string}')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json['message'] == expected_message
+
 def test_add_transaction_unauthenticated(client):
     response = client.post('/api/transactions', json={
         'description': 'Unauthorized Trans',
@@ -165,3 +348,225 @@ def test_delete_transaction_other_user(auth_client, client, app):
 
     response = client.delete(f'/api/transactions/{transaction["id"]}', headers={'Authorization': f'Bearer {token}'})
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def _batch_create(category_id, payment_method_id, **overrides):
+    data = {
+        'description': 'Batch', 'amount': 10.0, 'date': '2024-03-05', 'transaction_type': 'expense',
+        'category_id': category_id, 'payment_method_id': payment_method_id,
+    }
+    data.update(overrides)
+    return {'op': 'create', 'data': data}
+
+
+def test_batch_transactions_mixed_operations(auth_client, new_transaction, new_category, new_payment_method):
+    client, user = auth_client
+    doomed = client.post('/api/transactions', json=_batch_create(new_category.id, new_payment_method.id)['data']).json
+
+    response = client.post('/api/transactions/batch', json={'operations': [
+        _batch_create(new_category.id, new_payment_method.id, description='First'),
+        {'op': 'update', 'id': new_transaction.id, 'data': {'amount': 55.5, 'description': 'Changed'}},
+        {'op': 'delete', 'id': doomed['id']},
+        _batch_create(new_category.id, None, description='Salary', transaction_type='income', amount=900),
+    ]})
+
+    assert response.status_code == 200
+    results = response.json['results']
+    assert [r['status'] for r in results] == [201, 200, 200, 201]
+    assert response.json == {'results': results, 'succeeded': 4, 'failed': 0}
+
+    created = db.session.get(Transaction, results[0]['id'])
+    assert created.description == 'First' and created.user_id == user.id
+    assert db.session.get(Transaction, results[3]['id']).payment_method_id is None
+    assert db.session.get(Transaction, new_transaction.id).amount == 55.5
+    assert db.session.get(Transaction, doomed['id']) is None
+
+
+def test_batch_transactions_reports_item_errors(auth_client, new_transaction, new_category, new_payment_method):
+    client, user = auth_client
+    other_category = Category(name='Other', category_type='expense', user_id=user.id + 1)
+    db.session.add(other_category)
+    db.session.commit()
+
+    response = client.post('/api/transactions/batch', json={'operations': [
+        _batch_create(new_category.id, new_payment_method.id),
+        _batch_create(new_category.id, new_payment_method.id, amount=-1),
+        _batch_create(other_category.id, new_payment_method.id),
+        {'op': 'update', 'id': 999999, 'data': {'amount': 1}},
+        {'op': 'delete', 'id': new_transaction.id},
+        {'op': 'update', 'id': new_transaction.id, 'data': {'amount': 1}},
+        {'op': 'upsert'},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json['results']
+    assert [r['status'] for r in results] == [201, 400, 404, 404, 200, 400, 400]
+    assert results[1]['message'] == 'Amount must be a positive number'
+    assert results[2]['message'] == 'Category not found or does not belong to user'
+    assert results[3]['message'] == 'Transaction not found'
+    assert results[5]['message'] == 'Transaction is targeted by more than one operation'
+    assert response.json['succeeded'] == 2 and response.json['failed'] == 5
+    assert Transaction.query.filter_by(user_id=user.id).count() == 1
+
+
+def test_batch_transactions_cannot_touch_other_users_rows(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    foreign = Transaction(description='Theirs', amount=5.0, date=date(2024, 1, 1), transaction_type='expense',
+                          category_id=new_category.id, payment_method_id=new_payment_method.id, user_id=user.id + 1)
+    db.session.add(foreign)
+    db.session.commit()
+
+    response = client.post('/api/transactions/batch', json={'operations': [{'op': 'delete', 'id': foreign.id}]})
+
+    assert response.json['results'][0]['status'] == 404
+    assert db.session.get(Transaction, foreign.id) is not None
+
+
+@pytest.mark.parametrize('payload, message', [
+    ({}, 'Operations must be a non-empty list'),
+    ({'operations': []}, 'Operations must be a non-empty list'),
+    ({'operations': [{'op': 'delete', 'id': 1}] * 5001}, 'Too many operations. Maximum is 5000'),
+])
+def test_batch_transactions_rejects_bad_payloads(auth_client, payload, message):
+    client, user = auth_client
+    response = client.post('/api/transactions/batch', json=payload)
+    assert response.status_code == 400
+    assert response.json['message'] == message
+
+
+def test_batch_transactions_query_count(auth_client, new_category, new_payment_method, count_queries):
+    client, user = auth_client
+    operations = [_batch_create(new_category.id, new_payment_method.id, amount=i + 1) for i in range(500)]
+
+    db.session.expunge_all()
+    with count_queries() as statements:
+        response = client.post('/api/transactions/batch', json={'operations': operations})
+
+    assert response.json['succeeded'] == 500
+    inserts = [s for s in statements if s.startswith('INSERT INTO "transaction"')]
+    assert len(inserts) == 1
+    assert len([s for s in statements if 'FROM category' in s]) == 1
+    assert len([s for s in statements if 'FROM payment_method' in s]) == 1
+
+
+def test_batch_transactions_update_only_the_changed_columns(auth_client, new_category, new_payment_method, count_queries):
+    client, user = auth_client
+    created = client.post('/api/transactions/batch', json={'operations': [
+        _batch_create(new_category.id, new_payment_method.id) for _ in range(3)
+    ]}).json['results']
+    ids = [result['id'] for result in created]
+
+    with count_queries() as statements:
+        client.post('/api/transactions/batch', json={'operations': [
+            {'op': 'update', 'id': ids[0], 'data': {'description': 'Renamed'}},
+            {'op': 'update', 'id': ids[1], 'data': {'description': 'Renamed too'}},
+            {'op': 'update', 'id': ids[2], 'data': {'amount': 25.0}},
+        ]})
+
+    # One UPDATE per column set, so columns an item did not change are never written back from the pre-read
+    updates = [s for s in statements if s.startswith('UPDATE "transaction"')]
+    assert len(updates) == 2
+    assert any('description=' in s and 'amount=' not in s and 'notes=' not in s for s in updates)
+    assert any('amount=' in s and 'description=' not in s for s in updates)
+    assert client.get(f'/api/transactions/{ids[2]}').json['description'] == 'Batch'
+    assert client.get(f'/api/transactions/{ids[0]}').json['amount'] == 10.0
+
+
+def test_batch_transactions_keep_rollup_and_versions_in_step(auth_client, new_transaction, new_category, new_payment_method):
+    client, user = auth_client
+    etag = client.get('/api/transactions/summary').headers['ETag']
+
+    client.post('/api/transactions/batch', json={'operations': [
+        _batch_create(new_category.id, new_payment_method.id, amount=40.0, date=new_transaction.date.isoformat()),
+        {'op': 'update', 'id': new_transaction.id, 'data': {'amount': 60.0}},
+    ]})
+
+    response = client.get('/api/transactions/summary', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['total_expense'] == 100.0
+    assert response.json['transaction_count'] == 2
+    month = client.get(f'/api/transactions/summary?year={new_transaction.date.year}&month={new_transaction.date.month}')
+    assert month.json['total_expense'] == 100.0
+
+
+def _seed_export_rows(user, category, payment_method):
+    db.session.add_all([
+        Transaction(description='Rent', amount=1200.0, date=date(2024, 1, 1), transaction_type='expense',
+                    category_id=category.id, payment_method_id=payment_method.id, user_id=user.id),
+        Transaction(description='=HYPERLINK("x")', amount=10.0, date=date(2024, 2, 1), transaction_type='expense',
+                    category_id=category.id, payment_method_id=payment_method.id, user_id=user.id, notes='a, "b"'),
+        Transaction(description='Salary', amount=5000.0, date=date(2024, 3, 1), transaction_type='income',
+                    category_id=category.id, user_id=user.id),
+        Transaction(description='Theirs', amount=1.0, date=date(2024, 1, 15), transaction_type='income',
+                    category_id=category.id, user_id=user.id + 1),
+    ])
+    db.session.commit()
+
+
+def test_export_transactions_csv(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    _seed_export_rows(user, new_category, new_payment_method)
+
+    response = client.get('/api/transactions/export')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=transactions.csv'
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'id,date,description,amount,transaction_type,category,payment_method,notes'
+    assert [line.split(',')[1] for line in lines[1:]] == ['2024-01-01', '2024-02-01', '2024-03-01']
+    assert lines[1].endswith(',Rent,1200.0,expense,Test Category,Test Payment Method,')
+    # Formula-like cells are neutralized and quoting is handled by the csv module
+    assert ',"\'=HYPERLINK(""x"")",10.0,' in lines[2]
+    assert lines[2].endswith(',"a, ""b"""')
+    assert lines[3].endswith(',Salary,5000.0,income,Test Category,,')
+
+
+def test_export_transactions_ndjson_with_range(auth_client, new_category, new_payment_method):
+    client, user = auth_client
+    _seed_export_rows(user, new_category, new_payment_method)
+
+    response = client.get('/api/transactions/export?format=ndjson&from=2024-02-01&to=2024-03-01')
+
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(r['date'], r['description'], r['payment_method']) for r in records] == [
+        ('2024-02-01', '=HYPERLINK("x")', 'Test Payment Method'),
+        ('2024-03-01', 'Salary', None),
+    ]
+    assert set(records[0]) == {'id', 'date', 'description', 'amount', 'transaction_type', 'category', 'payment_method', 'notes'}
+
+
+def test_export_transactions_streams_in_batches(auth_client, new_category, new_payment_method, count_queries, monkeypatch):
+    from src.routes import transaction as transaction_routes
+    monkeypatch.setattr(transaction_routes, 'EXPORT_BATCH_SIZE', 2)
+    client, user = auth_client
+    db.session.add_all([
+        Transaction(description=f'Row {i}', amount=1.0, date=date(2024, 1, i + 1), transaction_type='income',
+                    category_id=new_category.id, user_id=user.id)
+        for i in range(5)
+    ])
+    db.session.commit()
+
+    db.session.expunge_all()
+    with count_queries() as statements:
+        response = client.get('/api/transactions/export', buffered=False)
+        chunks = list(response.response)
+
+    # Header first, then one chunk per batch of rows, all from a single query
+    assert chunks[0] == b'id,date,description,amount,transaction_type,category,payment_method,notes\r\n'
+    assert len(chunks) == 4
+    assert len([s for s in statements if s.startswith('SELECT')]) == 1
+
+
+@pytest.mark.parametrize('query, message', [
+    ('format=xml', "Invalid format. Must be 'csv' or 'ndjson'"),
+    ('from=2024-13-01', 'Invalid from format. Use YYYY-MM-DD'),
+    ('to=yesterday', 'Invalid to format. Use YYYY-MM-DD'),
+])
+def test_export_transactions_invalid_args(auth_client, query, message):
+    client, user = auth_client
+    response = client.get(f'/api/transactions/export?{query}')
+    assert response.status_code == 400
+    assert response.json['message'] == message
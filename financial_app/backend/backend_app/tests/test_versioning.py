@@ -0,0 +1,91 @@
+from http import HTTPStatus
+from flask_jwt_extended import create_access_token
+from src.models.user import db, User
+from src.models.category import Category
+from src.models.data_version import DataVersion
+
+
+def test_get_returns_etag_and_304_when_unchanged(auth_client, count_queries):
+    client, user = auth_client
+    client.post('/api/categories', json={'name': 'Food', 'category_type': 'expense'})
+
+    first = client.get('/api/categories')
+    assert first.status_code == HTTPStatus.OK
+    etag = first.headers['ETag']
+    assert etag
+
+    with count_queries() as statements:
+        second = client.get('/api/categories', headers={'If-None-Match': etag})
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
+    assert second.headers['ETag'] == etag
+    assert second.data == b''
+    # Only the version lookup ran
+    assert len(statements) == 1 and 'data_version' in statements[0]
+
+
+def test_write_changes_etag(auth_client):
+    client, user = auth_client
+    category = client.post('/api/categories', json={'name': 'Food', 'category_type': 'expense'}).json
+    etag = client.get('/api/categories').headers['ETag']
+
+    client.put(f"/api/categories/{category['id']}", json={'name': 'Groceries'})
+
+    response = client.get('/api/categories', headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] != etag
+    assert response.json[0]['name'] == 'Groceries'
+
+
+def test_dependent_resources_change_etag(auth_client, new_transaction):
+    client, user = auth_client
+    etag = client.get('/api/transactions').headers['ETag']
+
+    # Renaming a category changes category_name in the transaction list
+    client.put(f'/api/categories/{new_transaction.category_id}', json={'name': 'Renamed'})
+
+    response = client.get('/api/transactions', headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json[0]['category_name'] == 'Renamed'
+
+
+def test_etag_depends_on_query_string(auth_client):
+    client, user = auth_client
+    all_categories = client.get('/api/categories').headers['ETag']
+    expenses = client.get('/api/categories?category_type=expense').headers['ETag']
+    assert all_categories != expenses
+
+    response = client.get('/api/categories?category_type=expense', headers={'If-None-Match': all_categories})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_other_users_writes_do_not_change_etag(auth_client, app):
+    client, user = auth_client
+    etag = client.get('/api/categories').headers['ETag']
+
+    other = User(username='otheruser', email='other@example.com')
+    other.set_password('Password123!')
+    db.session.add(other)
+    db.session.commit()
+    other_client = app.test_client()
+    other_client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {create_access_token(identity=str(other.id))}'
+    other_client.post('/api/categories', json={'name': 'Theirs', 'category_type': 'expense'})
+
+    response = client.get('/api/categories', headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_error_responses_have_no_etag(auth_client):
+    client, user = auth_client
+    response = client.get('/api/categories?category_type=invalid')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'ETag' not in response.headers
+
+
+def test_versions_bumped_once_per_flush(auth_client):
+    client, user = auth_client
+    db.session.add_all([
+        Category(name='A', category_type='expense', user_id=user.id),
+        Category(name='B', category_type='income', user_id=user.id),
+    ])
+    db.session.commit()
+    assert db.session.get(DataVersion, (user.id, 'categories')).version == 1
@@ -17,24 +17,20 @@ const Charts = ({ period }) => {
     try {
       setLoading(true);
       
-      // Buscar transações do período
-      const response = await api.get('/transactions', {
-        params: {
-          user_id: user.id,
-          year: period.year,
-          month: period.month
-        }
-      });
-      
-      const transactions = response.data;
-      
-      // Processar dados para gráficos
-      const categoryExpenses = processExpensesByCategory(transactions);
-      const paymentMethods = processPaymentMethods(transactions);
+      // Totais agrupados no servidor: payload proporcional ao número de grupos
+      const params = { year: period.year, month: period.month };
+      const [categoryResponse, paymentMethodResponse] = await Promise.all([
+        api.get('/transactions/breakdown', {
+          params: { ...params, by: 'category', transaction_type: 'expense' }
+        }),
+        api.get('/transactions/breakdown', {
+          params: { ...params, by: 'payment_method' }
+        })
+      ]);
       
       setChartData({
-        categoryExpenses,
-        paymentMethods,
+        categoryExpenses: toChartSeries(categoryResponse.data, 'Sem categoria'),
+        paymentMethods: toChartSeries(paymentMethodResponse.data, 'Sem método'),
         monthlyTrend: [] // Para implementar futuramente
       });
       
@@ -45,31 +41,8 @@ const Charts = ({ period }) => {
     }
   };
 
-  const processExpensesByCategory = (transactions) => {
-    const expenses = transactions.filter(t => t.transaction_type === 'expense');
-    const categoryTotals = {};
-    
-    expenses.forEach(transaction => {
-      const category = transaction.category_name || 'Sem categoria';
-      categoryTotals[category] = (categoryTotals[category] || 0) + transaction.amount;
-    });
-    
-    return Object.entries(categoryTotals)
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value);
-  };
-
-  const processPaymentMethods = (transactions) => {
-    const methodTotals = {};
-    
-    transactions.forEach(transaction => {
-      const method = transaction.payment_method_name || 'Sem método';
-      methodTotals[method] = (methodTotals[method] || 0) + transaction.amount;
-    });
-    
-    return Object.entries(methodTotals)
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value);
+  const toChartSeries = (groups, fallbackName) => {
+    return groups.map(group => ({ name: group.name || fallbackName, value: group.total }));
   };
 
   const formatCurrency = (value) => {
@@ -1,6 +1,8 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '../hooks/useAuth.jsx';
 import api from '../lib/api.js';
+import { syncResource } from '../lib/syncStore.js';
+import { useChangeFeed } from '../hooks/useChangeFeed.jsx';
 import { Pencil, Trash2 } from 'lucide-react';
 import { Button } from './ui/button';
 import { AlertDialog, AlertDialogAction, AlertDialogCancel, AlertDialogContent, AlertDialogDescription, AlertDialogFooter, AlertDialogHeader, AlertDialogTitle, AlertDialogTrigger } from './ui/alert-dialog';
@@ -22,13 +24,11 @@ const GoalList = ({ onGoalChange, refreshTrigger }) => {
       setLoading(true);
       setError(null);
       
-      const response = await api.get('/goals', {
-        params: {
-          user_id: user.id,
-        }
-      });
-      
-      setGoals(response.data);
+      // Mesma ordem de GET /goals: mais recentes primeiro
+      const goals = await syncResource(user.id, 'goals', (a, b) =>
+        (b.created_date || '').localeCompare(a.created_date || '') || a.id - b.id
+      );
+      setGoals(goals);
     } catch (error) {
       console.error('Erro ao carregar metas:', error);
       setError('Erro ao carregar metas');
@@ -68,6 +68,9 @@ const GoalList = ({ onGoalChange, refreshTrigger }) => {
     fetchGoals();
   }, [user, refreshTrigger]);
 
+  // Alterações feitas em outras abas chegam pelo feed; /sync baixa só o que mudou
+  useChangeFeed(['goals'], () => fetchGoals());
+
   if (loading) {
     return (
       <div className="space-y-4">
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '../hooks/useAuth.jsx';
 import api from '../lib/api.js';
-import { Button } from "@/components/ui/button";
+import { useReferenceData } from '../hooks/useReferenceData.jsx';
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import {
@@ -23,13 +23,11 @@ const InvestmentForm = ({ investment = null, onSave, onCancel }) => {
     notes: ''
   });
   const [purchaseDate, setPurchaseDate] = useState(new Date());
-  const [investmentTypes, setInvestmentTypes] = useState([]);
+  const { investmentTypes } = useReferenceData();
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
 
   useEffect(() => {
-    fetchInvestmentTypes();
-    
     if (investment) {
       setFormData({
         name: investment.name || '',
@@ -51,15 +49,6 @@ const InvestmentForm = ({ investment = null, onSave, onCancel }) => {
     }
   }, [investment]);
 
-  const fetchInvestmentTypes = async () => {
-    try {
-      const response = await api.get(`/investment-types?user_id=${user.id}`);
-      setInvestmentTypes(response.data);
-    } catch (error) {
-      console.error('Erro ao buscar tipos de investimento:', error);
-    }
-  };
-
   const handleChange = (name, value) => {
     setFormData(prev => ({
       ...prev,
@@ -1,6 +1,8 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '../hooks/useAuth.jsx';
 import api from '../lib/api.js';
+import { syncResource } from '../lib/syncStore.js';
+import { useChangeFeed } from '../hooks/useChangeFeed.jsx';
 import { Pencil, Trash2 } from 'lucide-react';
 import { Button } from './ui/button';
 import { AlertDialog, AlertDialogAction, AlertDialogCancel, AlertDialogContent, AlertDialogDescription, AlertDialogFooter, AlertDialogHeader, AlertDialogTitle, AlertDialogTrigger } from './ui/alert-dialog';
@@ -22,13 +24,11 @@ const InvestmentList = ({ onInvestmentChange }) => {
       setLoading(true);
       setError(null);
       
-      const response = await api.get('/investments', {
-        params: {
-          user_id: user.id,
-        }
-      });
-      
-      setInvestments(response.data);
+      // Mesma ordem de GET /investments: data mais recente primeiro
+      const investments = await syncResource(user.id, 'investments', (a, b) =>
+        (b.date || '').localeCompare(a.date || '') || a.id - b.id
+      );
+      setInvestments(investments);
     } catch (error) {
       console.error('Erro ao carregar investimentos:', error);
       setError('Erro ao carregar investimentos');
@@ -63,6 +63,9 @@ const InvestmentList = ({ onInvestmentChange }) => {
     fetchInvestments();
   }, [user]);
 
+  // Alterações feitas em outras abas chegam pelo feed; /sync baixa só o que mudou
+  useChangeFeed(['investments'], () => fetchInvestments());
+
   if (loading) {
     return (
       <div className="space-y-4">
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '../hooks/useAuth.jsx';
 import api from '../lib/api.js';
+import { useReferenceData } from '../hooks/useReferenceData.jsx';
 
 const TransactionForm = ({ transaction = null, onSave, onCancel }) => {
   const { user } = useAuth();
@@ -13,41 +14,17 @@ const TransactionForm = ({ transaction = null, onSave, onCancel }) => {
     date: new Date().toISOString().split('T')[0],
     notes: ''
   });
-  const [categories, setCategories] = useState([]);
-  const [paymentMethods, setPaymentMethods] = useState([]);
+  const { categories: categoriesByType, paymentMethods, loaded } = useReferenceData();
+  const categories = categoriesByType[formData.transaction_type] || [];
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
 
-  // Fetch categories based on transaction_type
+  // Reset category_id if current one is not in the list for the selected type
   useEffect(() => {
-    const fetchFilteredCategories = async () => {
-      try {
-        const response = await api.get(`/categories?user_id=${user.id}&category_type=${formData.transaction_type}`);
-        setCategories(response.data);
-        // Reset category_id if current one is not in filtered list
-        if (!response.data.some(cat => cat.id === parseInt(formData.category_id))) {
-          setFormData(prev => ({ ...prev, category_id: '' }));
-        }
-      } catch (error) {
-        console.error('Erro ao buscar categorias filtradas:', error);
-      }
-    };
-
-    fetchFilteredCategories();
-  }, [formData.transaction_type, user.id]);
-
-  // Fetch payment methods (always, as they are not type-dependent)
-  useEffect(() => {
-    const fetchPaymentMethods = async () => {
-      try {
-        const response = await api.get(`/payment-methods?user_id=${user.id}`);
-        setPaymentMethods(response.data);
-      } catch (error) {
-        console.error('Erro ao buscar formas de pagamento:', error);
-      }
-    };
-    fetchPaymentMethods();
-  }, [user.id]);
+    if (loaded && !categories.some(cat => cat.id === parseInt(formData.category_id))) {
+      setFormData(prev => ({ ...prev, category_id: '' }));
+    }
+  }, [formData.transaction_type, categoriesByType]);
 
   // Initialize form data for editing
   useEffect(() => {
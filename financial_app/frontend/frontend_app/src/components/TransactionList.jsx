@@ -1,6 +1,8 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '../hooks/useAuth.jsx';
 import api from '../lib/api.js';
+import { syncResource } from '../lib/syncStore.js';
+import { useChangeFeed } from '../hooks/useChangeFeed.jsx';
 import { Pencil, Trash2 } from 'lucide-react';
 import { Button } from './ui/button';
 import { AlertDialog, AlertDialogAction, AlertDialogCancel, AlertDialogContent, AlertDialogDescription, AlertDialogFooter, AlertDialogHeader, AlertDialogTitle, AlertDialogTrigger } from './ui/alert-dialog';
@@ -22,15 +24,12 @@ const TransactionList = ({ period, refreshTrigger }) => {
       setLoading(true);
       setError(null);
       
-      const response = await api.get('/transactions', {
-        params: {
-          user_id: user.id,
-          year: period.year,
-          month: period.month
-        }
-      });
-      
-      setTransactions(response.data);
+      // Mesmo filtro e ordem de GET /transactions?year=&month=: mais recentes primeiro
+      const prefix = `${period.year}-${String(period.month).padStart(2, '0')}-`;
+      const transactions = await syncResource(user.id, 'transactions', (a, b) =>
+        b.date.localeCompare(a.date) || b.id - a.id
+      );
+      setTransactions(transactions.filter((t) => t.date.startsWith(prefix)));
     } catch (error) {
       console.error('Erro ao carregar transações:', error);
       setError('Erro ao carregar transações');
@@ -66,6 +65,9 @@ const TransactionList = ({ period, refreshTrigger }) => {
     fetchTransactions();
   }, [user, period, refreshTrigger]);
 
+  // Alterações feitas em outras abas chegam pelo feed; /sync baixa só o que mudou
+  useChangeFeed(['transactions'], () => fetchTransactions());
+
   if (loading) {
     return (
       <div className="space-y-4">
@@ -1,5 +1,6 @@
 import { useState, useEffect, createContext, useContext } from 'react';
 import api from '../lib/api.js';
+import { resetSyncStore } from '../lib/syncStore.js';
 
 const AuthContext = createContext();
 
@@ -63,6 +64,7 @@ export const AuthProvider = ({ children }) => {
     } catch (error) {
       console.error("Logout failed", error);
     } finally {
+      resetSyncStore();
       setUser(null);
     }
   };
@@ -0,0 +1,54 @@
+import { useEffect, useRef } from 'react';
+import { useAuth } from './useAuth.jsx';
+import { API_BASE_URL } from '../lib/api.js';
+
+// Uma única conexão SSE por aba, compartilhada por todos os componentes inscritos
+let source = null;
+const listeners = new Set();
+
+const dispatch = (change) => listeners.forEach((listener) => listener(change));
+
+const connect = () => {
+  source = new EventSource(`${API_BASE_URL}/api/events`, { withCredentials: true });
+  source.addEventListener('change', (event) => dispatch(JSON.parse(event.data)));
+  // Eventos perdidos enquanto a conexão esteve fechada: todos recarregam
+  source.addEventListener('ready', () => dispatch({ resource: null, id: null, op: 'resync' }));
+};
+
+const disconnect = () => {
+  source?.close();
+  source = null;
+};
+
+// Chama `onChange` (com atraso para agrupar rajadas) quando outra aba ou dispositivo altera um dos recursos
+export const useChangeFeed = (resources, onChange, delay = 300) => {
+  const { user } = useAuth();
+  const callback = useRef(onChange);
+  callback.current = onChange;
+  const key = resources.join(',');
+
+  useEffect(() => {
+    if (!user || typeof EventSource === 'undefined') return;
+    let timer = null;
+    let connected = false;
+    const listener = (change) => {
+      // O 'ready' da primeira conexão não é uma mudança
+      if (change.op === 'resync' && !connected) {
+        connected = true;
+        return;
+      }
+      if (change.resource !== null && !resources.includes(change.resource)) return;
+      clearTimeout(timer);
+      timer = setTimeout(() => callback.current(change), delay);
+    };
+
+    listeners.add(listener);
+    if (!source) connect();
+    else connected = true;
+    return () => {
+      clearTimeout(timer);
+      listeners.delete(listener);
+      if (listeners.size === 0) disconnect();
+    };
+  }, [user?.id, key, delay]);
+};
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from './useAuth.jsx';
 import api from '../lib/api.js';
+import { useChangeFeed } from './useChangeFeed.jsx';
 
 export const useDashboard = (period = null) => {
   const { user } = useAuth();
@@ -27,28 +28,16 @@ export const useDashboard = (period = null) => {
     try {
       setDashboardData(prev => ({ ...prev, loading: true, error: null }));
 
-      // Buscar resumo de transações
-      const transactionSummaryResponse = await api.get('/transactions/summary', {
+      // Totais de transações, investimentos e metas em uma única requisição
+      const response = await api.get('/dashboard', {
         params: {
-          user_id: user.id,
           year: currentPeriod.year,
           month: currentPeriod.month
         }
       });
 
-      // Buscar total de investimentos
-      const investmentsResponse = await api.get('/investments', {
-        params: {
-          user_id: user.id,
-          year: currentPeriod.year,
-          month: currentPeriod.month
-        }
-      });
-
-      const transactionSummary = transactionSummaryResponse.data;
-      const investments = investmentsResponse.data;
-
-      const totalInvestments = investments.reduce((sum, inv) => sum + parseFloat(inv.amount || 0), 0);
+      const transactionSummary = response.data.transactions;
+      const totalInvestments = response.data.investments.total_invested;
       const balance = transactionSummary.total_income - transactionSummary.total_expense;
 
       setDashboardData({
@@ -100,6 +89,9 @@ export const useDashboard = (period = null) => {
     fetchDashboardData();
   }, [user, currentPeriod]);
 
+  // Atualiza quando outra aba ou dispositivo grava algo que entra nos totais
+  useChangeFeed(['transactions', 'investments', 'goals'], () => fetchDashboardData());
+
   const formatCurrency = (value) => {
     return new Intl.NumberFormat('pt-BR', {
       style: 'currency',
@@ -0,0 +1,48 @@
+import { useState, useEffect } from 'react';
+import { useAuth } from './useAuth.jsx';
+import api from '../lib/api.js';
+
+const EMPTY_REFERENCE_DATA = {
+  categories: { income: [], expense: [] },
+  paymentMethods: [],
+  investmentTypes: [],
+  loaded: false
+};
+
+// Último pacote recebido, compartilhado entre formulários; o navegador revalida com ETag (304)
+let lastReferenceData = { userId: null, data: EMPTY_REFERENCE_DATA };
+
+export const useReferenceData = () => {
+  const { user } = useAuth();
+  const [referenceData, setReferenceData] = useState(
+    lastReferenceData.userId === user?.id ? lastReferenceData.data : EMPTY_REFERENCE_DATA
+  );
+
+  useEffect(() => {
+    if (!user) return;
+    let cancelled = false;
+
+    const fetchReferenceData = async () => {
+      try {
+        const response = await api.get('/reference-data');
+        const data = {
+          categories: response.data.categories,
+          paymentMethods: response.data.payment_methods,
+          investmentTypes: response.data.investment_types,
+          loaded: true
+        };
+        lastReferenceData = { userId: user.id, data };
+        if (!cancelled) setReferenceData(data);
+      } catch (error) {
+        console.error('Erro ao buscar dados de referência:', error);
+      }
+    };
+
+    fetchReferenceData();
+    return () => {
+      cancelled = true;
+    };
+  }, [user?.id]);
+
+  return referenceData;
+};
@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001';
+export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001';
 
 const api = axios.create({
   baseURL: `${API_BASE_URL}/api`,
@@ -22,11 +22,23 @@ export const getCurrentUser = () => api.get('/current_user');
 
 // Funções de transações
 export const getTransactions = (params) => api.get('/transactions', { params });
+// Paginação por cursor: passe o next_cursor da página anterior para anexar a próxima
+export const getTransactionsPage = (params, cursor = null, limit = 50) =>
+  api.get('/transactions', { params: { ...params, limit, ...(cursor ? { cursor } : {}) } });
 export const getTransactionById = (id) => api.get(`/transactions/${id}`);
 export const addTransaction = (transactionData) => api.post('/transactions', transactionData);
 export const updateTransaction = (id, transactionData) => api.put(`/transactions/${id}`, transactionData);
 export const deleteTransaction = (id) => api.delete(`/transactions/${id}`);
+export const batchTransactions = (operations) => api.post('/transactions/batch', { operations });
+export const exportTransactions = (params) => api.get('/transactions/export', { params, responseType: 'blob' });
+export const importTransactions = (file, options = {}) => {
+  const formData = new FormData();
+  formData.append('file', file);
+  Object.entries(options).forEach(([key, value]) => formData.append(key, value));
+  return api.post('/transactions/import', formData);
+};
 export const getTransactionsSummary = (params) => api.get('/transactions/summary', { params });
+export const getTransactionsTrend = (params) => api.get('/transactions/trend', { params });
 
 // Funções de categorias
 export const getCategories = () => api.get('/categories');
@@ -56,4 +68,25 @@ export const deleteInvestmentType = (id) => api.delete(`/investment-types/${id}`
 export const getInvestments = () => api.get('/investments');
 export const addInvestment = (investmentData) => api.post('/investments', investmentData);
 export const updateInvestment = (id, investmentData) => api.put(`/investments/${id}`, investmentData);
-export const deleteInvestment = (id) => api.delete(`/investments/${id}`);
\ No newline at end of file
+export const deleteInvestment = (id) => api.delete(`/investments/${id}`);
+export const getInvestmentHistory = (id, params) => api.get(`/investments/${id}/history`, { params });
+export const getInvestmentAllocation = () => api.get('/investments/allocation');
+export const rebalanceInvestments = (rebalanceData) => api.post('/investments/rebalance', rebalanceData);
+
+// Reference data
+export const getReferenceData = () => api.get('/reference-data');
+
+// Delta sync
+export const getSync = (since) => api.get('/sync', { params: since ? { since } : {} });
+
+// Várias leituras em uma única requisição: recebe caminhos ('/goals', '/categories?...')
+// e devolve as respostas na mesma ordem, cada uma com { status, headers, body }
+export const batchGet = async (paths) => {
+  const response = await api.post('/batch', {
+    requests: paths.map((path) => ({ method: 'GET', path: `/api${path}` }))
+  });
+  return response.data.responses;
+};
+
+// Dashboard
+export const getDashboard = (params) => api.get('/dashboard', { params });
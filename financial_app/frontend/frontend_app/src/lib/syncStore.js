@@ -0,0 +1,53 @@
+import { getSync } from './api.js';
+
+// Cópia local dos dados do usuário mantida em dia por GET /sync: depois da primeira
+// carga, cada chamada baixa apenas as linhas alteradas ou excluídas desde o último cursor.
+let store = { userId: null, cursor: null, rows: {} };
+let pending = null;
+
+const applyChanges = (rows, data) => {
+  const next = data.full ? {} : { ...rows };
+  // Exclusões primeiro: um id reaproveitado por uma nova linha volta em `changes`
+  for (const [resource, ids] of Object.entries(data.deleted)) {
+    if (ids.length === 0) continue;
+    next[resource] = new Map(next[resource]);
+    ids.forEach((id) => next[resource].delete(id));
+  }
+  for (const [resource, items] of Object.entries(data.changes)) {
+    if (items.length === 0 && next[resource]) continue;
+    next[resource] = new Map(next[resource]);
+    items.forEach((item) => next[resource].set(item.id, item));
+  }
+  return next;
+};
+
+const sync = (userId) => {
+  if (store.userId !== userId) {
+    store = { userId, cursor: null, rows: {} };
+    pending = null;
+  }
+  if (!pending) {
+    pending = getSync(store.cursor)
+      .then((response) => {
+        if (store.userId === userId) {
+          store = { userId, cursor: response.data.cursor, rows: applyChanges(store.rows, response.data) };
+        }
+      })
+      .finally(() => {
+        pending = null;
+      });
+  }
+  return pending;
+};
+
+// Sincroniza e devolve as linhas de um recurso ('goals', 'investments', ...), ordenadas por `compare`
+export const syncResource = async (userId, resource, compare) => {
+  await sync(userId);
+  const rows = Array.from(store.rows[resource]?.values() ?? []);
+  return compare ? rows.sort(compare) : rows;
+};
+
+export const resetSyncStore = () => {
+  store = { userId: null, cursor: null, rows: {} };
+  pending = null;
+};